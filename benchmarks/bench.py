@@ -0,0 +1,220 @@
+'''
+| Author:   Ezio416
+| Created:  2026-10-18
+| Modified: 2026-10-18
+
+- Benchmarks for nadeo_api against a local stub server, so numbers are reproducible without network access
+- Run from the repository root with `python benchmarks/bench.py`, which also writes the results to `bench_output.txt`
+- Rate limiting is disabled throughout, so these measure the library and not the limits it enforces
+'''
+
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import importlib.util
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import typing
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import src.nadeo_api.auth as auth
+import src.nadeo_api.cache as cache
+import src.nadeo_api.config as config
+import src.nadeo_api.core as core
+import src.nadeo_api.live as live
+import src.nadeo_api.oauth as oauth
+import src.nadeo_api.ratelimit as ratelimit
+
+from stub_server import StubServer, account_id
+
+
+CONCURRENCY: tuple[int, ...] = 1, 4, 16, 64
+LATENCY:     float           = 0.005  # seconds added to each response in throughput benchmarks
+OUTPUT:      str             = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'bench_output.txt')
+REPEAT:      int             = 5  # best of this many runs is reported
+REQUESTS:    int             = 2_000  # per overhead and throughput run
+ROOT:        str             = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_results: list[str] = []
+
+
+def bench_bulk(stub: StubServer) -> None:
+    stub.latency = LATENCY
+    token_core: auth.Token = stub.token('core')
+    token_live: auth.Token = stub.token('live')
+    token_oauth: auth.Token = stub.token('oauth')
+    uids: list[str] = [f'uid{i:024d}' for i in range(2_910)]
+    ids: list[str] = [account_id(i) for i in range(1_000)]
+
+    for workers in (1, 4, 8):
+        config.max_workers = workers
+        _report(f'core.get_map_info, 2910 maps, {workers} workers', _best(lambda: core.get_map_info(token_core, uids)), 'run')
+        _report(f'live.iter_map_leaderboard, 10k records, {workers} workers', _best(lambda: sum(1 for _ in live.iter_map_leaderboard(token_live, 'map'))), 'run')
+
+        oauth.name_cache.clear()
+        _report(f'oauth.resolve_account_names, 1000 IDs, {workers} workers', _best(lambda: (oauth.name_cache.clear(), oauth.resolve_account_names(token_oauth, ids))), 'run')
+
+
+def bench_cache(stub: StubServer) -> None:
+    stub.latency = 0.0
+    token: auth.Token = stub.token('live')
+    cache.set_backend(cache.MemoryCache())
+
+    try:
+        live.get(token, 'api/token/campaign/month', {'length': 1})
+        _report('GET, memory cache hit', _per_call(lambda: live.get(token, 'api/token/campaign/month', {'length': 1})))
+
+        with tempfile.TemporaryDirectory() as directory:
+            backend: cache.SQLiteCache = cache.SQLiteCache(os.path.join(directory, 'cache.db'))
+            cache.set_backend(backend)
+            live.get(token, 'api/token/campaign/month', {'length': 1})
+            _report('GET, SQLite cache hit', _per_call(lambda: live.get(token, 'api/token/campaign/month', {'length': 1})))
+            backend.close()
+    finally:
+        cache.set_backend(None)
+
+
+def bench_import(stub: StubServer) -> None:
+    '''
+    - times imports in fresh interpreters, as a short-lived script would see them
+    '''
+
+    for statement in ('import requests', 'import src.nadeo_api', 'import src.nadeo_api.util', 'import src.nadeo_api.core', 'import src.nadeo_api.live', 'from src.nadeo_api import oauth'):
+        times: list[float] = []
+
+        for _ in range(REPEAT * 2):
+            output: str = subprocess.run(
+                [sys.executable, '-c', f'import sys, time; start = time.perf_counter(); {statement}; print(time.perf_counter() - start, "requests" in sys.modules)'],
+                capture_output=True,
+                check=True,
+                cwd=ROOT,
+                text=True
+            ).stdout
+            seconds, loaded = output.split()
+            times.append(float(seconds))
+
+        _report(statement, min(times), 'run', extra='loads requests' if loaded == 'True' else '')
+
+
+def bench_overhead(stub: StubServer) -> None:
+    stub.latency = 0.0
+    token: auth.Token = stub.token('live')
+
+    with requests.Session() as session:
+        url: str = f'{stub.urls['live']}/api/token/campaign/month'
+        baseline: float = _per_call(lambda: session.get(url, params={'length': 1}, headers={'Authorization': token.access_token}).json())
+
+    _report('GET, plain requests.Session', baseline)
+
+    for coalesce in (False, True):
+        config.coalesce_requests = coalesce
+        elapsed: float = _per_call(lambda: live.get(token, 'api/token/campaign/month', {'length': 1}))
+        _report(f'GET, live.get, coalescing {'on' if coalesce else 'off'}', elapsed, extra=f'+{(elapsed - baseline) * 1e6:.0f} us over requests')
+
+    config.coalesce_requests = True
+
+
+def bench_throughput(stub: StubServer) -> None:
+    stub.latency = LATENCY
+    token: auth.Token = stub.token('live')
+
+    for threads in CONCURRENCY:
+        with ThreadPoolExecutor(threads) as executor:
+            def run() -> None:
+                list(executor.map(lambda i: live.get(token, 'api/token/campaign/month', {'offset': i}), range(REQUESTS)))
+
+            elapsed: float = _best(run)
+
+        _report(f'GET throughput, {threads} threads', elapsed / REQUESTS, extra=f'{REQUESTS / elapsed:,.0f} req/s')
+
+    if importlib.util.find_spec('aiohttp') is None:
+        _results.append('aio throughput skipped - aiohttp is not installed')
+        return
+
+    import src.nadeo_api.aio.auth as aio_auth
+    import src.nadeo_api.aio.live as aio_live
+    stub.install()  # patch the aio modules just imported
+
+    for tasks in CONCURRENCY:
+        async def run_async() -> None:
+            semaphore: asyncio.Semaphore = asyncio.Semaphore(tasks)
+
+            async def one(i: int) -> None:
+                async with semaphore:
+                    await aio_live.get(token, 'api/token/campaign/month', {'offset': i})
+
+            await asyncio.gather(*(one(i) for i in range(REQUESTS)))
+            await aio_auth.close_sessions()
+
+        elapsed = _best(lambda: asyncio.run(run_async()))
+        _report(f'aio GET throughput, {tasks} tasks', elapsed / REQUESTS, extra=f'{REQUESTS / elapsed:,.0f} req/s')
+
+
+def _best(func: typing.Callable[[], object]) -> float:
+    '''
+    - runs a function `REPEAT` times and gets the fastest run in seconds
+    '''
+
+    times: list[float] = []
+
+    for _ in range(REPEAT):
+        start: float = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+def _per_call(func: typing.Callable[[], object]) -> float:
+    '''
+    - gets the median seconds per call of a function called `REQUESTS` times
+    '''
+
+    for _ in range(50):  # warm up connections and caches
+        func()
+
+    times: list[float] = []
+
+    for _ in range(REQUESTS):
+        start: float = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    return statistics.median(times)
+
+
+def _report(name: str, seconds: float, unit: str = 'call', extra: str = '') -> None:
+    line: str = f'{name:<55} {seconds * 1e3:>10,.1f} ms/{unit}' if unit == 'run' else f'{name:<55} {seconds * 1e6:>10,.1f} us/{unit}'
+
+    if extra:
+        line += f'  ({extra})'
+
+    print(line)
+    _results.append(line)
+
+
+def main() -> None:
+    config.wait_between_requests_ms = 0
+    config.rate_limits = {}
+    ratelimit.reset()
+
+    with StubServer() as stub:
+        for bench in (bench_import, bench_overhead, bench_cache, bench_throughput, bench_bulk):
+            print(f'# {bench.__name__}')
+            _results.append(f'# {bench.__name__}')
+            bench(stub)
+
+        _results.append(f'# requests served: {stub.requests}')
+
+    with open(OUTPUT, 'w') as file:
+        file.write(f'Python {sys.version.split()[0]}, {time.strftime('%Y-%m-%d %H:%M:%S')}\n')
+        file.write('\n'.join(_results) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+'''
+| Author:   Ezio416
+| Created:  2026-10-18
+| Modified: 2026-10-18
+
+- Local stand-in for the Nadeo and Ubisoft services, so benchmarks need no network access or credentials
+- Each API gets its own port, and `install()` points nadeo_api at them
+- Responses are shaped like the real ones but filled with generated data
+'''
+
+from base64 import b64decode, urlsafe_b64encode
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import re
+import sys
+import threading
+import time
+import urllib.parse
+import zlib
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import src.nadeo_api.auth as auth
+
+
+APIS: tuple[str, ...] = 'core', 'live', 'meet', 'oauth', 'ubi'
+
+
+def account_id(i: int) -> str:
+    return f'{i:08x}-0000-4000-8000-{i:012x}'
+
+
+def jwt(lifetime: int = 3600, account: str = '') -> str:
+    '''
+    - makes an unsigned JWT which expires after the given number of seconds, for the given account ID if there is one
+    - every token is different, like real ones, so a refreshed token can be told apart from the one it replaced
+    '''
+
+    def part(obj: dict) -> str:
+        return urlsafe_b64encode(json.dumps(obj).encode()).decode().rstrip('=')
+
+    payload: dict = {'exp': int(time.time()) + lifetime, 'aud': 'stub', 'jti': os.urandom(8).hex()}
+
+    if account:
+        payload['sub'] = account
+
+    return f'{part({'alg': 'none'})}.{part(payload)}.c2ln'
+
+
+class Handler(BaseHTTPRequestHandler):
+    disable_nagle_algorithm = True
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real services
+    server: 'Server'
+    wbufsize = 1 << 16  # send headers and body together, flushed after each request
+
+    def do_GET(self) -> None:
+        self._handle()
+
+    def do_POST(self) -> None:
+        self._handle()
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _handle(self) -> None:
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+        url: urllib.parse.ParseResult = urllib.parse.urlparse(self.path)
+        query: dict[str, list[str]] = urllib.parse.parse_qs(url.query)
+        stub: StubServer = self.server.stub
+
+        with stub._lock:
+            stub.requests[self.server.api] = stub.requests.get(self.server.api, 0) + 1
+            if 'Cookie' in self.headers:
+                stub.cookies += 1
+
+        if stub.latency > 0.0:
+            time.sleep(stub.latency)
+
+        self._send(*getattr(self, f'_{self.server.api}')(url.path.rstrip('/'), query))
+
+    def _account(self) -> str:
+        '''
+        - account ID of the username or token a request was authorized with, so each username is its own account
+        '''
+
+        header: str = self.headers.get('Authorization', '')
+
+        if header.startswith('Basic '):
+            return account_id(zlib.crc32(b64decode(header[6:]).split(b':')[0]))
+
+        try:
+            return auth.decode_jwt_from_token(header).get('sub', '')
+        except (IndexError, ValueError):
+            return ''
+
+    def _core(self, path: str, query: dict[str, list[str]]) -> tuple[int, object]:
+        if path.startswith('/v2/authentication/token/'):
+            account: str = self._account()
+            return 200, {'accessToken': jwt(account=account), 'refreshToken': jwt(86400, account)}
+
+        if path == '/maps':
+            if not all(re.fullmatch(r'[\w-]+', uid) for uid in query['mapUidList'][0].split(',')):
+                return 400, {'code': 400, 'message': 'Invalid map UID'}
+
+            return 200, [
+                {
+                    'author':            account_id(len(uid)),
+                    'authorScore':       45_000,
+                    'bronzeScore':       68_000,
+                    'collectionName':    'Stadium',
+                    'fileUrl':           f'https://core.trackmania.nadeo.live/maps/{uid}/file',
+                    'goldScore':         48_000,
+                    'mapId':             account_id(hash(uid) & 0xFFFFFFFF),
+                    'mapUid':            uid,
+                    'name':              f'Map {uid}',
+                    'silverScore':       54_000,
+                    'thumbnailUrl':      f'https://core.trackmania.nadeo.live/maps/{uid}/thumbnail.jpg',
+                    'timestamp':         '2024-07-01T17:00:00+00:00',
+                }
+                for uid in query['mapUidList'][0].split(',')
+            ]
+
+        if path == '/zones':
+            return 200, [{'name': f'Zone {i}', 'parentId': None, 'zoneId': account_id(i)} for i in range(500)]
+
+        return 200, {}
+
+    def _live(self, path: str, query: dict[str, list[str]]) -> tuple[int, object]:
+        if path.startswith('/api/token/leaderboard/group/'):
+            parts: list[str] = path.split('/')
+            length: int = int(query.get('length', ['5'])[0])
+            offset: int = int(query.get('offset', ['0'])[0])
+
+            return 200, {
+                'groupUid': parts[5],
+                'mapUid':   parts[7],
+                'tops': [{
+                    'zoneId':   account_id(0),
+                    'zoneName': 'World',
+                    'top': [
+                        {
+                            'accountId': account_id(i),
+                            'position':  i + 1,
+                            'score':     40_000 + i * 3,
+                            'timestamp': 1_720_000_000 + i,
+                            'zoneId':    account_id(i % 500),
+                            'zoneName':  f'Zone {i % 500}',
+                        }
+                        for i in range(offset, min(offset + length, self.server.stub.leaderboard_size))
+                    ],
+                }],
+            }
+
+        if path == '/api/token/campaign/month':
+            length: int = int(query.get('length', ['1'])[0])
+            offset: int = int(query.get('offset', ['0'])[0])
+
+            return 200, {
+                'itemCount': 64,
+                'monthList': [
+                    {
+                        'days': [
+                            {'campaignId': 1000 + month * 31 + day, 'day': day + 1, 'mapUid': f'totd{month:03d}{day:02d}'.ljust(27, 'x')}
+                            for day in range(31)
+                        ],
+                        'month': 12 - (month % 12),
+                        'year':  2026 - month // 12,
+                    }
+                    for month in range(offset, min(offset + length, 64))
+                ],
+            }
+
+        return 200, {}
+
+    def _meet(self, path: str, query: dict[str, list[str]]) -> tuple[int, object]:
+        if path == '/api/cup-of-the-day/current':
+            return 200, {'challenge': {'id': 1}, 'competition': {'id': 2}, 'edition': 1, 'id': 3}
+
+        return 200, {}
+
+    def _oauth(self, path: str, query: dict[str, list[str]]) -> tuple[int, object]:
+        if path == '/api/access_token':
+            return 200, {'access_token': jwt(), 'expires_in': 3600, 'token_type': 'Bearer'}
+
+        if path == '/api/display-names':
+            return 200, {id: f'player{id[-6:]}' for id in query.get('accountId[]', [])}
+
+        if path == '/api/display-names/account-ids':
+            return 200, {name: account_id(int(name[6:], 16)) for name in query.get('displayName[]', []) if name.startswith('player')}
+
+        return 200, {}
+
+    def _send(self, status: int, obj: object) -> None:
+        body: bytes = json.dumps(obj).encode()
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Set-Cookie', f'session={os.urandom(8).hex()}; Path=/')  # like the real services, for clients to ignore
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _ubi(self, path: str, query: dict[str, list[str]]) -> tuple[int, object]:
+        if path == '/v3/profiles/sessions':
+            return 200, {'expiration': '2099-01-01T00:00:00.0000000Z', 'platformType': 'uplay', 'ticket': jwt(account=self._account())}
+
+        return 200, {}
+
+
+class Server(ThreadingHTTPServer):
+    api:  str
+    stub: 'StubServer'
+
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class StubServer():
+    '''
+    - runs one local HTTP server per API in background threads
+
+    Parameters
+    ----------
+    latency: float
+        - seconds each response is delayed by, to emulate the round trip to the real services
+        - default: `0.0`
+
+    leaderboard_size: int
+        - number of records on every map's leaderboard
+        - default: `10_000`
+    '''
+
+    cookies:          int
+    latency:          float
+    leaderboard_size: int
+    requests:         dict[str, int]
+    urls:             dict[str, str]
+
+    def __init__(self, latency: float = 0.0, leaderboard_size: int = 10_000):
+        self.cookies = 0  # requests which sent a cookie back
+        self.latency = latency
+        self.leaderboard_size = leaderboard_size
+        self.requests = {}
+        self.urls = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._servers: list[Server] = []
+        self._originals: list[tuple[object, str, str]] = []
+
+    def __enter__(self) -> 'StubServer':
+        self.start()
+        self.install()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.uninstall()
+        self.stop()
+
+    def install(self) -> None:
+        '''
+        - points the base URLs of every loaded nadeo_api module at the stub servers
+        '''
+
+        names: dict[str, str] = {f'url_{api}': url for api, url in self.urls.items()}
+
+        for module in list(sys.modules.values()):
+            if not (module_name := getattr(module, '__name__', '')).startswith(('src.nadeo_api', 'nadeo_api')):
+                continue
+
+            for name, url in names.items():
+                if hasattr(module, name):
+                    self._originals.append((module, name, getattr(module, name)))
+                    setattr(module, name, url)
+
+            if hasattr(module, 'URL') and (api := module_name.rsplit('.', 1)[1]) in self.urls:
+                self._originals.append((module, 'URL', module.URL))
+                module.URL = self.urls[api]
+
+    def start(self) -> None:
+        for api in APIS:
+            server: Server = Server(('127.0.0.1', 0), Handler)
+            server.api = api
+            server.stub = self
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self._servers.append(server)
+            self.urls[api] = f'http://127.0.0.1:{server.server_port}'
+
+    def stop(self) -> None:
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+
+        self._servers.clear()
+
+    def token(self, audience: str, username: str = 'user') -> auth.Token:
+        '''
+        - gets a token for an audience from the stub servers, going through the same path as a real login
+        - tokens for different usernames belong to different accounts
+        '''
+
+        return auth.get_token(audience, username, 'pass', 'nadeo_api benchmarks', True)
+
+    def uninstall(self) -> None:
+        for module, name, value in reversed(self._originals):
+            setattr(module, name, value)
+
+        self._originals.clear()
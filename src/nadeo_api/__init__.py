@@ -1,13 +1,38 @@
 '''
 | Author:   Ezio416
 | Created:  2024-05-07
-| Modified: 2026-02-04
+| Modified: 2026-10-18
 
 - A library to assist with accessing Nadeo's web services API and the public Trackmania API (OAuth2).
 - This is the main module - most of what you need is in sub-modules.
+- Sub-modules are only imported when first used, i.e. `nadeo_api.live` imports `live` the first time it is accessed
+- Likewise, slow imports like `concurrent.futures` and `requests` are deferred to the functions that need them,
+  so importing the library stays fast for programs that never use them
 '''
 
+import importlib
+import typing
+
 from .util import *  # NOQA
 
 
 __version__: tuple = 0, 8, 0
+
+_submodules: frozenset[str] = frozenset({
+    'aio', 'auth', 'cache', 'config', 'core', 'hooks', 'live', 'meet', 'metrics', 'oauth', 'ratelimit', 'records', 'scheduler', 'util'
+})
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_submodules})
+
+
+def __getattr__(name: str) -> typing.Any:
+    '''
+    - imports a sub-module the first time it is accessed as an attribute of this module
+    '''
+
+    if name in _submodules:
+        return importlib.import_module(f'.{name}', __name__)  # also sets it as an attribute, so this is only called once
+
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
@@ -0,0 +1,9 @@
+'''
+| Author:   Ezio416
+| Created:  2026-10-18
+| Modified: 2026-10-18
+
+- Asynchronous versions of the API modules for use with `asyncio`
+- Requires the optional dependency `aiohttp`: `python -m pip install nadeo-api[aio]`
+- Tokens are the same `nadeo_api.auth.Token` objects used by the synchronous modules
+'''
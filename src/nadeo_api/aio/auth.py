@@ -0,0 +1,724 @@
+'''
+| Author:   Ezio416
+| Created:  2026-10-18
+| Modified: 2026-10-18
+
+- Asynchronous functions for interacting with authentication tokens to use with the API
+- Also contains variables and functions intended for internal use
+'''
+
+import asyncio
+from base64 import b64encode
+from datetime import datetime as dt
+import threading
+import time
+import typing
+import weakref
+
+try:
+    import aiohttp
+except ImportError as e:
+    raise ImportError('nadeo_api.aio requires aiohttp - install it with `python -m pip install nadeo-api[aio]`') from e
+
+from .. import cache
+from .. import config
+from .. import hooks
+from .. import ratelimit
+from .. import scheduler
+from .. import util
+from ..auth import (  # NOQA: F401
+    BadResponseError,
+    Token,
+    TokenPool,
+    audience_core,
+    audience_live,
+    audience_oauth,
+    tmnext_app_id,
+    url_core,
+    url_live,
+    url_meet,
+    url_oauth,
+    url_ubi,
+    _parse_audience,
+    _PoolMember,
+    _prepare_request,
+    _retry_delay,
+)
+
+
+# kept separately for each event loop, as tasks and sessions may only be used in the loop they were created in
+_inflight:   weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Task]] = weakref.WeakKeyDictionary()
+_loops_lock: threading.Lock = threading.Lock()
+_refreshes:  weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[int, asyncio.Task]] = weakref.WeakKeyDictionary()
+_sessions:   weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, aiohttp.ClientSession]] = weakref.WeakKeyDictionary()
+
+
+async def close_sessions() -> None:
+    '''
+    - closes the pooled HTTP sessions and their connections in the running event loop
+    - a new session is opened automatically the next time a request is sent to a base URL
+    '''
+
+    sessions: dict[str, aiohttp.ClientSession] = _in_loop(_sessions)
+
+    while sessions:
+        _, session = sessions.popitem()
+        await session.close()
+
+
+async def _coalesce(key: str, fetch: typing.Callable[[], typing.Awaitable[bytes]]) -> bytes:
+    '''
+    - awaits `fetch`, unless another coroutine is already fetching the same key, in which case its result is shared
+    - exceptions are shared too, so every waiting caller sees the same failure
+    - the fetch runs in its own task, so cancelling one caller (i.e. with its own timeout) never cancels it for the others
+    '''
+
+    inflight: dict[str, asyncio.Task] = _in_loop(_inflight)
+
+    if (task := inflight.get(key)) is None:
+        task = inflight[key] = asyncio.create_task(fetch())
+        task.add_done_callback(lambda done: _fetched(inflight, key, done))
+
+    return await asyncio.shield(task)
+
+
+async def _delete(token: Token, base_url: str, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
+    '''
+    - sends a DELETE request to a specified API
+    - this is for internal use - you should use an API-specific `delete` function instead
+
+    Parameters
+    ----------
+    token: Token
+        - authentication token from `auth.get_token()` or `aio.auth.get_token()`
+
+    base_url: str
+        - base URL of desired API
+        - must match your token's audience
+        - valid: `url_core`, `url_live`, `url_meet`, `url_oauth`
+
+    endpoint: str
+        - desired endpoint or full URL
+        - base URL and leading slash (`'https://.../'`) optional
+
+    params: dict
+        - request parameters if applicable
+        - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
+        - default: `{}` (empty)
+
+    body: dict
+        - request body if applicable
+        - default: `{}` (empty)
+
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
+    Returns
+    -------
+    dict | list | bytes
+        - response body, as bytes if `raw`
+    '''
+
+    return await _request(token, base_url, endpoint, params, 'delete', body, raw=raw)
+
+
+def _fetched(inflight: dict[str, asyncio.Task], key: str, task: asyncio.Task) -> None:
+    '''
+    - forgets a finished coalesced fetch
+    '''
+
+    if inflight.get(key) is task:
+        del inflight[key]
+
+    if not task.cancelled():
+        task.exception()  # mark as retrieved in case every caller was cancelled
+
+
+async def _get(token: Token, base_url: str, endpoint: str, params: dict = {}, raw: bool = False) -> dict | list | bytes:
+    '''
+    - sends a GET request to a specified API
+    - this is for internal use - you should use an API-specific `get` function instead
+
+    Parameters
+    ----------
+    token: Token
+        - authentication token from `auth.get_token()` or `aio.auth.get_token()`
+
+    base_url: str
+        - base URL of desired API
+        - must match your token's audience
+        - valid: `url_core`, `url_live`, `url_meet`, `url_oauth`
+
+    endpoint: str
+        - desired endpoint or full URL
+        - base URL and leading slash (`'https://.../'`) optional
+
+    params: dict
+        - request parameters if applicable
+        - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
+        - default: `{}` (empty)
+
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
+    Returns
+    -------
+    dict | list | bytes
+        - response body, as bytes if `raw`
+    '''
+
+    return await _request(token, base_url, endpoint, params, raw=raw)
+
+
+async def get_token(audience: str, username: str, password: str, agent: str = '', server_account: bool = False) -> Token:
+    '''
+    - requests an authentication token for a given audience
+    - same as `auth.get_token()` but does not block the event loop
+
+    Parameters
+    ----------
+    audience: str
+        - desired audience for token use
+        - capitalization is ignored
+        - valid: `'NadeoServices'`/`'core'`/`'prod'`, `'NadeoLiveServices'`/`'live'`/`'meet'`/`'club'`, `'OAuth'`/`'OAuth2'`
+
+    username: str
+        - Ubisoft/dedicated server account username
+        - for OAuth2, this is the identifier
+
+    password: str
+        - Ubisoft/dedicated server account password
+        - for OAuth2, this is the secret
+
+    agent: str
+        - user agent with your program's name and a way to contact you
+        - Ubisoft can block your request without this being properly set
+        - not required for OAuth2
+        - default: `''` (empty)
+
+    server_account: bool
+        - whether you're using a dedicated server account (Server usage) instead of a Ubisoft account (Client usage)
+        - ignored when using OAuth2
+        - default: `False`
+    '''
+
+    audience = _parse_audience(audience)
+
+    util._log(audience)
+
+    if audience == audience_oauth:
+        async with _session(url_oauth).post(
+            f'{url_oauth}/api/access_token',
+            headers={'Content-Type': 'application/x-www-form-urlencoded'},
+            data={
+                'grant_type':    'client_credentials',
+                'client_id':     username,
+                'client_secret': password
+            }
+        ) as req:
+            if req.status >= 400:
+                raise ConnectionError(f'Bad response getting token for {audience}: code {req.status}, response {await req.text()}')
+
+            json: dict = await req.json(content_type=None)
+
+        return Token(json['access_token'], audience, expiration=int(time.time()) + json['expires_in'])
+
+    if agent == '':
+        raise ValueError('For web services endpoints, you must specify a user agent')
+
+    async with (_session(url_core) if server_account else _session(url_ubi)).post(
+        f'{url_core}/v2/authentication/token/basic' if server_account else f'{url_ubi}/v3/profiles/sessions',
+        headers={
+            'Authorization': f'Basic {b64encode(f'{username}:{password}'.encode('utf-8')).decode('ascii')}',
+            'Content-Type':  'application/json',
+            'Ubi-AppId':     tmnext_app_id,
+            'User-Agent':    agent,
+        },
+        json={'audience': audience}
+    ) as req:
+        if req.status >= 400:
+            raise ConnectionError(f'Bad response getting ticket for {audience}: code {req.status}, response {await req.text()}')
+
+        json: dict = await req.json(content_type=None)
+
+    if server_account:
+        return Token(f'nadeo_v1 t={json['accessToken']}', audience, f'nadeo_v1 t={json['refreshToken']}', True)
+
+    ticket: Token = Token(f'ubi_v1 t={json['ticket']}', json['platformType'], expiration=int(dt.fromisoformat(json['expiration']).timestamp()))
+
+    async with _session(url_core).post(
+        f'{url_core}/v2/authentication/token/ubiservices',
+        headers={'Authorization': ticket.access_token},
+        json={'audience': audience}
+    ) as req2:
+        if req2.status >= 400:
+            raise ConnectionError(f'Bad response getting token for {audience}: code {req2.status}, response {await req2.text()}')
+
+        json2: dict = await req2.json(content_type=None)
+
+    return Token(f'nadeo_v1 t={json2['accessToken']}', audience, f'nadeo_v1 t={json2['refreshToken']}')
+
+
+async def _head(token: Token, base_url: str, endpoint: str, params: dict = {}, raw: bool = False) -> dict | list | bytes:
+    '''
+    - sends a HEAD request to a specified API
+    - this is for internal use - you should use an API-specific `head` function instead
+
+    Parameters
+    ----------
+    token: Token
+        - authentication token from `auth.get_token()` or `aio.auth.get_token()`
+
+    base_url: str
+        - base URL of desired API
+        - must match your token's audience
+        - valid: `url_core`, `url_live`, `url_meet`, `url_oauth`
+
+    endpoint: str
+        - desired endpoint or full URL
+        - base URL and leading slash (`'https://.../'`) optional
+
+    params: dict
+        - request parameters if applicable
+        - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
+        - default: `{}` (empty)
+
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
+    Returns
+    -------
+    dict | list | bytes
+        - response body, as bytes if `raw`
+    '''
+
+    return await _request(token, base_url, endpoint, params, 'head', raw=raw)
+
+
+def _in_loop(entries: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]) -> dict:
+    '''
+    - gets the entries belonging to the running event loop, creating them if needed
+    - entries of a loop are dropped along with it
+    '''
+
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+    if (loop_entries := entries.get(loop)) is None:
+        with _loops_lock:  # loops may be running in other threads
+            loop_entries = entries.setdefault(loop, {})
+
+    return loop_entries
+
+
+async def _options(token: Token, base_url: str, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
+    '''
+    - sends an OPTIONS request to a specified API
+    - this is for internal use - you should use an API-specific `options` function instead
+
+    Parameters
+    ----------
+    token: Token
+        - authentication token from `auth.get_token()` or `aio.auth.get_token()`
+
+    base_url: str
+        - base URL of desired API
+        - must match your token's audience
+        - valid: `url_core`, `url_live`, `url_meet`, `url_oauth`
+
+    endpoint: str
+        - desired endpoint or full URL
+        - base URL and leading slash (`'https://.../'`) optional
+
+    params: dict
+        - request parameters if applicable
+        - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
+        - default: `{}` (empty)
+
+    body: dict
+        - request body if applicable
+        - default: `{}` (empty)
+
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
+    Returns
+    -------
+    dict | list | bytes
+        - response body, as bytes if `raw`
+    '''
+
+    return await _request(token, base_url, endpoint, params, 'options', body, raw=raw)
+
+
+async def _patch(token: Token, base_url: str, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
+    '''
+    - sends a PATCH request to a specified API
+    - this is for internal use - you should use an API-specific `patch` function instead
+
+    Parameters
+    ----------
+    token: Token
+        - authentication token from `auth.get_token()` or `aio.auth.get_token()`
+
+    base_url: str
+        - base URL of desired API
+        - must match your token's audience
+        - valid: `url_core`, `url_live`, `url_meet`, `url_oauth`
+
+    endpoint: str
+        - desired endpoint or full URL
+        - base URL and leading slash (`'https://.../'`) optional
+
+    params: dict
+        - request parameters if applicable
+        - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
+        - default: `{}` (empty)
+
+    body: dict
+        - request body if applicable
+        - default: `{}` (empty)
+
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
+    Returns
+    -------
+    dict | list | bytes
+        - response body, as bytes if `raw`
+    '''
+
+    return await _request(token, base_url, endpoint, params, 'patch', body, raw=raw)
+
+
+async def _post(token: Token, base_url: str, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
+    '''
+    - sends a POST request to a specified API
+    - this is for internal use - you should use an API-specific `post` function instead
+
+    Parameters
+    ----------
+    token: Token
+        - authentication token from `auth.get_token()` or `aio.auth.get_token()`
+
+    base_url: str
+        - base URL of desired API
+        - must match your token's audience
+        - valid: `url_core`, `url_live`, `url_meet`, `url_oauth`
+
+    endpoint: str
+        - desired endpoint or full URL
+        - base URL and leading slash (`'https://.../'`) optional
+
+    params: dict
+        - request parameters if applicable
+        - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
+        - default: `{}` (empty)
+
+    body: dict
+        - request body if applicable
+        - default: `{}` (empty)
+
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
+    Returns
+    -------
+    dict | list | bytes
+        - response body, as bytes if `raw`
+    '''
+
+    return await _request(token, base_url, endpoint, params, 'post', body, raw=raw)
+
+
+async def _put(token: Token, base_url: str, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
+    '''
+    - sends a PUT request to a specified API
+    - this is for internal use - you should use an API-specific `put` function instead
+
+    Parameters
+    ----------
+    token: Token
+        - authentication token from `auth.get_token()` or `aio.auth.get_token()`
+
+    base_url: str
+        - base URL of desired API
+        - must match your token's audience
+        - valid: `url_core`, `url_live`, `url_meet`, `url_oauth`
+
+    endpoint: str
+        - desired endpoint or full URL
+        - base URL and leading slash (`'https://.../'`) optional
+
+    params: dict
+        - request parameters if applicable
+        - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
+        - default: `{}` (empty)
+
+    body: dict
+        - request body if applicable
+        - default: `{}` (empty)
+
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
+    Returns
+    -------
+    dict | list | bytes
+        - response body, as bytes if `raw`
+    '''
+
+    return await _request(token, base_url, endpoint, params, 'put', body, raw=raw)
+
+
+async def refresh(token: Token) -> None:
+    '''
+    - refreshes a set of tokens if applicable
+    - same as `Token.refresh()` but does not block the event loop
+    - if a refresh for this token is already in flight, waits for it instead of sending another
+    - raises a `ValueError` if called on an OAuth2 token
+
+    Parameters
+    ----------
+    token: Token
+        - authentication token to refresh in place
+    '''
+
+    await _refresh_if_stale(token, token.access_token)
+
+
+async def _refresh_if_stale(token: Token, stale_access_token: str) -> None:
+    '''
+    - refreshes the tokens unless the access token has already changed from the given one
+    - coroutines that need the same token refreshed at once all await a single refresh request
+    '''
+
+    if token.audience == audience_oauth:
+        raise ValueError('You may not refresh an OAuth2 token - request a new one instead.')
+
+    if token.access_token != stale_access_token:  # already refreshed by someone else
+        return
+
+    key: int = id(token)
+    refreshes: dict[int, asyncio.Task] = _in_loop(_refreshes)
+
+    if (task := refreshes.get(key)) is None:
+        task = asyncio.create_task(_send_refresh(token))
+        refreshes[key] = task
+        task.add_done_callback(lambda _: refreshes.pop(key, None))
+
+    await asyncio.shield(task)
+
+
+async def _request(token: Token, base_url: str, endpoint: str, params: dict = {}, method: str = 'get', body: dict = {}, raw: bool = False) -> dict | list | bytes:
+    '''
+    - sends a request to a specified API
+    - this is for internal use - you should use an explicit function like `aio.core.get()` instead
+
+    Parameters
+    ----------
+    token: Token
+        - authentication token from `auth.get_token()` or `aio.auth.get_token()`
+
+    base_url: str
+        - base URL of desired API
+        - must match your token's audience
+        - valid: `url_core`, `url_live`, `url_meet`, `url_oauth`
+
+    endpoint: str
+        - desired endpoint or full URL
+        - base URL and leading slash (`'https://.../'`) optional
+
+    params: dict
+        - parameters for request if applicable
+        - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
+        - default: `{}` (empty)
+
+    method: str
+        - type of request to send
+        - valid: `'delete'`, `'get'`, `'head'`, `'options'`, `'patch'`, `'post'`, `'put'`
+        - default: `'get'`
+
+    body: dict
+        - request body
+        - default: `{}` (empty)
+
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
+    Returns
+    -------
+    dict | list | bytes
+        - response body, as bytes if `raw`
+    '''
+
+    base_url, endpoint, method, base_name = _prepare_request(token, base_url, endpoint, method)
+
+    if hooks._subscribers[hooks.REQUEST_START] or config.debug_logging:
+        hooks._emit(hooks.REQUEST_START, {'method': method, 'base_url': base_url, 'endpoint': endpoint, 'params': params, 'body': body})
+
+    backend: cache.Cache | None = None
+    scope:   str = token._scope if method == 'get' else ''  # only known accounts have their responses cached or shared
+    shared:  bool = bool(scope) and config.coalesce_requests
+
+    if scope and (shared or cache._backend is not None):
+        endpoint_key: str = cache._normalize(endpoint, params)
+        cache_key: str = f'{scope}@{base_url}/{endpoint_key}'  # see cache.make_key
+
+        if (backend := cache._backend) is not None and (content := backend.get(cache_key)) is not None:
+            if hooks._subscribers[hooks.CACHE_HIT] or config.debug_logging:
+                hooks._emit(hooks.CACHE_HIT, {'base_url': base_url, 'endpoint': endpoint_key})
+
+            return content if raw else util._json_decoder(content)
+
+    async def __fetch() -> bytes:
+        if not isinstance(token, TokenPool):
+            return await __fetch_with(token, None)
+
+        member: _PoolMember = token._acquire(base_url)
+
+        try:
+            return await __fetch_with(member.token, member.limiters[base_url])
+        finally:
+            token._release(member)
+
+    async def __fetch_with(token: Token, pool_limiter: ratelimit.RateLimiter | None) -> bytes:
+        stale: str = token.access_token  # read before checking, so a refresh finishing in between is not sent again
+
+        if token.expired:
+            await _refresh_if_stale(token, stale)
+
+        failures: int = 0
+        refreshed: bool = False
+        retries: int = 0
+
+        while True:
+            limiter: ratelimit.RateLimiter = await _wait(base_url, token.audience, pool_limiter)
+
+            access_token: str = token.access_token
+            delay: float | None
+            start: float = time.perf_counter()
+
+            try:
+                async with _session(base_url).request(
+                    method.upper(),
+                    f'{base_url}/{endpoint}',
+                    params=params,
+                    headers={'Authorization': access_token},
+                    json=body
+                ) as req:
+                    content: bytes = await req.read()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                failures += 1
+                if (delay := _retry_delay(method, None, failures)) is None:
+                    raise
+                status: int | None = None
+            else:
+                status = req.status
+                elapsed: float = time.perf_counter() - start
+                limiter.feedback(status, elapsed)
+
+                if hooks._subscribers[hooks.REQUEST_END] or config.debug_logging:
+                    hooks._emit(hooks.REQUEST_END, {
+                        'method':   method,
+                        'base_url': base_url,
+                        'endpoint': endpoint,
+                        'status':   status,
+                        'elapsed':  elapsed,
+                        'size':     len(content),
+                    })
+
+                if status < 400:
+                    break
+
+                if status == 401 and not refreshed:  # token may have expired prematurely
+                    await _refresh_if_stale(token, access_token)
+                    refreshed = True
+                    delay = 0.0
+                else:
+                    failures += 1
+                    if (delay := _retry_delay(method, status, failures, req.headers.get('Retry-After'))) is None:
+                        raise BadResponseError(f'Bad response from {base_name} API: code {status}, response {content.decode(errors='replace')}', status)
+
+            retries += 1
+
+            if hooks._subscribers[hooks.RETRY] or config.debug_logging:
+                hooks._emit(hooks.RETRY, {'method': method, 'base_url': base_url, 'endpoint': endpoint, 'status': status, 'attempt': retries, 'delay': delay})
+
+            if delay > 0.0:
+                await asyncio.sleep(delay)
+
+        if backend is not None and (ttl := backend.ttl_for(endpoint_key)) != 0:
+            backend.set(cache_key, content, ttl)
+
+        return content
+
+    content = await (_coalesce(cache_key, __fetch) if shared else __fetch())  # never shared between accounts
+
+    return content if raw else util._json_decoder(content)
+
+
+def _session(base_url: str) -> aiohttp.ClientSession:
+    '''
+    - gets the pooled keep-alive session for a base URL in the running event loop, creating it if needed
+    - cookies are neither stored nor sent, as the session is shared by every account
+    '''
+
+    sessions: dict[str, aiohttp.ClientSession] = _in_loop(_sessions)
+
+    if (session := sessions.get(base_url)) is None or session.closed:
+        session = sessions[base_url] = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit_per_host=config.pool_maxsize),
+            cookie_jar=aiohttp.DummyCookieJar()
+        )
+
+    return session
+
+
+async def _send_refresh(token: Token) -> None:
+    start: float = time.perf_counter()
+
+    async with _session(url_core).post(
+        f'{url_core}/v2/authentication/token/refresh',
+        headers={'Authorization': token.refresh_token}
+    ) as req:
+        if req.status >= 400:
+            raise ConnectionError(f'Bad response refreshing token for {token.audience}: code {req.status}, response {await req.text()}')
+
+        token._update(await req.json(content_type=None))
+
+    if hooks._subscribers[hooks.TOKEN_REFRESH] or config.debug_logging:
+        hooks._emit(hooks.TOKEN_REFRESH, {'audience': token.audience, 'elapsed': time.perf_counter() - start})
+
+
+async def _wait(base_url: str, audience: str, limiter: ratelimit.RateLimiter | None = None) -> ratelimit.RateLimiter:
+    '''
+    - sleeps until the rate limiter for a base URL allows another request without blocking the event loop
+    - uses the given limiter instead if there is one, i.e. a token's own limiter in a `TokenPool`
+    - with `config.priority_scheduling`, waits for the limiter's scheduler to hand this request a slot instead
+    - returns the limiter so it can be given feedback on the response
+    '''
+
+    if limiter is None:
+        limiter = ratelimit.get_limiter(base_url, audience)
+
+    if config.priority_scheduling:
+        if (waited := await scheduler.get_scheduler(limiter).acquire_async()) > 0.0 and (hooks._subscribers[hooks.RATE_WAIT] or config.debug_logging):
+            hooks._emit(hooks.RATE_WAIT, {'base_url': base_url, 'delay': waited})
+
+        return limiter
+
+    if (delay := limiter.reserve()) > 0.0:
+        if hooks._subscribers[hooks.RATE_WAIT] or config.debug_logging:
+            hooks._emit(hooks.RATE_WAIT, {'base_url': base_url, 'delay': delay})
+
+        await asyncio.sleep(delay)
+
+    return limiter
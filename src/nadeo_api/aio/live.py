@@ -0,0 +1,314 @@
+'''
+| Author:   Ezio416
+| Created:  2026-10-18
+| Modified: 2026-10-18
+
+- Asynchronous functions for interacting with the web services Live API
+'''
+
+from . import auth
+
+
+AUDIENCE: str = auth.audience_live
+URL:      str = auth.url_live
+
+
+######################################################### BASE #########################################################
+
+
+async def delete(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
+    '''
+    - sends a DELETE request to the Live API
+
+    Parameters
+    ----------
+    token: auth.Token
+        - authentication token from `auth.get_token`
+
+    endpoint: str
+        - desired endpoint
+        - base URL is optional
+        - leading forward slash is optional
+        - trailing parameters are optional, i.e. `?param1=true&param2=0`
+
+    params: dict
+        - request parameters if applicable
+        - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
+
+    body: dict
+        - request body if applicable
+        - default: `{}` (empty)
+
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
+    Returns
+    -------
+    dict | list | bytes
+        - response body, as bytes if `raw`
+    '''
+
+    return await auth._delete(token, URL, endpoint, params, body, raw)
+
+
+async def get(token: auth.Token, endpoint: str, params: dict = {}, raw: bool = False) -> dict | list | bytes:
+    '''
+    - sends a GET request to the Live API
+
+    Parameters
+    ----------
+    token: auth.Token
+        - authentication token from `auth.get_token`
+
+    endpoint: str
+        - desired endpoint
+        - base URL is optional
+        - leading forward slash is optional
+        - trailing parameters are optional, i.e. `?param1=true&param2=0`
+
+    params: dict
+        - request parameters if applicable
+        - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
+
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
+    Returns
+    -------
+    dict | list | bytes
+        - response body, as bytes if `raw`
+    '''
+
+    return await auth._get(token, URL, endpoint, params, raw)
+
+
+async def head(token: auth.Token, endpoint: str, params: dict = {}, raw: bool = False) -> dict | list | bytes:
+    '''
+    - sends a HEAD request to the Live API
+
+    Parameters
+    ----------
+    token: auth.Token
+        - authentication token from `auth.get_token`
+
+    endpoint: str
+        - desired endpoint
+        - base URL is optional
+        - leading forward slash is optional
+        - trailing parameters are optional, i.e. `?param1=true&param2=0`
+
+    params: dict
+        - request parameters if applicable
+        - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
+
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
+    Returns
+    -------
+    dict | list | bytes
+        - response body, as bytes if `raw`
+    '''
+
+    return await auth._head(token, URL, endpoint, params, raw)
+
+
+async def options(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
+    '''
+    - sends an OPTIONS request to the Live API
+
+    Parameters
+    ----------
+    token: auth.Token
+        - authentication token from `auth.get_token`
+
+    endpoint: str
+        - desired endpoint
+        - base URL is optional
+        - leading forward slash is optional
+        - trailing parameters are optional, i.e. `?param1=true&param2=0`
+
+    params: dict
+        - request parameters if applicable
+        - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
+
+    body: dict
+        - request body if applicable
+        - default: `{}` (empty)
+
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
+    Returns
+    -------
+    dict | list | bytes
+        - response body, as bytes if `raw`
+    '''
+
+    return await auth._options(token, URL, endpoint, params, body, raw)
+
+
+async def patch(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
+    '''
+    - sends a PATCH request to the Live API
+
+    Parameters
+    ----------
+    token: auth.Token
+        - authentication token from `auth.get_token`
+
+    endpoint: str
+        - desired endpoint
+        - base URL is optional
+        - leading forward slash is optional
+        - trailing parameters are optional, i.e. `?param1=true&param2=0`
+
+    params: dict
+        - request parameters if applicable
+        - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
+
+    body: dict
+        - request body if applicable
+        - default: `{}` (empty)
+
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
+    Returns
+    -------
+    dict | list | bytes
+        - response body, as bytes if `raw`
+    '''
+
+    return await auth._patch(token, URL, endpoint, params, body, raw)
+
+
+async def post(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
+    '''
+    - sends a POST request to the Live API
+
+    Parameters
+    ----------
+    token: auth.Token
+        - authentication token from `auth.get_token`
+
+    endpoint: str
+        - desired endpoint
+        - base URL is optional
+        - leading forward slash is optional
+        - trailing parameters are optional, i.e. `?param1=true&param2=0`
+
+    params: dict
+        - request parameters if applicable
+        - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
+
+    body: dict
+        - request body if applicable
+        - default: `{}` (empty)
+
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
+    Returns
+    -------
+    dict | list | bytes
+        - response body, as bytes if `raw`
+    '''
+
+    return await auth._post(token, URL, endpoint, params, body, raw)
+
+
+async def put(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
+    '''
+    - sends a PUT request to the Live API
+
+    Parameters
+    ----------
+    token: auth.Token
+        - authentication token from `auth.get_token`
+
+    endpoint: str
+        - desired endpoint
+        - base URL is optional
+        - leading forward slash is optional
+        - trailing parameters are optional, i.e. `?param1=true&param2=0`
+
+    params: dict
+        - request parameters if applicable
+        - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
+
+    body: dict
+        - request body if applicable
+        - default: `{}` (empty)
+
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
+    Returns
+    -------
+    dict | list | bytes
+        - response body, as bytes if `raw`
+    '''
+
+    return await auth._put(token, URL, endpoint, params, body, raw)
+
+
+###################################################### ENDPOINTS #######################################################
+
+
+async def get_map_leaderboard(token: auth.Token, mapUid: str, groupUid: str = 'Personal_Best', onlyWorld: bool = True, length: int = 5, offset: int = 0, raw: bool = False) -> dict | bytes:
+    '''
+    - gets the top leaderboard records for a map
+    - can only retrieve records in the top 10,000
+    - https://webservices.openplanet.dev/live/leaderboards/top
+
+    Parameters
+    ----------
+    token: auth.Token
+        - authentication token from `auth.get_token`
+
+    mapUid: str
+        - the UID of the map
+
+    groupUid: str
+        - the UID of the group/season
+        - default: `'Personal_Best'`
+
+    onlyWorld: bool
+        - whether to only get records from the global leaderboard
+        - if `False`, a Ubisoft account is required and `length` and `offset` are ignored
+        - default: `True`
+
+    length: int
+        - number of records to get (max 100)
+        - default: `5`
+
+    offset: int
+        - number of records to skip
+        - default: `0`
+
+    raw: bool
+        - whether to return the response body as received, without decoding it, i.e. to store it as is
+        - default: `False`
+    '''
+
+    if onlyWorld:
+        if length > 100:
+            raise ValueError('You can only request 100 records at a time')
+
+        if length + offset > 10_000:
+            raise ValueError('You can only retrieve records in the top 10,000')
+
+        return await get(token, f'api/token/leaderboard/group/{groupUid}/map/{mapUid}/top?onlyWorld=true&length={length}&offset={offset}', raw=raw)
+
+    if token.server_account:
+        raise ValueError('This endpoint requires a Ubisoft account when onlyWorld is False')
+
+    return await get(token, f'api/token/leaderboard/group/{groupUid}/map/{mapUid}/top?onlyWorld=false', raw=raw)
@@ -0,0 +1,293 @@
+'''
+| Author:   Ezio416
+| Created:  2026-10-18
+| Modified: 2026-10-18
+
+- Asynchronous functions for interacting with the public Trackmania API
+'''
+
+import typing
+
+from . import auth
+
+
+AUDIENCE: str = auth.audience_oauth
+URL:      str = auth.url_oauth
+
+
+######################################################### BASE #########################################################
+
+
+async def delete(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
+    '''
+    - sends a DELETE request to the OAuth2 API
+
+    Parameters
+    ----------
+    token: auth.Token
+        - authentication token from `auth.get_token`
+
+    endpoint: str
+        - desired endpoint
+        - base URL is optional
+        - leading forward slash is optional
+        - trailing parameters are optional, i.e. `?param1=true&param2=0`
+
+    params: dict
+        - request parameters if applicable
+        - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
+
+    body: dict
+        - request body if applicable
+        - default: `{}` (empty)
+
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
+    Returns
+    -------
+    dict | list | bytes
+        - response body, as bytes if `raw`
+    '''
+
+    return await auth._delete(token, URL, endpoint, params, body, raw)
+
+
+async def get(token: auth.Token, endpoint: str, params: dict = {}, raw: bool = False) -> dict | list | bytes:
+    '''
+    - sends a GET request to the OAuth2 API
+
+    Parameters
+    ----------
+    token: auth.Token
+        - authentication token from `auth.get_token`
+
+    endpoint: str
+        - desired endpoint
+        - base URL is optional
+        - leading forward slash is optional
+        - trailing parameters are optional, i.e. `?param1=true&param2=0`
+
+    params: dict
+        - request parameters if applicable
+        - if you put parameters at the end of the `endpoint`, do not put them here else they will be duplicated
+
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
+    Returns
+    -------
+    dict | list | bytes
+        - response body, as bytes if `raw`
+    '''
+
+    return await auth._get(token, URL, endpoint, params, raw)
+
+
+async def head(token: auth.Token, endpoint: str, params: dict = {}, raw: bool = False) -> dict | list | bytes:
+    '''
+    - sends a HEAD request to the OAuth2 API
+
+    Parameters
+    ----------
+    token: auth.Token
+        - authentication token from `auth.get_token`
+
+    endpoint: str
+        - desired endpoint
+        - base URL is optional
+        - leading forward slash is optional
+        - trailing parameters are optional, i.e. `?param1=true&param2=0`
+
+    params: dict
+        - request parameters if applicable
+        - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
+
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
+    Returns
+    -------
+    dict | list | bytes
+        - response body, as bytes if `raw`
+    '''
+
+    return await auth._head(token, URL, endpoint, params, raw)
+
+
+async def options(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
+    '''
+    - sends an OPTIONS request to the OAuth2 API
+
+    Parameters
+    ----------
+    token: auth.Token
+        - authentication token from `auth.get_token`
+
+    endpoint: str
+        - desired endpoint
+        - base URL is optional
+        - leading forward slash is optional
+        - trailing parameters are optional, i.e. `?param1=true&param2=0`
+
+    params: dict
+        - request parameters if applicable
+        - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
+
+    body: dict
+        - request body if applicable
+        - default: `{}` (empty)
+
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
+    Returns
+    -------
+    dict | list | bytes
+        - response body, as bytes if `raw`
+    '''
+
+    return await auth._options(token, URL, endpoint, params, body, raw)
+
+
+async def patch(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
+    '''
+    - sends a PATCH request to the OAuth2 API
+
+    Parameters
+    ----------
+    token: auth.Token
+        - authentication token from `auth.get_token`
+
+    endpoint: str
+        - desired endpoint
+        - base URL is optional
+        - leading forward slash is optional
+        - trailing parameters are optional, i.e. `?param1=true&param2=0`
+
+    params: dict
+        - request parameters if applicable
+        - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
+
+    body: dict
+        - request body if applicable
+        - default: `{}` (empty)
+
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
+    Returns
+    -------
+    dict | list | bytes
+        - response body, as bytes if `raw`
+    '''
+
+    return await auth._patch(token, URL, endpoint, params, body, raw)
+
+
+async def post(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
+    '''
+    - sends a POST request to the OAuth2 API
+
+    Parameters
+    ----------
+    token: auth.Token
+        - authentication token from `auth.get_token`
+
+    endpoint: str
+        - desired endpoint
+        - base URL is optional
+        - leading forward slash is optional
+        - trailing parameters are optional, i.e. `?param1=true&param2=0`
+
+    params: dict
+        - request parameters if applicable
+        - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
+
+    body: dict
+        - request body if applicable
+        - default: `{}` (empty)
+
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
+    Returns
+    -------
+    dict | list | bytes
+        - response body, as bytes if `raw`
+    '''
+
+    return await auth._post(token, URL, endpoint, params, body, raw)
+
+
+async def put(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
+    '''
+    - sends a PUT request to the OAuth2 API
+
+    Parameters
+    ----------
+    token: auth.Token
+        - authentication token from `auth.get_token`
+
+    endpoint: str
+        - desired endpoint
+        - base URL is optional
+        - leading forward slash is optional
+        - trailing parameters are optional, i.e. `?param1=true&param2=0`
+
+    params: dict
+        - request parameters if applicable
+        - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
+
+    body: dict
+        - request body if applicable
+        - default: `{}` (empty)
+
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
+    Returns
+    -------
+    dict | list | bytes
+        - response body, as bytes if `raw`
+    '''
+
+    return await auth._put(token, URL, endpoint, params, body, raw)
+
+
+###################################################### ENDPOINTS #######################################################
+
+
+async def get_account_names_from_ids(token: auth.Token, account_ids: typing.Iterable[str]) -> dict:
+    '''
+    - gets Ubisoft account names given account IDs (UUID)
+    - https://webservices.openplanet.dev/oauth/reference/accounts/id-to-name
+
+    Parameters
+    ----------
+    token: auth.Token
+        - authentication token from `auth.get_token`
+
+    account_ids: str | Iterable[str]
+        - account IDs (max 50)
+        - raises a `ValueError` if you try to request more than 50 names
+        - if an ID is not found, it will be omitted from the results
+
+    Returns
+    -------
+    dict
+        - returned account names as values with given account IDs as keys
+    '''
+
+    num_ids: int = len(account_ids)
+    if num_ids > 50:
+        raise ValueError(f'You can request a maximum of 50 account names. Requested: {num_ids}')
+
+    return await get(token, f'api/display-names?accountId[]={'&accountId[]='.join(account_ids)}')
@@ -1,23 +1,32 @@
 '''
 | Author:   Ezio416
 | Created:  2024-05-07
-| Modified: 2025-08-05
+| Modified: 2026-10-18
 
 - Functions for interacting with authentication tokens to use with the API
 - Also contains variables and functions intended for internal use
 '''
 
 from base64 import b64encode, urlsafe_b64decode
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime as dt
+import email.utils
+import http.cookiejar
 import json
+import random
+import threading
 import time
+import typing
 
-import requests
-
+from . import cache
 from . import config
+from . import hooks
+from . import ratelimit
 from . import util
 
+if typing.TYPE_CHECKING:
+    from concurrent.futures import Future
+
 
 audience_core:  str = 'NadeoServices'
 audience_live:  str = 'NadeoLiveServices'  # also used for Meet endpoints (formerly known as Club)
@@ -27,14 +36,49 @@ url_core:       str = 'https://prod.trackmania.core.nadeo.online'
 url_live:       str = 'https://live-services.trackmania.nadeo.live'
 url_meet:       str = 'https://meet.trackmania.nadeo.club'
 url_oauth:      str = 'https://api.trackmania.com'
+url_ubi:        str = 'https://public-ubiservices.ubi.com'
+
+_inflight:      dict[str, 'Future'] = {}
+_inflight_lock: threading.Lock = threading.Lock()
+_sessions:      dict[str, tuple['requests.Session', int]] = {}
+_sessions_lock: threading.Lock = threading.Lock()
+
+requests: typing.Any = None  # imported by `_session()` when first needed
+
+
+class BadResponseError(ConnectionError):
+    '''
+    - raised when an API responds with an error status, once any retries are used up
+    - a `ConnectionError`, so code catching that still catches this
+
+    Parameters
+    ----------
+    message: str
+        - description of the error
+
+    status: int
+        - response status code
+        - default: `0` (unknown)
+    '''
+
+    status: int
+
+    def __init__(self, message: str, status: int = 0):
+        super().__init__(message)
+        self.status = status
 
+    def __reduce__(self) -> tuple:
+        return type(self), (str(self), self.status)
 
-@dataclass
+
+@dataclass(init=False)
 class Token():
     '''
     - holds data on an authentication token
     - does not contain a base URL as a token could be used for multiple
     - if you wish to use this with other request libraries (such as `requests`), add to the request header: `{'Authorization': token.access_token}`
+    - safe to share between threads - if several threads need to refresh it at once, only one refresh is sent
+    - the token's payload is only decoded the first time `token_decoded` or `expiration` is needed, then kept until the next refresh
 
     Parameters
     ----------
@@ -58,38 +102,58 @@ class Token():
         - default: `0`
     '''
 
+    __slots__ = '_decoded', '_expiration', '_refresh_lock', 'access_token', 'audience', 'refresh_token', 'server_account'
+
     access_token:   str
     audience:       str
-    expiration:     int
+    expiration:     int   # property below, kept in `_expiration` (0 until decoded from the payload)
     refresh_token:  str
     server_account: bool
-    token_decoded:  dict
+    token_decoded:  dict  # property below, kept in `_decoded` (None until decoded)
 
     def __init__(self, access_token: str, audience: str, refresh_token: str = '', server_account: bool = False, expiration: int = 0):
         self.access_token = access_token
         self.audience = audience
         self.refresh_token = refresh_token
         self.server_account = server_account
-
-        try:
-            self.token_decoded = decode_jwt_from_token(self.access_token)
-        except UnicodeDecodeError:
-            pass
-
-        if expiration != 0:
-            self.expiration = expiration
-        else:
-            try:
-                self.expiration = self.token_decoded['exp']
-            except KeyError:
-                self.expiration = int(time.time()) + 3600
+        self._decoded = None
+        self._expiration = expiration
+        self._refresh_lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        return {
+            'access_token':   self.access_token,
+            'audience':       self.audience,
+            'expiration':     self._expiration,
+            'refresh_token':  self.refresh_token,
+            'server_account': self.server_account,
+        }
 
     def __repr__(self) -> str:
         return f"nadeo_api.auth.Token('{self.audience}')"
 
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state['access_token'], state['audience'], state['refresh_token'], state['server_account'], state.get('expiration', 0))
+
     def __str__(self) -> str:
         return self.access_token
 
+    @property
+    def expiration(self) -> int:
+        '''
+        - time at which the access token/ticket will expire
+        - if the payload has no expiration, one hour from when this is first needed
+        '''
+
+        if not self._expiration:
+            self._expiration = self.token_decoded.get('exp') or int(time.time()) + 3600
+
+        return self._expiration
+
+    @expiration.setter
+    def expiration(self, expiration: int) -> None:
+        self._expiration = expiration
+
     @property
     def expired(self) -> bool:
         return int(time.time()) >= self.expiration
@@ -100,30 +164,278 @@ class Token():
         - raises a `ValueError` if called on an OAuth2 token
         '''
 
+        self._refresh_if_stale(self.access_token)
+
+    def _refresh_if_stale(self, stale_access_token: str) -> None:
+        '''
+        - refreshes the tokens unless the access token has already changed from the given one
+        - only one thread refreshes at a time - the others wait, then return once they see the new access token
+        '''
+
         if self.audience == audience_oauth:
             raise ValueError('You may not refresh an OAuth2 token - request a new one instead.')
 
-        req: requests.Response = requests.post(
-            f'{url_core}/v2/authentication/token/refresh',
-            headers={'Authorization': self.refresh_token},
-            # json={'audience': self.audience}  # seems to not actually be required
-        )
+        with self._refresh_lock:
+            if self.access_token != stale_access_token:  # another thread refreshed while we waited
+                return
 
-        if req.status_code >= 400:
-            raise ConnectionError(f'Bad response refreshing token for {self.audience}: code {req.status_code}, response {req.text}')
+            start: float = time.perf_counter()
 
-        json: dict = req.json()
+            req: requests.Response = _session(url_core).post(
+                f'{url_core}/v2/authentication/token/refresh',
+                headers={'Authorization': self.refresh_token},
+                # json={'audience': self.audience}  # seems to not actually be required
+            )
+
+            if req.status_code >= 400:
+                raise ConnectionError(f'Bad response refreshing token for {self.audience}: code {req.status_code}, response {req.text}')
+
+            self._update(req.json())
+
+            if hooks._subscribers[hooks.TOKEN_REFRESH] or config.debug_logging:
+                hooks._emit(hooks.TOKEN_REFRESH, {'audience': self.audience, 'elapsed': time.perf_counter() - start})
+
+    @property
+    def token_decoded(self) -> dict:
+        '''
+        - payload of the access token, or an empty dict if it cannot be decoded (i.e. a Ubisoft ticket)
+        '''
+
+        if self._decoded is None:
+            try:
+                self._decoded = decode_jwt_from_token(self.access_token)
+            except (IndexError, UnicodeDecodeError, ValueError):
+                self._decoded = {}
+
+        return self._decoded
+
+    @token_decoded.setter
+    def token_decoded(self, token_decoded: dict) -> None:
+        self._decoded = token_decoded
+
+    @property
+    def _scope(self) -> str:
+        '''
+        - identifies the account the token belongs to, so responses are only shared between requests from the same account
+        - the account ID from the payload, which stays the same across refreshes and processes
+        - empty if the payload has none, in which case responses are neither cached nor shared
+        '''
+
+        return self.token_decoded.get('sub') or ''
+
+    def _update(self, json: dict) -> None:
+        '''
+        - stores the tokens from a refresh response
+        - the new payload is decoded when next needed
+        '''
+
+        self._decoded = None
+        self._expiration = 0
         self.access_token = f'nadeo_v1 t={json['accessToken']}'
         self.refresh_token = f'nadeo_v1 t={json['refreshToken']}'
 
-        try:
-            self.token_decoded = decode_jwt_from_token(self.access_token)
-            self.expiration = self.token_decoded['exp']
-        except KeyError:
-            self.expiration = 0
-        except UnicodeDecodeError:
-            self.expiration = 0
-            self.token_decoded = {}
+
+@dataclass(slots=True)
+class _PoolMember():
+    '''
+    - one token in a `TokenPool`, with its own rate limiter for each base URL
+    '''
+
+    token:     Token
+    in_flight: int                              = 0
+    limiters:  dict[str, ratelimit.RateLimiter] = field(default_factory=dict)
+    requests:  int                              = 0
+
+
+class TokenPool():
+    '''
+    - holds tokens for several accounts with the same audience, and spreads requests across them
+    - can be passed anywhere a `Token` can, including the `aio` modules
+    - each account gets its own rate limiter for each API, used instead of the shared one, so throughput grows with the number of accounts
+    - each token is refreshed by itself when it expires, just like when it is used alone
+    - coalescing and caching treat the whole pool as one account, so its accounts should all have the same access, i.e. dedicated server accounts
+
+    Parameters
+    ----------
+    tokens: Iterable[Token]
+        - tokens to spread requests across, i.e. from `get_token()` with several dedicated server accounts
+        - must all have the same audience
+
+    strategy: str
+        - how to choose the token for each request
+        - `'least_loaded'` chooses the token with the fewest requests in flight (including ones waiting on its rate limiter), taking turns on ties
+        - `'round_robin'` takes turns regardless of load
+        - default: `'least_loaded'`
+
+    rate_limit: tuple[float, int] | None
+        - requests per second and burst allowed to each account on each API, in the same form as `config.rate_limits`
+        - default: `None` (each account gets the limit the config gives the API)
+    '''
+
+    audience:   str
+    rate_limit: tuple[float, int] | None
+    strategy:   str
+
+    def __init__(self, tokens: typing.Iterable[Token], strategy: str = 'least_loaded', rate_limit: tuple[float, int] | None = None):
+        if strategy not in ('least_loaded', 'round_robin'):
+            raise ValueError(f'Given strategy is invalid: {strategy}')
+
+        self.audience = ''
+        self.rate_limit = rate_limit
+        self.strategy = strategy
+        self._lock: threading.Lock = threading.Lock()
+        self._members: list[_PoolMember] = []
+        self._next: int = 0
+
+        for token in tokens:
+            self.add(token)
+
+        if not self._members:
+            raise ValueError('A token pool needs at least one token')
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __repr__(self) -> str:
+        return f"nadeo_api.auth.TokenPool('{self.audience}', {len(self._members)} tokens)"
+
+    @property
+    def in_flight(self) -> list[int]:
+        '''
+        - number of requests in flight for each token, in the same order as `tokens`
+        '''
+
+        return [member.in_flight for member in self._members]
+
+    @property
+    def requests(self) -> list[int]:
+        '''
+        - number of requests sent with each token, in the same order as `tokens`
+        - retries of a request are not counted again
+        '''
+
+        return [member.requests for member in self._members]
+
+    @property
+    def server_account(self) -> bool:
+        '''
+        - whether any token is for a dedicated server account, as endpoints requiring a Ubisoft account would fail with it
+        '''
+
+        return any(member.token.server_account for member in self._members)
+
+    @property
+    def tokens(self) -> list[Token]:
+        return [member.token for member in self._members]
+
+    def add(self, token: Token) -> None:
+        '''
+        - adds a token to the pool
+        - raises a `ValueError` if its audience does not match the pool's
+
+        Parameters
+        ----------
+        token: Token
+            - authentication token from `get_token()`
+        '''
+
+        with self._lock:
+            if self._members and token.audience != self.audience:
+                raise ValueError(f'Mismatched audience for token pool: {token.audience} | {self.audience}')
+
+            self.audience = token.audience
+            self._members.append(_PoolMember(token))
+
+    def refresh(self) -> None:
+        '''
+        - refreshes every token in the pool
+        - raises a `ValueError` if called on a pool of OAuth2 tokens
+        '''
+
+        for token in self.tokens:
+            token.refresh()
+
+    @property
+    def _scope(self) -> str:
+        '''
+        - identifies the accounts in the pool - responses are shared between its tokens, as if they were one account
+        - empty if any token's account is unknown, like `Token._scope`
+        '''
+
+        scopes: list[str] = sorted(member.token._scope for member in self._members)
+        return f'pool-{','.join(scopes)}' if all(scopes) else ''
+
+    def _acquire(self, base_url: str) -> _PoolMember:
+        '''
+        - chooses the token for a request and counts the request as in flight until `_release()`
+        '''
+
+        with self._lock:
+            count: int = len(self._members)
+            start: int = self._next % count
+
+            if self.strategy == 'round_robin':
+                member: _PoolMember = self._members[start]
+            else:
+                member = min((self._members[(start + i) % count] for i in range(count)), key=lambda m: m.in_flight)
+
+            self._next = start + 1
+            member.in_flight += 1
+            member.requests += 1
+
+            if base_url not in member.limiters:
+                rate, burst = self.rate_limit or ratelimit._settings(base_url, self.audience)
+                member.limiters[base_url] = ratelimit._build(float(rate), int(burst), config.adaptive_rate_limits)
+
+            return member
+
+    def _release(self, member: _PoolMember) -> None:
+        with self._lock:
+            member.in_flight -= 1
+
+
+def close_sessions() -> None:
+    '''
+    - closes all pooled HTTP sessions and their connections
+    - a new session is opened automatically the next time a request is sent to a base URL
+    '''
+
+    with _sessions_lock:
+        while _sessions:
+            _, (session, _) = _sessions.popitem()
+            session.close()
+
+
+def _coalesce(key: str, fetch: typing.Callable[[], bytes]) -> bytes:
+    '''
+    - calls `fetch`, unless another thread is already fetching the same key, in which case its result is shared
+    - exceptions are shared too, so every waiting caller sees the same failure
+    - keys include the account, as some responses (and failures) depend on which account sent the request
+    '''
+
+    from concurrent.futures import Future
+
+    with _inflight_lock:
+        if (future := _inflight.get(key)) is None:
+            future = _inflight[key] = Future()
+            leader: bool = True
+        else:
+            leader = False
+
+    if not leader:
+        return future.result()
+
+    try:
+        content: bytes = fetch()
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(content)
+        return content
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
 
 
 def decode_jwt_from_token(token: str) -> dict:
@@ -140,7 +452,7 @@ def decode_jwt_from_token(token: str) -> dict:
     return result
 
 
-def _delete(token: Token, base_url: str, endpoint: str, params: dict = {}, body: dict = {}) -> dict | list:
+def _delete(token: Token, base_url: str, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a DELETE request to a specified API
     - this is for internal use - you should use an API-specific `delete` function instead
@@ -168,16 +480,20 @@ def _delete(token: Token, base_url: str, endpoint: str, params: dict = {}, body:
         - request body if applicable
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return _request(token, base_url, endpoint, params, 'delete', body)
+    return _request(token, base_url, endpoint, params, 'delete', body, raw=raw)
 
 
-def _get(token: Token, base_url: str, endpoint: str, params: dict = {}) -> dict | list:
+def _get(token: Token, base_url: str, endpoint: str, params: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a GET request to a specified API
     - this is for internal use - you should use an API-specific `get` function instead
@@ -201,13 +517,17 @@ def _get(token: Token, base_url: str, endpoint: str, params: dict = {}) -> dict
         - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return _request(token, base_url, endpoint, params)
+    return _request(token, base_url, endpoint, params, raw=raw)
 
 
 def get_token(audience: str, username: str, password: str, agent: str = '', server_account: bool = False) -> Token:
@@ -241,22 +561,13 @@ def get_token(audience: str, username: str, password: str, agent: str = '', serv
         - default: `False`
     '''
 
-    aud_lower: str = audience.lower()
-
-    if aud_lower in ('nadeoservices', 'core', 'prod'):
-        audience = audience_core
-    elif aud_lower in ('nadeoliveservices', 'live', 'meet', 'club'):
-        audience = audience_live
-    elif aud_lower in ('oauth', 'oauth2'):
-        audience = audience_oauth
-    else:
-        raise ValueError(f'Given audience is not valid: {audience}')
+    audience = _parse_audience(audience)
 
     util._log(audience)
 
     if audience == audience_oauth:
-        req: requests.Response = requests.post(
-            'https://api.trackmania.com/api/access_token',
+        req: requests.Response = _session(url_oauth).post(
+            f'{url_oauth}/api/access_token',
             headers={'Content-Type': 'application/x-www-form-urlencoded'},
             data={
                 'grant_type':    'client_credentials',
@@ -274,8 +585,8 @@ def get_token(audience: str, username: str, password: str, agent: str = '', serv
     if agent == '':
         raise ValueError('For web services endpoints, you must specify a user agent')
 
-    req: requests.Response = requests.post(
-        f'{url_core}/v2/authentication/token/basic' if server_account else 'https://public-ubiservices.ubi.com/v3/profiles/sessions',
+    req: requests.Response = (_session(url_core) if server_account else _session(url_ubi)).post(
+        f'{url_core}/v2/authentication/token/basic' if server_account else f'{url_ubi}/v3/profiles/sessions',
         headers={
             'Authorization': f'Basic {b64encode(f'{username}:{password}'.encode('utf-8')).decode('ascii')}',
             'Content-Type':  'application/json',
@@ -295,7 +606,7 @@ def get_token(audience: str, username: str, password: str, agent: str = '', serv
 
     ticket: Token = Token(f'ubi_v1 t={json['ticket']}', json['platformType'], expiration=int(dt.fromisoformat(json['expiration']).timestamp()))
 
-    req2: requests.Response = requests.post(
+    req2: requests.Response = _session(url_core).post(
         f'{url_core}/v2/authentication/token/ubiservices',
         headers={'Authorization': ticket.access_token},
         json={'audience': audience}
@@ -308,7 +619,7 @@ def get_token(audience: str, username: str, password: str, agent: str = '', serv
     return Token(f'nadeo_v1 t={json2['accessToken']}', audience, f'nadeo_v1 t={json2['refreshToken']}')
 
 
-def _head(token: Token, base_url: str, endpoint: str, params: dict = {}) -> dict | list:
+def _head(token: Token, base_url: str, endpoint: str, params: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a HEAD request to a specified API
     - this is for internal use - you should use an API-specific `head` function instead
@@ -332,16 +643,20 @@ def _head(token: Token, base_url: str, endpoint: str, params: dict = {}) -> dict
         - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return _request(token, base_url, endpoint, params, 'head')
+    return _request(token, base_url, endpoint, params, 'head', raw=raw)
 
 
-def _options(token: Token, base_url: str, endpoint: str, params: dict = {}, body: dict = {}) -> dict | list:
+def _options(token: Token, base_url: str, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends an OPTIONS request to a specified API
     - this is for internal use - you should use an API-specific `options` function instead
@@ -369,16 +684,40 @@ def _options(token: Token, base_url: str, endpoint: str, params: dict = {}, body
         - request body if applicable
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return _request(token, base_url, endpoint, params, 'options', body)
+    return _request(token, base_url, endpoint, params, 'options', body, raw=raw)
+
+
+def _parse_audience(audience: str) -> str:
+    '''
+    - converts any accepted audience name to its canonical form
+    - raises a `ValueError` if the audience is not recognized
+    '''
+
+    aud_lower: str = audience.lower()
+
+    if aud_lower in ('nadeoservices', 'core', 'prod'):
+        return audience_core
+
+    if aud_lower in ('nadeoliveservices', 'live', 'meet', 'club'):
+        return audience_live
+
+    if aud_lower in ('oauth', 'oauth2'):
+        return audience_oauth
 
+    raise ValueError(f'Given audience is not valid: {audience}')
 
-def _patch(token: Token, base_url: str, endpoint: str, params: dict = {}, body: dict = {}) -> dict | list:
+
+def _patch(token: Token, base_url: str, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a PATCH request to a specified API
     - this is for internal use - you should use an API-specific `patch` function instead
@@ -406,16 +745,20 @@ def _patch(token: Token, base_url: str, endpoint: str, params: dict = {}, body:
         - request body if applicable
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return _request(token, base_url, endpoint, params, 'patch', body)
+    return _request(token, base_url, endpoint, params, 'patch', body, raw=raw)
 
 
-def _post(token: Token, base_url: str, endpoint: str, params: dict = {}, body: dict = {}) -> dict | list:
+def _post(token: Token, base_url: str, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a POST request to a specified API
     - this is for internal use - you should use an API-specific `post` function instead
@@ -443,16 +786,64 @@ def _post(token: Token, base_url: str, endpoint: str, params: dict = {}, body: d
         - request body if applicable
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
+    Returns
+    -------
+    dict | list | bytes
+        - response body, as bytes if `raw`
+    '''
+
+    return _request(token, base_url, endpoint, params, 'post', body, raw=raw)
+
+
+def _prepare_request(token: Token, base_url: str, endpoint: str, method: str) -> tuple[str, str, str, str]:
+    '''
+    - validates and normalizes the parts of a request
+    - raises a `ValueError` if the base URL or method is invalid, or if the token's audience does not match the base URL
+
     Returns
     -------
-    dict | list
-        - response body
+    tuple[str, str, str, str]
+        - base URL, endpoint without base URL or leading slash, lowercase method, and display name of the API
     '''
 
-    return _request(token, base_url, endpoint, params, 'post', body)
+    if (base_url := base_url.lower()) not in (url_core, url_live, url_meet, url_oauth):
+        raise ValueError(f'Given base URL is invalid: {base_url}')
+
+    if (method := method.lower()) not in ('delete', 'get', 'head', 'options', 'patch', 'post', 'put'):
+        raise ValueError(f'Given method is invalid: {method}')
+
+    base_name: str = 'Core'
+
+    if base_url == url_core:
+        if token.audience != audience_core:
+            raise ValueError(f'Mismatched audience and base URL: {token.audience} | {base_url}')
+
+    elif base_url in (url_live, url_meet):
+        if token.audience != audience_live:
+            raise ValueError(f'Mismatched audience and base URL: {token.audience} | {base_url}')
+
+        base_name = 'Live' if base_url == url_live else 'Meet'
+
+    else:
+        if token.audience != audience_oauth:
+            raise ValueError(f'Mismatched audience and base URL: {token.audience} | {base_url}')
+
+        base_name = audience_oauth
+
+    if endpoint.startswith(base_url):
+        endpoint = endpoint.split(base_url)[1]
+
+    if endpoint.startswith('/'):
+        endpoint = endpoint[1:]
+
+    return base_url, endpoint, method, base_name
 
 
-def _put(token: Token, base_url: str, endpoint: str, params: dict = {}, body: dict = {}) -> dict | list:
+def _put(token: Token, base_url: str, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a PUT request to a specified API
     - this is for internal use - you should use an API-specific `put` function instead
@@ -480,16 +871,20 @@ def _put(token: Token, base_url: str, endpoint: str, params: dict = {}, body: di
         - request body if applicable
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return _request(token, base_url, endpoint, params, 'put', body)
+    return _request(token, base_url, endpoint, params, 'put', body, raw=raw)
 
 
-def _request(token: Token, base_url: str, endpoint: str, params: dict = {}, method: str = 'get', body: dict = {}) -> dict | list:
+def _request(token: Token, base_url: str, endpoint: str, params: dict = {}, method: str = 'get', body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a request to a specified API
     - this is for internal use - you should use an explicit function like `core.get()` instead
@@ -522,73 +917,237 @@ def _request(token: Token, base_url: str, endpoint: str, params: dict = {}, meth
         - request body
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    util._log(f'{method.upper()} {base_url}/{endpoint} | params: {params} | body: {body}')
+    base_url, endpoint, method, base_name = _prepare_request(token, base_url, endpoint, method)
 
-    if (base_url := base_url.lower()) not in (url_core, url_live, url_meet, url_oauth):
-        raise ValueError(f'Given base URL is invalid: {base_url}')
+    if hooks._subscribers[hooks.REQUEST_START] or config.debug_logging:
+        hooks._emit(hooks.REQUEST_START, {'method': method, 'base_url': base_url, 'endpoint': endpoint, 'params': params, 'body': body})
 
-    if (method := method.lower()) not in ('delete', 'get', 'head', 'options', 'patch', 'post', 'put'):
-        raise ValueError(f'Given method is invalid: {method}')
+    backend: cache.Cache | None = None
+    scope:   str = token._scope if method == 'get' else ''  # only known accounts have their responses cached or shared
+    shared:  bool = bool(scope) and config.coalesce_requests
 
-    base_name: str = 'Core'
+    if scope and (shared or cache._backend is not None):
+        endpoint_key: str = cache._normalize(endpoint, params)
+        cache_key: str = f'{scope}@{base_url}/{endpoint_key}'  # see cache.make_key
 
-    if base_url == url_core:
-        if token.audience != audience_core:
-            raise ValueError(f'Mismatched audience and base URL: {token.audience} | {base_url}')
+        if (backend := cache._backend) is not None and (content := backend.get(cache_key)) is not None:
+            if hooks._subscribers[hooks.CACHE_HIT] or config.debug_logging:
+                hooks._emit(hooks.CACHE_HIT, {'base_url': base_url, 'endpoint': endpoint_key})
 
-    elif base_url in (url_live, url_meet):
-        if token.audience != audience_live:
-            raise ValueError(f'Mismatched audience and base URL: {token.audience} | {base_url}')
+            return content if raw else util._json_decoder(content)
 
-        base_name = 'Live' if base_url == url_live else 'Meet'
+    def __send(token: Token, access_token: str, limiter: ratelimit.RateLimiter | None) -> 'requests.Response':
+        session: requests.Session = _session(base_url)  # before waiting, so `requests` is imported by the time errors are caught
+        limiter = _wait(base_url, token.audience, limiter)
+        start: float = time.perf_counter()
 
-    else:
-        if token.audience != audience_oauth:
-            raise ValueError(f'Mismatched audience and base URL: {token.audience} | {base_url}')
+        req: requests.Response = getattr(session, method)(  # trust that requests never breaks this
+            url=f'{base_url}/{endpoint}',
+            params=params,
+            headers={'Authorization': access_token},
+            json=body
+        )
 
-        base_name = audience_oauth
+        elapsed: float = time.perf_counter() - start
+        limiter.feedback(req.status_code, elapsed)
 
-    if token.expired:
-        token.refresh()
+        if hooks._subscribers[hooks.REQUEST_END] or config.debug_logging:
+            hooks._emit(hooks.REQUEST_END, {
+                'method':   method,
+                'base_url': base_url,
+                'endpoint': endpoint,
+                'status':   req.status_code,
+                'elapsed':  elapsed,
+                'size':     len(req.content),
+            })
 
-    if endpoint.startswith(base_url):
-        endpoint = endpoint.split(base_url)[1]
+        return req
 
-    if endpoint.startswith('/'):
-        endpoint = endpoint[1:]
+    def __fetch() -> bytes:
+        if not isinstance(token, TokenPool):
+            return __fetch_with(token, None)
 
-    def __request() -> requests.Response:
-        _wait()
-        return getattr(requests, method)(  # trust that requests never breaks this
-            url=f'{base_url}/{endpoint}',
-            params=params,
-            headers={'Authorization': token.access_token},
-            json=body
+        member: _PoolMember = token._acquire(base_url)
+
+        try:
+            return __fetch_with(member.token, member.limiters[base_url])
+        finally:
+            token._release(member)
+
+    def __fetch_with(token: Token, limiter: ratelimit.RateLimiter | None) -> bytes:
+        stale: str = token.access_token  # read before checking, so a refresh finishing in between is not sent again
+
+        if token.expired:
+            token._refresh_if_stale(stale)
+
+        failures: int = 0
+        refreshed: bool = False
+        retries: int = 0
+
+        while True:
+            access_token: str = token.access_token
+            delay: float | None
+
+            try:
+                req: requests.Response = __send(token, access_token, limiter)
+                status: int | None = req.status_code
+            except (requests.ConnectionError, requests.Timeout):
+                failures += 1
+                if (delay := _retry_delay(method, None, failures)) is None:
+                    raise
+                status = None
+            else:
+                if status < 400:
+                    break
+
+                if status == 401 and not refreshed:  # token may have expired prematurely
+                    token._refresh_if_stale(access_token)
+                    refreshed = True
+                    delay = 0.0
+                else:
+                    failures += 1
+                    if (delay := _retry_delay(method, status, failures, req.headers.get('Retry-After'))) is None:
+                        raise BadResponseError(f'Bad response from {base_name} API: code {status}, response {req.text}', status)
+
+            retries += 1
+
+            if hooks._subscribers[hooks.RETRY] or config.debug_logging:
+                hooks._emit(hooks.RETRY, {'method': method, 'base_url': base_url, 'endpoint': endpoint, 'status': status, 'attempt': retries, 'delay': delay})
+
+            if delay > 0.0:
+                time.sleep(delay)
+
+        if backend is not None and (ttl := backend.ttl_for(endpoint_key)) != 0:
+            backend.set(cache_key, req.content, ttl)
+
+        return req.content
+
+    content: bytes = _coalesce(cache_key, __fetch) if shared else __fetch()  # never shared between accounts
+    return content if raw else util._json_decoder(content)
+
+
+def _retry_delay(method: str, status: int | None, failures: int, retry_after: str | None = None) -> float | None:
+    '''
+    - gets how long to sleep before sending a failed request again, following the `config.retry_*` settings
+    - waits for `Retry-After` (capped at `config.retry_backoff_max_s`) if the response has it, otherwise backs off exponentially with full jitter
+
+    Parameters
+    ----------
+    method: str
+        - lowercase request method
+
+    status: int | None
+        - status code of the failed response, or `None` if no response was received (i.e. connection reset or timeout)
+
+    failures: int
+        - number of failed attempts so far, including this one
+
+    retry_after: str | None
+        - value of the `Retry-After` response header, either in seconds or an HTTP date
+        - default: `None`
+
+    Returns
+    -------
+    float | None
+        - seconds to sleep, or `None` if the request should not be sent again
+    '''
+
+    if failures > config.retry_attempts or method not in config.retry_methods:
+        return None
+
+    if status is not None and status not in config.retry_statuses:
+        return None
+
+    if retry_after:
+        try:
+            return min(max(int(retry_after), 0), config.retry_backoff_max_s)
+        except ValueError:
+            pass
+
+        try:
+            return min(max(email.utils.parsedate_to_datetime(retry_after).timestamp() - time.time(), 0.0), config.retry_backoff_max_s)
+        except (TypeError, ValueError):
+            pass  # unparseable, so back off as usual
+
+    return random.uniform(0.0, min(config.retry_backoff_max_s, config.retry_backoff_s * 2 ** (failures - 1)))
+
+
+def _session(base_url: str) -> 'requests.Session':
+    '''
+    - gets the pooled keep-alive session for a base URL, creating it if needed
+    - sessions older than `config.session_max_age_s` are closed and replaced
+    - cookies are neither stored nor sent, as the session is shared by every account
+    - `requests` is imported here the first time a session is needed, rather than when this module is imported
+    '''
+
+    global requests
+
+    now: int = util.stamp()
+
+    if (entry := _sessions.get(base_url)) is not None:
+        session, created = entry
+        if config.session_max_age_s <= 0 or now - created < config.session_max_age_s:
+            return session
+
+    with _sessions_lock:
+        if (entry := _sessions.get(base_url)) is not None:  # another thread may have replaced it while we waited
+            session, created = entry
+            if config.session_max_age_s <= 0 or now - created < config.session_max_age_s:
+                return session
+
+            session.close()
+
+        if requests is None:
+            import requests
+
+        adapter: requests.adapters.HTTPAdapter = requests.adapters.HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=config.pool_maxsize,
+            pool_block=config.pool_block
         )
 
-    req: requests.Response = __request()
+        session = requests.Session()
+        session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))  # shared by every token, so nothing is kept
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
 
-    if req.status_code == 401:  # token may have expired prematurely
-        token.refresh()
-        req = __request()
+        _sessions[base_url] = session, now
+        return session
 
-    if req.status_code >= 400:
-        raise ConnectionError(f'Bad response from {base_name} API: code {req.status_code}, response {req.text}')
 
-    return req.json()
+def _wait(base_url: str, audience: str, limiter: ratelimit.RateLimiter | None = None) -> ratelimit.RateLimiter:
+    '''
+    - sleeps until the rate limiter for a base URL allows another request
+    - uses the given limiter instead if there is one, i.e. a token's own limiter in a `TokenPool`
+    - with `config.priority_scheduling`, waits for the limiter's scheduler to hand this request a slot instead
+    - returns the limiter so it can be given feedback on the response
+    '''
 
+    if limiter is None:
+        limiter = ratelimit.get_limiter(base_url, audience)
 
-def _wait() -> None:
-    now: int = util.stamp(True)
-    if now - config._last_request_timestamp < config.wait_between_requests_ms:
-        util._log('')
-        time.sleep(float(config._last_request_timestamp + config.wait_between_requests_ms - now) / 1000.0)
-        config._last_request_timestamp = util.stamp(True)
-    else:
-        config._last_request_timestamp = now
+    if config.priority_scheduling:
+        from . import scheduler  # only imported here, as it imports asyncio
+
+        if (waited := scheduler.get_scheduler(limiter).acquire()) > 0.0 and (hooks._subscribers[hooks.RATE_WAIT] or config.debug_logging):
+            hooks._emit(hooks.RATE_WAIT, {'base_url': base_url, 'delay': waited})
+
+        return limiter
+
+    if (delay := limiter.reserve()) > 0.0:
+        if hooks._subscribers[hooks.RATE_WAIT] or config.debug_logging:
+            hooks._emit(hooks.RATE_WAIT, {'base_url': base_url, 'delay': delay})
+
+        time.sleep(delay)
+
+    return limiter
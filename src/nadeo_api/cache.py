@@ -0,0 +1,389 @@
+'''
+| Author:   Ezio416
+| Created:  2026-10-18
+| Modified: 2026-10-18
+
+- Optional caching of GET responses, checked before a request uses any of the rate limit
+- Disabled by default - enable it with `set_backend()`, i.e. `cache.set_backend(cache.MemoryCache())`
+- Responses are stored as the raw bytes received, so every caller gets its own freshly decoded copy
+- Responses are only served to requests from the account they were received with, as some depend on it
+'''
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import fnmatch
+import os
+import threading
+import time
+import typing
+import urllib.parse
+
+
+sqlite3: typing.Any = None  # imported by `SQLiteCache` when first needed, as most programs never use it
+
+
+@dataclass
+class CacheStats():
+    '''
+    - counters describing how a cache backend has been used
+    '''
+
+    entries:   int = 0
+    evictions: int = 0
+    hits:      int = 0
+    misses:    int = 0
+    size:      int = 0  # bytes
+
+    @property
+    def hit_rate(self) -> float:
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class Cache():
+    '''
+    - base class for a cache backend
+    - subclass this and pass an instance to `set_backend()` to store responses elsewhere
+    - `get()` and `set()` may be called from many threads at once, so subclasses must make them thread-safe
+
+    Parameters
+    ----------
+    ttl: float | None
+        - number of seconds a response is kept
+        - `None` keeps responses forever, and `0` disables caching for endpoints with no rule in `ttls`
+        - default: `60.0`
+
+    ttls: dict[str, float | None]
+        - per-endpoint overrides of `ttl`, keyed by pattern
+        - patterns are matched with `fnmatch` against the endpoint without its base URL, followed by its sorted parameters
+        - the first matching pattern is used, i.e. `{'zones': 86400, 'api/token/leaderboard/*': 0}`
+        - default: `{}` (empty)
+    '''
+
+    ttl:  float | None
+    ttls: dict[str, float | None]
+
+    def __init__(self, ttl: float | None = 60.0, ttls: dict[str, float | None] = {}):
+        self._stats: CacheStats = CacheStats()
+        self.ttl = ttl
+        self.ttls = dict(ttls)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._stats
+
+    def clear(self) -> None:
+        '''
+        - removes every stored response
+        '''
+
+        pass
+
+    def get(self, key: str) -> bytes | None:
+        '''
+        - gets a stored response if it has not expired
+
+        Parameters
+        ----------
+        key: str
+            - cache key from `make_key()`
+
+        Returns
+        -------
+        bytes | None
+            - response body, or `None` if not found
+        '''
+
+        return None
+
+    def set(self, key: str, value: bytes, ttl: float | None) -> None:
+        '''
+        - stores a response
+
+        Parameters
+        ----------
+        key: str
+            - cache key from `make_key()`
+
+        value: bytes
+            - response body
+
+        ttl: float | None
+            - number of seconds to keep the response, or `None` to keep it forever
+        '''
+
+        pass
+
+    def ttl_for(self, endpoint: str) -> float | None:
+        '''
+        - gets the number of seconds to keep a response for a normalized endpoint
+        '''
+
+        for pattern, ttl in self.ttls.items():
+            if fnmatch.fnmatchcase(endpoint, pattern):
+                return ttl
+
+        return self.ttl
+
+
+class MemoryCache(Cache):
+    '''
+    - keeps responses in memory, evicting the least recently used when full
+
+    Parameters
+    ----------
+    max_entries: int
+        - maximum number of responses kept
+        - default: `1024`
+
+    max_size: int
+        - maximum total size of responses kept, in bytes
+        - default: `67_108_864` (64 MiB)
+
+    ttl: float | None
+        - see `Cache`
+        - default: `60.0`
+
+    ttls: dict[str, float | None]
+        - see `Cache`
+        - default: `{}` (empty)
+    '''
+
+    max_entries: int
+    max_size:    int
+
+    def __init__(self, max_entries: int = 1024, max_size: int = 67_108_864, ttl: float | None = 60.0, ttls: dict[str, float | None] = {}):
+        super().__init__(ttl, ttls)
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float | None, bytes]] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f'nadeo_api.cache.MemoryCache({self.max_entries}, {self.max_size})'
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats.entries = 0
+            self._stats.size = 0
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            if (entry := self._entries.get(key)) is None:
+                self._stats.misses += 1
+                return None
+
+            expires, value = entry
+
+            if expires is not None and expires <= time.monotonic():
+                self._remove(key)
+                self._stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float | None) -> None:
+        size: int = len(key) + len(value)
+
+        if size > self.max_size:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (None if ttl is None else time.monotonic() + ttl), value
+            self._stats.entries += 1
+            self._stats.size += size
+
+            while self._stats.entries > self.max_entries or self._stats.size > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self._stats.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        _, value = self._entries.pop(key)
+        self._stats.entries -= 1
+        self._stats.size -= len(key) + len(value)
+
+
+class SQLiteCache(Cache):
+    '''
+    - keeps responses in an SQLite database file, so they survive restarts
+    - uses write-ahead logging, so several processes on the same machine may share one file
+    - meant for data that rarely or never changes, i.e. `SQLiteCache('cache.db', 0, {'maps/*': None})`
+    - take care with endpoints that use an offset from the current date (like `live.get_maps_totd`), as the same key refers to different data over time
+    - expired responses are deleted when found and whenever the file is opened
+
+    Parameters
+    ----------
+    path: str
+        - path to the database file, which is created if needed
+
+    ttl: float | None
+        - see `Cache`
+        - default: `None` (forever)
+
+    ttls: dict[str, float | None]
+        - see `Cache`
+        - default: `{}` (empty)
+    '''
+
+    path: str
+
+    def __init__(self, path: str, ttl: float | None = None, ttls: dict[str, float | None] = {}):
+        global sqlite3
+
+        if sqlite3 is None:
+            import sqlite3
+
+        super().__init__(ttl, ttls)
+        self.path = os.path.abspath(path)
+        self._lock: threading.Lock = threading.Lock()
+
+        self._db: sqlite3.Connection = sqlite3.connect(self.path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, expires REAL, value BLOB NOT NULL)')
+        self.prune()
+
+    def __repr__(self) -> str:
+        return f"nadeo_api.cache.SQLiteCache('{self.path}')"
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            self._stats.entries, self._stats.size = self._db.execute(
+                'SELECT COUNT(*), COALESCE(SUM(LENGTH(key) + LENGTH(value)), 0) FROM responses'
+            ).fetchone()
+
+        return self._stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute('DELETE FROM responses')
+
+    def close(self) -> None:
+        '''
+        - closes the database file - the cache may not be used afterwards
+        '''
+
+        with self._lock:
+            self._db.close()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            row: tuple | None = self._db.execute('SELECT expires, value FROM responses WHERE key = ?', (key,)).fetchone()
+
+            if row is None:
+                self._stats.misses += 1
+                return None
+
+            expires, value = row
+
+            if expires is not None and expires <= time.time():
+                self._db.execute('DELETE FROM responses WHERE key = ? AND expires <= ?', (key, time.time()))
+                self._stats.misses += 1
+                return None
+
+            self._stats.hits += 1
+            return value
+
+    def prune(self) -> None:
+        '''
+        - deletes every expired response
+        '''
+
+        with self._lock:
+            self._stats.evictions += self._db.execute('DELETE FROM responses WHERE expires <= ?', (time.time(),)).rowcount
+
+    def set(self, key: str, value: bytes, ttl: float | None) -> None:
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO responses (key, expires, value) VALUES (?, ?, ?)',
+                (key, None if ttl is None else time.time() + ttl, value)
+            )
+
+
+_backend: Cache | None = None
+
+
+def clear() -> None:
+    '''
+    - removes every response stored in the current backend
+    '''
+
+    if _backend is not None:
+        _backend.clear()
+
+
+def get_backend() -> Cache | None:
+    '''
+    - gets the cache backend in use, or `None` if caching is disabled
+    '''
+
+    return _backend
+
+
+def make_key(base_url: str, endpoint: str, params: dict = {}, account: str = '') -> str:
+    '''
+    - builds the cache key for a request
+    - parameters are merged from the endpoint and `params`, then sorted, so equivalent requests share a key
+    - requests are cached with the account of their token, so a shared cache never serves one account's response to another
+
+    Parameters
+    ----------
+    base_url: str
+        - base URL of the API
+
+    endpoint: str
+        - endpoint without base URL or leading slash
+
+    params: dict
+        - request parameters if applicable
+        - default: `{}` (empty)
+
+    account: str
+        - account the request is sent with, i.e. the `sub` of the token's payload
+        - default: `''` (none)
+
+    Returns
+    -------
+    str
+        - cache key
+    '''
+
+    key: str = f'{base_url}/{_normalize(endpoint, params)}'
+    return f'{account}@{key}' if account else key
+
+
+def set_backend(backend: Cache | None) -> None:
+    '''
+    - sets the cache backend used for GET requests
+
+    Parameters
+    ----------
+    backend: Cache | None
+        - backend to use, or `None` to disable caching
+    '''
+
+    global _backend
+    _backend = backend
+
+
+def _normalize(endpoint: str, params: dict) -> str:
+    path, _, query = endpoint.partition('?')
+    pairs: list[tuple[str, str]] = urllib.parse.parse_qsl(query, keep_blank_values=True)
+
+    for name, value in params.items():
+        if isinstance(value, (list, tuple)):
+            pairs.extend((name, str(item)) for item in value)
+        else:
+            pairs.append((name, str(value)))
+
+    if not pairs:
+        return path
+
+    return f'{path}?{urllib.parse.urlencode(sorted(pairs))}'
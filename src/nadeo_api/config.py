@@ -1,11 +1,24 @@
 '''
 | Author:   Ezio416
 | Created:  2025-08-04
-| Modified: 2025-08-05
+| Modified: 2026-10-18
 
 - Variables that be changed and used project-wide
 '''
 
-debug_logging:            bool = False
-_last_request_timestamp:  int  = 0
-wait_between_requests_ms: int  = 1000
+adaptive_rate_limits:     bool  = False
+batch_map_info_ms:        int   = 0  # see `core.MapInfoLoader`, 0 disables batching
+coalesce_requests:        bool  = True
+debug_logging:            bool  = False
+max_workers:              int   = 4
+pool_block:               bool  = False
+pool_maxsize:             int   = 10
+priority_scheduling:      bool  = False  # see `scheduler`
+rate_limits:              dict  = {}  # {base URL or audience: (requests per second, burst)}
+retry_attempts:           int   = 3  # retries after the first attempt, 0 disables retrying
+retry_backoff_max_s:      float = 60.0
+retry_backoff_s:          float = 1.0
+retry_methods:            tuple = 'delete', 'get', 'head', 'options', 'put'  # idempotent only, since a retried POST may be applied twice
+retry_statuses:           tuple = 429, 500, 502, 503, 504
+session_max_age_s:        int   = 0
+wait_between_requests_ms: int   = 1000
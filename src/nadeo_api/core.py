@@ -1,25 +1,216 @@
 '''
 | Author:   Ezio416
 | Created:  2024-05-14
-| Modified: 2025-08-05
+| Modified: 2026-10-18
 
 - Functions for interacting with the web services Core API
 '''
 
+import contextvars
+import itertools
+import threading
 import typing
 
 from . import auth
+from . import config
 from . import util
 
+if typing.TYPE_CHECKING:
+    from concurrent.futures import Future
+
 
 AUDIENCE: str = auth.audience_core
 URL:      str = auth.url_core
 
+_map_uid_limit: int = 291  # most map UIDs accepted in one request
+
+_Batch: typing.TypeAlias = 'tuple[auth.Token, dict[str, Future], list[list[str]]]'  # token, future by UID, UIDs of each lookup
+
+
+class MapInfoLoader():
+    '''
+    - combines map info lookups sent at about the same time, i.e. from many threads, into shared requests
+    - used by `get_map_info` while `config.batch_map_info_ms` is more than `0` - the shared instance is `map_info_loader`
+    - a batch is sent `config.batch_map_info_ms` after its first lookup, or as soon as it holds 291 UIDs
+    - lookups are batched separately for each token, and lookups of the same UID in one batch share a single entry
+    - if a batch is rejected for bad input (a 400 or 404 response, i.e. for a malformed UID), it is split in halves until the
+      lookups with the bad input are found, so only those fail
+    '''
+
+    def __init__(self):
+        self._batches: dict[int, _Batch] = {}  # by ID of the token
+        self._lock:    threading.Lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(futures) for _, futures, _ in self._batches.values())
+
+    def __repr__(self) -> str:
+        return 'nadeo_api.core.MapInfoLoader()'
+
+    def flush(self) -> None:
+        '''
+        - sends every pending batch now, in the calling thread
+        '''
+
+        with self._lock:
+            batches: list[_Batch] = list(self._batches.values())
+            self._batches.clear()
+
+        for batch in batches:
+            self._send(batch)
+
+    def load(self, token: auth.Token, uids: typing.Iterable[str]) -> 'list[Future]':
+        '''
+        - adds map UIDs to the pending batch for a token, without waiting for it to be sent
+
+        Parameters
+        ----------
+        token: auth.Token
+            - authentication token from `auth.get_token`
+
+        uids: Iterable[str]
+            - map UIDs
+
+        Returns
+        -------
+        list[Future]
+            - future for each UID in the given order, resolving to its map info, or `None` if the map was not found
+        '''
+
+        from concurrent.futures import Future
+
+        futures: list[Future] = []
+        full: list[_Batch] = []
+        group: list[str] = []
+        key: int = id(token)
+
+        with self._lock:
+            for uid in uids:
+                if (batch := self._batches.get(key)) is None:
+                    batch = self._batches[key] = token, {}, []
+
+                    timer: threading.Timer = threading.Timer(
+                        config.batch_map_info_ms / 1000,
+                        contextvars.copy_context().run,  # sent with the first caller's settings, i.e. `scheduler.priority()`
+                        (self._expire, key, batch)
+                    )
+                    timer.daemon = True
+                    timer.start()
+
+                pending: dict[str, Future] = batch[1]
+
+                if not batch[2] or batch[2][-1] is not group:  # first UID of this lookup in this batch
+                    group = []
+                    batch[2].append(group)
+
+                if (future := pending.get(uid)) is None:
+                    future = pending[uid] = Future()
+
+                futures.append(future)
+                group.append(uid)
+
+                if len(pending) >= _map_uid_limit:
+                    full.append(self._batches.pop(key))
+
+        for batch in full:  # the timer finds it gone and does nothing
+            self._send(batch)
+
+        return futures
+
+    def _bisect(self, token: auth.Token, futures: 'dict[str, Future]', groups: list[list[str]], error: BaseException) -> None:
+        '''
+        - finds the lookups with bad input in a rejected batch by sending each half of it on its own, then halves of the
+          halves which are also rejected, so only those lookups fail while the others still get their results
+        - a half failing for any other reason is not split further, as that would only add load
+        - a UID in several lookups is found if any request including it succeeds
+        '''
+
+        errors: dict[str, BaseException] = {}
+        found: dict[str, dict | None] = {}
+        rejected: list[tuple[list[list[str]], BaseException]] = [(groups, error)]
+
+        while rejected:
+            part, error = rejected.pop()
+
+            if len(part) == 1:
+                for uid in part[0]:
+                    errors.setdefault(uid, error)
+
+                continue
+
+            for half in part[:len(part) // 2], part[len(part) // 2:]:
+                if not (todo := [uid for uid in dict.fromkeys(itertools.chain.from_iterable(half)) if uid not in found]):
+                    continue
+
+                try:
+                    maps: list[dict] = get(token, f'maps/?mapUidList={','.join(todo)}')
+                except BaseException as e:
+                    if _rejected(e):
+                        rejected.append((half, e))
+                    else:
+                        for uid in todo:
+                            errors.setdefault(uid, e)
+
+                    continue
+
+                infos: dict[str, dict] = {info['mapUid']: info for info in maps}
+
+                for uid in todo:
+                    found[uid] = infos.get(uid)
+
+        for uid, future in futures.items():
+            if uid in found:
+                future.set_result(found[uid])
+            else:
+                future.set_exception(errors[uid])
+
+    def _expire(self, key: int, batch: _Batch) -> None:
+        with self._lock:
+            if self._batches.get(key) is not batch:  # already sent for being full or flushed
+                return
+
+            del self._batches[key]
+
+        self._send(batch)
+
+    def _send(self, batch: _Batch) -> None:
+        token, futures, groups = batch
+
+        try:
+            maps: list[dict] = get(token, f'maps/?mapUidList={','.join(futures)}')
+        except BaseException as e:
+            if len(groups) > 1 and _rejected(e):
+                self._bisect(token, futures, groups, e)
+                return
+
+            for future in futures.values():  # raised to every caller waiting on the batch instead
+                future.set_exception(e)
+
+            return
+
+        found: dict[str, dict] = {info['mapUid']: info for info in maps}
+
+        for uid, future in futures.items():
+            future.set_result(found.get(uid))
+
+
+map_info_loader: MapInfoLoader = MapInfoLoader()
+
+
+def _rejected(e: BaseException) -> bool:
+    '''
+    - whether a request failed because of what it asked for (i.e. a malformed UID), so it would fail again if sent as is
+    - not for rate limiting (429), authentication (401, 403) or server errors, which would fail any smaller request too
+    '''
+
+    return isinstance(e, auth.BadResponseError) and e.status in (400, 404)
+
 
 ######################################################### BASE #########################################################
 
 
-def delete(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) -> dict | list:
+def delete(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a DELETE request to the Core API
 
@@ -42,16 +233,20 @@ def delete(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {})
         - request body if applicable
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._delete(token, URL, endpoint, params, body)
+    return auth._delete(token, URL, endpoint, params, body, raw)
 
 
-def get(token: auth.Token, endpoint: str, params: dict = {}) -> dict | list:
+def get(token: auth.Token, endpoint: str, params: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a GET request to the Core API
 
@@ -70,16 +265,20 @@ def get(token: auth.Token, endpoint: str, params: dict = {}) -> dict | list:
         - request parameters if applicable
         - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._get(token, URL, endpoint, params)
+    return auth._get(token, URL, endpoint, params, raw)
 
 
-def head(token: auth.Token, endpoint: str, params: dict = {}) -> dict | list:
+def head(token: auth.Token, endpoint: str, params: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a HEAD request to the Core API
 
@@ -98,16 +297,20 @@ def head(token: auth.Token, endpoint: str, params: dict = {}) -> dict | list:
         - request parameters if applicable
         - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._head(token, URL, endpoint, params)
+    return auth._head(token, URL, endpoint, params, raw)
 
 
-def options(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) -> dict | list:
+def options(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends an OPTIONS request to the Core API
 
@@ -130,16 +333,20 @@ def options(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}
         - request body if applicable
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._options(token, URL, endpoint, params, body)
+    return auth._options(token, URL, endpoint, params, body, raw)
 
 
-def patch(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) -> dict | list:
+def patch(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a PATCH request to the Core API
 
@@ -162,16 +369,20 @@ def patch(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {})
         - request body if applicable
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._patch(token, URL, endpoint, params, body)
+    return auth._patch(token, URL, endpoint, params, body, raw)
 
 
-def post(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) -> dict | list:
+def post(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a POST request to the Core API
 
@@ -194,16 +405,20 @@ def post(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) -
         - request body if applicable
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._post(token, URL, endpoint, params, body)
+    return auth._post(token, URL, endpoint, params, body, raw)
 
 
-def put(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) -> dict | list:
+def put(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a PUT request to the Core API
 
@@ -226,21 +441,28 @@ def put(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) ->
         - request body if applicable
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._put(token, URL, endpoint, params, body)
+    return auth._put(token, URL, endpoint, params, body, raw)
 
 
 ###################################################### ENDPOINTS #######################################################
 
 
-def get_map_info(token: auth.Token, uids: typing.Iterable[str]) -> list[dict]:
+def get_map_info(token: auth.Token, uids: typing.Iterable[str], dedupe: bool = False, workers: int = 0) -> list[dict]:
     '''
     - gets info on multiple maps from their UIDs
+    - any number of UIDs may be given - they are split into requests of up to 291 which are sent concurrently
+    - to avoid holding every map in memory at once, use `iter_map_info` instead
+    - with `config.batch_map_info_ms`, fewer than 291 UIDs are combined with other calls made at about the same time (see `MapInfoLoader`)
 
     Parameters
     ----------
@@ -250,28 +472,31 @@ def get_map_info(token: auth.Token, uids: typing.Iterable[str]) -> list[dict]:
     uids: Iterable[str]
         - map UIDs
 
+    dedupe: bool
+        - whether to skip UIDs that were already given earlier in `uids`
+        - default: `False`
+
+    workers: int
+        - maximum number of requests in flight at once, still subject to rate limiting
+        - `0` uses `config.max_workers`
+        - default: `0`
+
     Returns
     -------
     list[dict]
         - map info
     '''
 
-    UID_LIMIT: int = 291
+    if config.batch_map_info_ms > 0:
+        uids = list(util._unique(uids) if dedupe else uids)
 
-    if len(uids) <= UID_LIMIT:
-        return get(token, f'maps/?mapUidList={','.join(uids)}')
+        if len(uids) < _map_uid_limit:  # larger lookups already fill their own requests
+            return [info for future in map_info_loader.load(token, uids) if (info := future.result()) is not None]
 
     ret: list[dict] = []
 
-    while len(uids):
-        uid_count: int = min(len(uids), UID_LIMIT)
-        uids_this_req: list[str] = uids[:uid_count]
-        uids = uids[uid_count:]
-        endpoint: str = f'maps/?mapUidList={','.join(uids_this_req)}'
-
-        req: list[dict] = get(token, endpoint)
-        for map in req:
-            ret.append(map)
+    for maps in iter_map_info(token, uids, dedupe, workers):
+        ret.extend(maps)
 
     return ret
 
@@ -387,6 +612,48 @@ def get_zones(token: auth.Token) -> list[dict]:
     return get(token, 'zones')
 
 
+def iter_map_info(token: auth.Token, uids: typing.Iterable[str], dedupe: bool = False, workers: int = 0, raw: bool = False) -> typing.Iterator[list[dict] | bytes]:
+    '''
+    - gets info on multiple maps from their UIDs, yielding it one request (up to 291 maps) at a time
+    - UIDs are consumed lazily, so `uids` may be a generator of any length
+    - requests are sent concurrently, but results are yielded in the order of the given UIDs
+
+    Parameters
+    ----------
+    token: auth.Token
+        - authentication token from `auth.get_token`
+
+    uids: Iterable[str]
+        - map UIDs
+
+    dedupe: bool
+        - whether to skip UIDs that were already given earlier in `uids`
+        - default: `False`
+
+    workers: int
+        - maximum number of requests in flight at once, still subject to rate limiting
+        - `0` uses `config.max_workers`
+        - default: `0`
+
+    raw: bool
+        - whether to yield each response body as received, without decoding it, i.e. to store it as is
+        - default: `False`
+
+    Returns
+    -------
+    Iterator[list[dict] | bytes]
+        - map info for each request, as bytes if `raw`
+    '''
+
+    if dedupe:
+        uids = util._unique(uids)
+
+    def get_chunk(chunk: tuple[str, ...]) -> list[dict] | bytes:
+        return get(token, f'maps/?mapUidList={','.join(chunk)}', raw=raw)
+
+    yield from util._imap(get_chunk, itertools.batched(uids, _map_uid_limit), workers)
+
+
 ###################################################### DEPRECATED ######################################################
 
 
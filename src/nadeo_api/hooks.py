@@ -0,0 +1,124 @@
+'''
+| Author:   Ezio416
+| Created:  2026-10-18
+| Modified: 2026-10-18
+
+- Hooks for observing requests as they happen, i.e. for logging or metrics
+- Subscribers are called in the thread (or event loop) that sent the request, with the event name and a dict of details
+- Event details are only built when something is subscribed to that event or `config.debug_logging` is enabled
+
+Events
+------
+cache_hit
+    - a GET response was served from the cache: `base_url`, `endpoint`
+
+rate_wait
+    - a request is about to sleep to respect the rate limit: `base_url`, `delay` (seconds)
+    - with `config.priority_scheduling`, emitted instead once the request has been handed a slot, with the time it waited
+
+request_end
+    - a response was received: `method`, `base_url`, `endpoint`, `status`, `elapsed` (seconds), `size` (bytes)
+
+request_start
+    - a request function was called: `method`, `base_url`, `endpoint`, `params`, `body`
+
+retry
+    - a request is about to be sent again: `method`, `base_url`, `endpoint`, `status` (`None` if no response was received), `attempt` (1 for the first retry), `delay` (seconds)
+
+token_refresh
+    - a token was refreshed: `audience`, `elapsed` (seconds)
+'''
+
+import threading
+import typing
+
+from . import config
+
+
+CACHE_HIT:     str = 'cache_hit'
+RATE_WAIT:     str = 'rate_wait'
+REQUEST_END:   str = 'request_end'
+REQUEST_START: str = 'request_start'
+RETRY:         str = 'retry'
+TOKEN_REFRESH: str = 'token_refresh'
+
+EVENTS: tuple[str, ...] = CACHE_HIT, RATE_WAIT, REQUEST_END, REQUEST_START, RETRY, TOKEN_REFRESH
+
+Callback = typing.Callable[[str, dict], None]
+
+# replaced rather than modified so emitting never needs a lock
+_subscribers:      dict[str, tuple[Callback, ...]] = {event: () for event in EVENTS}
+_subscribers_lock: threading.Lock = threading.Lock()
+
+
+def debug_logger(event: str, data: dict) -> None:
+    '''
+    - prints an event in a readable format
+    - called for every event while `config.debug_logging` is enabled, without needing to be subscribed
+    '''
+
+    match event:
+        case 'request_start':
+            print(f'nadeo_api.{event}: {data['method'].upper()} {data['base_url']}/{data['endpoint']} | params: {data['params']} | body: {data['body']}')
+        case 'request_end':
+            print(f'nadeo_api.{event}: {data['method'].upper()} {data['base_url']}/{data['endpoint']} | {data['status']} | {data['elapsed'] * 1000:.1f}ms | {data['size']}B')
+        case _:
+            print(f'nadeo_api.{event}: {' | '.join(f'{name}: {value}' for name, value in data.items())}')
+
+
+def subscribe(callback: Callback, events: typing.Iterable[str] = EVENTS) -> None:
+    '''
+    - calls a function whenever one of the given events happens
+
+    Parameters
+    ----------
+    callback: Callable[[str, dict], None]
+        - function taking the event name and a dict of its details
+
+    events: Iterable[str]
+        - events to subscribe to
+        - default: all events
+    '''
+
+    events = tuple(events)
+
+    for event in events:
+        if event not in _subscribers:
+            raise ValueError(f'Given event is invalid: {event}')
+
+    with _subscribers_lock:
+        for event in events:
+            if callback not in _subscribers[event]:
+                _subscribers[event] += callback,
+
+
+def unsubscribe(callback: Callback, events: typing.Iterable[str] = EVENTS) -> None:
+    '''
+    - stops calling a function for the given events
+
+    Parameters
+    ----------
+    callback: Callable[[str, dict], None]
+        - function previously passed to `subscribe`
+
+    events: Iterable[str]
+        - events to unsubscribe from
+        - default: all events
+    '''
+
+    with _subscribers_lock:
+        for event in events:
+            _subscribers[event] = tuple(subscriber for subscriber in _subscribers[event] if subscriber != callback)
+
+
+def _emit(event: str, data: dict) -> None:
+    '''
+    - calls every subscriber of an event
+    - callers should first check `_subscribers[event] or config.debug_logging` so no details are built for nobody
+    '''
+
+    for callback in _subscribers[event]:
+        callback(event, data)
+
+    if config.debug_logging:
+        debug_logger(event, data)
@@ -1,22 +1,111 @@
 '''
 | Author:   Ezio416
 | Created:  2024-05-15
-| Modified: 2026-02-04
+| Modified: 2026-10-18
 
 - Functions for interacting with the web services Live API
 '''
 
+from dataclasses import dataclass, field
+import json
+import os
+import time
+import typing
+
 from . import auth
+from . import util
 
 
 AUDIENCE: str = auth.audience_live
 URL:      str = auth.url_live
 
 
+class CampaignArchive():
+    '''
+    - local copy of months of Tracks of the Day or of campaigns, kept up to date by a `sync_maps_*` function
+    - remembers which items are finished, so a sync only requests items that are new or still in progress
+    - each archive should only be used with one `sync_maps_*` function
+
+    Parameters
+    ----------
+    path: str | None
+        - JSON file to load the archive from if it exists, and to save it to after every sync
+        - default: `None` (only kept in memory)
+    '''
+
+    in_progress: str | None  # key of the newest item at the last sync, which may still change
+    item_count:  int  # number of items the API had at the last sync
+    items:       dict[str, dict]  # by month (`'YYYY-MM'`) for Tracks of the Day, otherwise by campaign ID
+    path:        str | None
+    synced:      float  # time of the last sync, or `0.0` if never synced
+
+    def __init__(self, path: str | None = None):
+        self.in_progress = None
+        self.item_count = 0
+        self.items = {}
+        self.path = os.path.abspath(path) if path is not None else None
+        self.synced = 0.0
+
+        if self.path is not None and os.path.isfile(self.path):
+            with open(self.path, 'rb') as file:
+                data: dict = json.load(file)
+
+            self.in_progress = data['in_progress']
+            self.item_count = data['item_count']
+            self.items = data['items']
+            self.synced = data['synced']
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __repr__(self) -> str:
+        return f"nadeo_api.live.CampaignArchive({f"'{self.path}'" if self.path else None})"
+
+    @property
+    def finished(self) -> int:
+        '''
+        - number of items which are known to no longer change
+        '''
+
+        return len(self.items) - (self.in_progress in self.items)
+
+    def save(self) -> None:
+        '''
+        - writes the archive to its file, replacing it in one step so a crash never leaves it half written
+        - does nothing if the archive has no file
+        '''
+
+        if self.path is None:
+            return
+
+        temp: str = f'{self.path}.tmp'
+
+        with open(temp, 'w') as file:
+            json.dump({'in_progress': self.in_progress, 'item_count': self.item_count, 'items': self.items, 'synced': self.synced}, file)
+
+        os.replace(temp, self.path)
+
+
+@dataclass
+class SyncReport():
+    '''
+    - what changed in a `CampaignArchive` during one sync
+    '''
+
+    added:    list[str] = field(default_factory=list)  # keys of items not in the archive before, newest first
+    new_maps: list[str] = field(default_factory=list)  # map UIDs not in the archive before
+    requests: int       = 0
+    updated:  list[str] = field(default_factory=list)  # keys of items which changed, newest first
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.updated)
+
+
 ######################################################### BASE #########################################################
 
 
-def delete(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) -> dict | list:
+def delete(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a DELETE request to the Live API
 
@@ -39,16 +128,20 @@ def delete(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {})
         - request body if applicable
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._delete(token, URL, endpoint, params, body)
+    return auth._delete(token, URL, endpoint, params, body, raw)
 
 
-def get(token: auth.Token, endpoint: str, params: dict = {}) -> dict | list:
+def get(token: auth.Token, endpoint: str, params: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a GET request to the Live API
 
@@ -67,16 +160,20 @@ def get(token: auth.Token, endpoint: str, params: dict = {}) -> dict | list:
         - request parameters if applicable
         - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._get(token, URL, endpoint, params)
+    return auth._get(token, URL, endpoint, params, raw)
 
 
-def head(token: auth.Token, endpoint: str, params: dict = {}) -> dict | list:
+def head(token: auth.Token, endpoint: str, params: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a HEAD request to the Live API
 
@@ -95,16 +192,20 @@ def head(token: auth.Token, endpoint: str, params: dict = {}) -> dict | list:
         - request parameters if applicable
         - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._head(token, URL, endpoint, params)
+    return auth._head(token, URL, endpoint, params, raw)
 
 
-def options(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) -> dict | list:
+def options(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends an OPTIONS request to the Live API
 
@@ -127,16 +228,20 @@ def options(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}
         - request body if applicable
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._options(token, URL, endpoint, params, body)
+    return auth._options(token, URL, endpoint, params, body, raw)
 
 
-def patch(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) -> dict | list:
+def patch(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a PATCH request to the Live API
 
@@ -159,16 +264,20 @@ def patch(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {})
         - request body if applicable
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._patch(token, URL, endpoint, params, body)
+    return auth._patch(token, URL, endpoint, params, body, raw)
 
 
-def post(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) -> dict | list:
+def post(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a POST request to the Live API
 
@@ -191,16 +300,20 @@ def post(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) -
         - request body if applicable
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._post(token, URL, endpoint, params, body)
+    return auth._post(token, URL, endpoint, params, body, raw)
 
 
-def put(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) -> dict | list:
+def put(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a PUT request to the Live API
 
@@ -223,13 +336,17 @@ def put(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) ->
         - request body if applicable
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._put(token, URL, endpoint, params, body)
+    return auth._put(token, URL, endpoint, params, body, raw)
 
 
 ###################################################### ENDPOINTS #######################################################
@@ -260,7 +377,7 @@ def get_club_campaign(token: auth.Token, club_id: int, campaign_id: int) -> dict
     return get(token, f'api/token/club/{club_id}/campaign/{campaign_id}')
 
 
-def get_map_leaderboard(token: auth.Token, mapUid: str, groupUid: str = 'Personal_Best', onlyWorld: bool = True, length: int = 5, offset: int = 0) -> dict:
+def get_map_leaderboard(token: auth.Token, mapUid: str, groupUid: str = 'Personal_Best', onlyWorld: bool = True, length: int = 5, offset: int = 0, raw: bool = False) -> dict | bytes:
     '''
     - gets the top leaderboard records for a map
     - can only retrieve records in the top 10,000
@@ -290,6 +407,10 @@ def get_map_leaderboard(token: auth.Token, mapUid: str, groupUid: str = 'Persona
     offset: int
         - number of records to skip
         - default: `0`
+
+    raw: bool
+        - whether to return the response body as received, without decoding it, i.e. to store it as is
+        - default: `False`
     '''
 
     if onlyWorld:
@@ -299,12 +420,12 @@ def get_map_leaderboard(token: auth.Token, mapUid: str, groupUid: str = 'Persona
         if length + offset > 10_000:
             raise ValueError('You can only retrieve records in the top 10,000')
 
-        return get(token, f'api/token/leaderboard/group/{groupUid}/map/{mapUid}/top?onlyWorld=true&length={length}&offset={offset}')
+        return get(token, f'api/token/leaderboard/group/{groupUid}/map/{mapUid}/top?onlyWorld=true&length={length}&offset={offset}', raw=raw)
 
     if token.server_account:
         raise ValueError('This endpoint requires a Ubisoft account when onlyWorld is False')
 
-    return get(token, f'api/token/leaderboard/group/{groupUid}/map/{mapUid}/top?onlyWorld=false')
+    return get(token, f'api/token/leaderboard/group/{groupUid}/map/{mapUid}/top?onlyWorld=false', raw=raw)
 
 
 def get_maps_royal(token: auth.Token, length: int, offset: int = 0) -> dict:
@@ -439,6 +560,252 @@ def get_maps_weekly_grand(token: auth.Token, length: int, offset: int = 0) -> di
     return get(token, '/api/campaign/weekly-grands', {'length': length, 'offset': offset})
 
 
+def iter_map_leaderboard(token: auth.Token, mapUid: str, groupUid: str = 'Personal_Best', length: int = 10_000, offset: int = 0, workers: int = 0) -> typing.Iterator[dict]:
+    '''
+    - gets the top global leaderboard records for a map, yielding them one at a time
+    - sends requests for 100 records at a time and stops early if the leaderboard ends
+    - can only retrieve records in the top 10,000
+    - https://webservices.openplanet.dev/live/leaderboards/top
+
+    Parameters
+    ----------
+    token: auth.Token
+        - authentication token from `auth.get_token`
+
+    mapUid: str
+        - the UID of the map
+
+    groupUid: str
+        - the UID of the group/season
+        - default: `'Personal_Best'`
+
+    length: int
+        - maximum number of records to get
+        - default: `10_000`
+
+    offset: int
+        - number of records to skip
+        - default: `0`
+
+    workers: int
+        - maximum number of requests in flight at once, still subject to rate limiting
+        - with more than 1, a few requests past the end of a short leaderboard may be sent before it stops
+        - `0` uses `config.max_workers`
+        - default: `0`
+
+    Returns
+    -------
+    Iterator[dict]
+        - records in order of position
+    '''
+
+    PAGE_LENGTH: int = 100
+
+    length = min(length, 10_000 - offset)
+
+    def get_page(page_offset: int) -> list[dict]:
+        tops: list[dict] = get_map_leaderboard(token, mapUid, groupUid, True, min(PAGE_LENGTH, offset + length - page_offset), page_offset)['tops']
+        return tops[0]['top'] if tops else []
+
+    pages: typing.Iterator[list[dict]] = util._imap(get_page, range(offset, offset + length, PAGE_LENGTH), workers)
+
+    try:
+        for page in pages:
+            yield from page
+
+            if len(page) < PAGE_LENGTH:
+                break
+
+    finally:
+        pages.close()
+
+
+def sync_maps_seasonal(token: auth.Token, archive: CampaignArchive, page_length: int = 12) -> SyncReport:
+    '''
+    - brings an archive of official Nadeo seasonal campaigns up to date, only requesting campaigns which are new or in progress
+    - usually one request once the archive has been filled
+
+    Parameters
+    ----------
+    token: auth.Token
+        - authentication token from `auth.get_token`
+
+    archive: CampaignArchive
+        - archive to update in place, and save if it has a file
+
+    page_length: int
+        - most campaigns to get in one request, when more than the latest two are needed
+        - default: `12`
+
+    Returns
+    -------
+    SyncReport
+        - what changed
+    '''
+
+    return _sync(archive, lambda length, offset: get_maps_seasonal(token, length, offset), 'campaignList', page_length)
+
+
+def sync_maps_totd(token: auth.Token, archive: CampaignArchive, page_length: int = 12) -> SyncReport:
+    '''
+    - brings an archive of Tracks of the Day up to date, only requesting months which are new or in progress
+    - usually one request once the archive has been filled
+
+    Parameters
+    ----------
+    token: auth.Token
+        - authentication token from `auth.get_token`
+
+    archive: CampaignArchive
+        - archive to update in place, and save if it has a file
+
+    page_length: int
+        - most months to get in one request, when more than the latest two are needed
+        - default: `12`
+
+    Returns
+    -------
+    SyncReport
+        - what changed
+    '''
+
+    return _sync(archive, lambda length, offset: get_maps_totd(token, length, offset), 'monthList', page_length)
+
+
+def sync_maps_weekly_grand(token: auth.Token, archive: CampaignArchive, page_length: int = 12) -> SyncReport:
+    '''
+    - brings an archive of Weekly Grands up to date, only requesting weeks which are new or in progress
+    - usually one request once the archive has been filled
+
+    Parameters
+    ----------
+    token: auth.Token
+        - authentication token from `auth.get_token`
+
+    archive: CampaignArchive
+        - archive to update in place, and save if it has a file
+
+    page_length: int
+        - most weeks to get in one request, when more than the latest two are needed
+        - default: `12`
+
+    Returns
+    -------
+    SyncReport
+        - what changed
+    '''
+
+    return _sync(archive, lambda length, offset: get_maps_weekly_grand(token, length, offset), 'campaignList', page_length)
+
+
+def sync_maps_weekly_short(token: auth.Token, archive: CampaignArchive, page_length: int = 12) -> SyncReport:
+    '''
+    - brings an archive of Weekly Shorts up to date, only requesting weeks which are new or in progress
+    - usually one request once the archive has been filled
+
+    Parameters
+    ----------
+    token: auth.Token
+        - authentication token from `auth.get_token`
+
+    archive: CampaignArchive
+        - archive to update in place, and save if it has a file
+
+    page_length: int
+        - most weeks to get in one request, when more than the latest two are needed
+        - default: `12`
+
+    Returns
+    -------
+    SyncReport
+        - what changed
+    '''
+
+    return _sync(archive, lambda length, offset: get_maps_weekly_short(token, length, offset), 'campaignList', page_length)
+
+
+def _item_key(item: dict) -> str:
+    '''
+    - gets the key of a month of Tracks of the Day (`'YYYY-MM'`) or a campaign (its ID) in a `CampaignArchive`
+    '''
+
+    return f'{item['year']}-{item['month']:02d}' if 'days' in item else str(item['id'])
+
+
+def _map_uids(item: dict) -> list[str]:
+    '''
+    - gets the map UIDs in a month of Tracks of the Day or a campaign, skipping days not yet revealed
+    '''
+
+    return [entry['mapUid'] for entry in item.get('days') or item.get('playlist') or () if entry.get('mapUid')]
+
+
+def _strip_relative(obj: typing.Any) -> typing.Any:
+    '''
+    - removes times relative to when a response was sent (i.e. `relativeStart`), as they are stale once stored and would make every item look changed
+    '''
+
+    if isinstance(obj, dict):
+        return {key: _strip_relative(value) for key, value in obj.items() if not key.startswith('relative')}
+
+    if isinstance(obj, list):
+        return [_strip_relative(value) for value in obj]
+
+    return obj
+
+
+def _sync(archive: CampaignArchive, fetch: typing.Callable[[int, int], dict], list_key: str, page_length: int) -> SyncReport:
+    '''
+    - updates an archive with every item that is not yet finished in it, from newest to oldest
+    - the newest item is treated as in progress, so it is requested every time, along with the one before it in case it just finished
+    '''
+
+    if page_length < 2:
+        raise ValueError(f'Page length must be at least 2: {page_length}')
+
+    report: SyncReport = SyncReport()
+    fetched: list[dict] = []
+    length: int = page_length if not archive.items else 2
+
+    while True:
+        response: dict = fetch(length, len(fetched))
+        report.requests += 1
+        page: list[dict] = response[list_key]
+        fetched.extend(page)
+
+        # items are counted from the newest, so everything past the ones already finished in the archive is new or in progress
+        needed: int = response['itemCount'] - archive.finished
+
+        if len(page) < length or len(fetched) >= needed:
+            break
+
+        length = min(page_length, needed - len(fetched))
+
+    for item in map(_strip_relative, fetched):
+        key: str = _item_key(item)
+
+        if (old := archive.items.get(key)) is None:
+            report.added.append(key)
+            known: set[str] = set()
+        elif old != item:
+            report.updated.append(key)
+            known = set(_map_uids(old))
+        else:
+            continue
+
+        report.new_maps.extend(uid for uid in _map_uids(item) if uid not in known)
+        archive.items[key] = item
+
+    if fetched:
+        archive.in_progress = _item_key(fetched[0])
+
+    archive.item_count = response['itemCount']
+    archive.synced = time.time()
+    archive.save()
+
+    return report
+
+
 ###################################################### DEPRECATED ######################################################
 
 
@@ -16,7 +16,7 @@ URL:      str = auth.url_meet
 ######################################################### BASE #########################################################
 
 
-def delete(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) -> dict | list:
+def delete(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a DELETE request to the Meet API
 
@@ -39,16 +39,20 @@ def delete(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {})
         - request body if applicable
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._delete(token, URL, endpoint, params, body)
+    return auth._delete(token, URL, endpoint, params, body, raw)
 
 
-def get(token: auth.Token, endpoint: str, params: dict = {}) -> dict | list:
+def get(token: auth.Token, endpoint: str, params: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a GET request to the Meet API
 
@@ -67,16 +71,20 @@ def get(token: auth.Token, endpoint: str, params: dict = {}) -> dict | list:
         - request parameters if applicable
         - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._get(token, URL, endpoint, params)
+    return auth._get(token, URL, endpoint, params, raw)
 
 
-def head(token: auth.Token, endpoint: str, params: dict = {}) -> dict | list:
+def head(token: auth.Token, endpoint: str, params: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a HEAD request to the Meet API
 
@@ -95,16 +103,20 @@ def head(token: auth.Token, endpoint: str, params: dict = {}) -> dict | list:
         - request parameters if applicable
         - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._head(token, URL, endpoint, params)
+    return auth._head(token, URL, endpoint, params, raw)
 
 
-def options(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) -> dict | list:
+def options(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends an OPTIONS request to the Meet API
 
@@ -127,16 +139,20 @@ def options(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}
         - request body if applicable
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._options(token, URL, endpoint, params, body)
+    return auth._options(token, URL, endpoint, params, body, raw)
 
 
-def patch(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) -> dict | list:
+def patch(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a PATCH request to the Meet API
 
@@ -159,16 +175,20 @@ def patch(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {})
         - request body if applicable
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._patch(token, URL, endpoint, params, body)
+    return auth._patch(token, URL, endpoint, params, body, raw)
 
 
-def post(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) -> dict | list:
+def post(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a POST request to the Meet API
 
@@ -191,16 +211,20 @@ def post(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) -
         - request body if applicable
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._post(token, URL, endpoint, params, body)
+    return auth._post(token, URL, endpoint, params, body, raw)
 
 
-def put(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) -> dict | list:
+def put(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a PUT request to the Meet API
 
@@ -223,13 +247,17 @@ def put(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) ->
         - request body if applicable
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._put(token, URL, endpoint, params, body)
+    return auth._put(token, URL, endpoint, params, body, raw)
 
 
 ###################################################### ENDPOINTS #######################################################
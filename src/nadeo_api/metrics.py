@@ -0,0 +1,329 @@
+'''
+| Author:   Ezio416
+| Created:  2026-10-18
+| Modified: 2026-10-18
+
+- Request metrics per base URL and endpoint template, built on `hooks`
+- Disabled by default - enable it with `enable()`, then read it with `get_endpoint_stats()` or `to_prometheus()`
+- Also reports the current rate of each rate limiter, which is how to watch `config.adaptive_rate_limits` at work
+- Endpoints are grouped by template, i.e. `api/token/leaderboard/group/{groupUid}/map/{mapUid}/top`, so IDs do not create new series
+'''
+
+import bisect
+from dataclasses import dataclass, field
+import functools
+import re
+import threading
+
+from . import hooks
+from . import ratelimit
+
+
+# upper bounds in seconds of the latency histogram buckets, with an implicit `+Inf` bucket after the last one
+BUCKETS: tuple[float, ...] = 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+
+# the segment following one of these is replaced with the given placeholder if it looks like an ID
+_id_names: dict[str, str] = {
+    'accounts':     '{accountId}',
+    'campaign':     '{campaignId}',
+    'challenges':   '{challengeId}',
+    'club':         '{clubId}',
+    'competitions': '{competitionId}',
+    'group':        '{groupUid}',
+    'map':          '{mapUid}',
+    'maps':         '{mapUid}',
+    'matches':      '{matchId}',
+    'rounds':       '{roundId}',
+}
+# the segment following one of these is always an ID, even if it does not look like one, i.e. `Personal_Best`
+_id_always: frozenset[str] = frozenset({'group', 'map'})
+_id_pattern: re.Pattern = re.compile(r'\d+|[0-9a-fA-F]{8}(?:-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12}|(?=[^/]*\d)[\w-]{10,}')
+
+
+@dataclass
+class EndpointStats():
+    '''
+    - metrics for one method on one endpoint template
+    '''
+
+    base_url:      str
+    endpoint:      str
+    method:        str
+    buckets:       list[int]      = field(default_factory=lambda: [0] * (len(BUCKETS) + 1))  # not cumulative
+    bytes:         int            = 0
+    cache_hits:    int            = 0
+    count:         int            = 0
+    latency:       float          = 0.0  # total seconds
+    retries:       int            = 0
+    statuses:      dict[int, int] = field(default_factory=dict)
+
+    @property
+    def mean_latency(self) -> float:
+        return self.latency / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        '''
+        - estimates a latency quantile from the histogram, interpolating within the bucket it falls in
+
+        Parameters
+        ----------
+        q: float
+            - quantile to estimate
+            - valid: `0.0` to `1.0`, i.e. `0.99` for the 99th percentile
+
+        Returns
+        -------
+        float
+            - latency in seconds, or `0.0` if nothing was recorded
+            - capped at the last bucket bound if it falls in the `+Inf` bucket
+        '''
+
+        if not 0.0 <= q <= 1.0:
+            raise ValueError(f'Given quantile is invalid: {q}')
+
+        if not self.count:
+            return 0.0
+
+        rank: float = q * self.count
+        seen: int = 0
+
+        for i, count in enumerate(self.buckets):
+            if count and seen + count >= rank:
+                if i == len(BUCKETS):
+                    return BUCKETS[-1]
+
+                lower: float = BUCKETS[i - 1] if i else 0.0
+                return lower + (BUCKETS[i] - lower) * (rank - seen) / count
+
+            seen += count
+
+        return BUCKETS[-1]
+
+
+@dataclass
+class RateWaitStats():
+    '''
+    - time spent sleeping to respect the rate limit of one base URL
+    '''
+
+    base_url: str
+    count:    int   = 0
+    seconds:  float = 0.0
+
+
+_endpoints:  dict[tuple[str, str, str], EndpointStats] = {}
+_lock:       threading.Lock                            = threading.Lock()
+_rate_waits: dict[str, RateWaitStats]                  = {}
+
+
+def disable() -> None:
+    '''
+    - stops recording metrics, keeping what was already recorded
+    '''
+
+    hooks.unsubscribe(_record)
+
+
+def enable() -> None:
+    '''
+    - starts recording metrics for every request from both the sync and async functions
+    '''
+
+    hooks.subscribe(_record, (hooks.CACHE_HIT, hooks.RATE_WAIT, hooks.REQUEST_END, hooks.RETRY))
+
+
+@functools.lru_cache(maxsize=4096)
+def endpoint_template(endpoint: str) -> str:
+    '''
+    - replaces the IDs in an endpoint with placeholders and removes its parameters
+    - i.e. `'accounts/<uuid>/trophies?count=10'` becomes `'accounts/{accountId}/trophies'`
+
+    Parameters
+    ----------
+    endpoint: str
+        - endpoint without its base URL
+
+    Returns
+    -------
+    str
+        - endpoint template
+    '''
+
+    segments: list[str] = endpoint.split('?', 1)[0].strip('/').split('/')
+
+    for i in range(len(segments)):
+        previous: str = segments[i - 1] if i else ''
+
+        if previous in _id_names and (previous in _id_always or _id_pattern.fullmatch(segments[i])):
+            segments[i] = _id_names[previous]
+        elif _id_pattern.fullmatch(segments[i]):
+            segments[i] = '{id}'
+
+    return '/'.join(segments)
+
+
+def _escape(value: str) -> str:
+    '''
+    - escapes a Prometheus label value
+    '''
+
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def get_endpoint_stats() -> list[EndpointStats]:
+    '''
+    - gets a copy of the metrics for every endpoint template requested since the last `reset()`
+
+    Returns
+    -------
+    list[EndpointStats]
+        - metrics sorted by base URL, endpoint, then method
+    '''
+
+    with _lock:
+        return [
+            EndpointStats(**{**vars(stats), 'buckets': list(stats.buckets), 'statuses': dict(stats.statuses)})
+            for _, stats in sorted(_endpoints.items())
+        ]
+
+
+def get_rate_limits() -> dict[str, float]:
+    '''
+    - gets the current rate of every token bucket rate limiter, which changes over time with `config.adaptive_rate_limits`
+    - unlike the other metrics, this does not need `enable()`
+
+    Returns
+    -------
+    dict[str, float]
+        - requests per second allowed to each base URL, sorted by base URL
+    '''
+
+    return {
+        base_url: limiter.rate
+        for base_url, (limiter, _) in sorted(ratelimit._limiters.copy().items())
+        if isinstance(limiter, ratelimit.TokenBucket)
+    }
+
+
+def get_rate_wait_stats() -> list[RateWaitStats]:
+    '''
+    - gets a copy of the time spent waiting on each base URL's rate limit since the last `reset()`
+
+    Returns
+    -------
+    list[RateWaitStats]
+        - metrics sorted by base URL
+    '''
+
+    with _lock:
+        return [RateWaitStats(**vars(stats)) for _, stats in sorted(_rate_waits.items())]
+
+
+def _record(event: str, data: dict) -> None:
+    '''
+    - hooks subscriber which updates the metrics for an event
+    '''
+
+    if event == hooks.RATE_WAIT:
+        with _lock:
+            if (wait := _rate_waits.get(data['base_url'])) is None:
+                wait = _rate_waits[data['base_url']] = RateWaitStats(data['base_url'])
+
+            wait.count += 1
+            wait.seconds += data['delay']
+
+        return
+
+    method: str = data.get('method', 'get')  # cache hits are always GET
+    key: tuple[str, str, str] = data['base_url'], endpoint_template(data['endpoint']), method
+
+    with _lock:
+        if (stats := _endpoints.get(key)) is None:
+            stats = _endpoints[key] = EndpointStats(*key)
+
+        match event:
+            case hooks.REQUEST_END:
+                stats.buckets[bisect.bisect_left(BUCKETS, data['elapsed'])] += 1
+                stats.bytes += data['size']
+                stats.count += 1
+                stats.latency += data['elapsed']
+                stats.statuses[data['status']] = stats.statuses.get(data['status'], 0) + 1
+            case hooks.RETRY:
+                stats.retries += 1
+            case hooks.CACHE_HIT:
+                stats.cache_hits += 1
+
+
+def reset() -> None:
+    '''
+    - clears every recorded metric
+    '''
+
+    with _lock:
+        _endpoints.clear()
+        _rate_waits.clear()
+
+
+def to_prometheus() -> str:
+    '''
+    - formats every recorded metric in the Prometheus text exposition format
+    - serve this from your own HTTP endpoint to let Prometheus scrape it
+
+    Returns
+    -------
+    str
+        - metrics text
+    '''
+
+    endpoints: list[EndpointStats] = get_endpoint_stats()
+    lines: list[str] = []
+
+    def labels(stats: EndpointStats, **extra: str) -> str:
+        pairs: dict[str, str] = {'base_url': stats.base_url, 'endpoint': stats.endpoint, 'method': stats.method.upper(), **extra}
+        return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs.items()) + '}'
+
+    def header(name: str, kind: str, description: str) -> None:
+        lines.append(f'# HELP nadeo_api_{name} {description}')
+        lines.append(f'# TYPE nadeo_api_{name} {kind}')
+
+    header('requests_total', 'counter', 'Responses received, by status code')
+    for stats in endpoints:
+        for status, count in sorted(stats.statuses.items()):
+            lines.append(f'nadeo_api_requests_total{labels(stats, status=str(status))} {count}')
+
+    header('request_duration_seconds', 'histogram', 'Time from sending a request to receiving its full response')
+    for stats in endpoints:
+        cumulative: int = 0
+        for bound, count in zip((*map(str, BUCKETS), '+Inf'), stats.buckets):
+            cumulative += count
+            lines.append(f'nadeo_api_request_duration_seconds_bucket{labels(stats, le=bound)} {cumulative}')
+        lines.append(f'nadeo_api_request_duration_seconds_sum{labels(stats)} {stats.latency}')
+        lines.append(f'nadeo_api_request_duration_seconds_count{labels(stats)} {stats.count}')
+
+    header('response_bytes_total', 'counter', 'Response body bytes received')
+    for stats in endpoints:
+        lines.append(f'nadeo_api_response_bytes_total{labels(stats)} {stats.bytes}')
+
+    header('retries_total', 'counter', 'Requests sent again after an error response or a failed connection')
+    for stats in endpoints:
+        lines.append(f'nadeo_api_retries_total{labels(stats)} {stats.retries}')
+
+    header('cache_hits_total', 'counter', 'GET requests served from the response cache')
+    for stats in endpoints:
+        lines.append(f'nadeo_api_cache_hits_total{labels(stats)} {stats.cache_hits}')
+
+    rate_waits: list[RateWaitStats] = get_rate_wait_stats()
+
+    header('rate_waits_total', 'counter', 'Requests that slept to respect the rate limit')
+    for wait in rate_waits:
+        lines.append(f'nadeo_api_rate_waits_total{{base_url="{_escape(wait.base_url)}"}} {wait.count}')
+
+    header('rate_wait_seconds_total', 'counter', 'Time slept to respect the rate limit')
+    for wait in rate_waits:
+        lines.append(f'nadeo_api_rate_wait_seconds_total{{base_url="{_escape(wait.base_url)}"}} {wait.seconds}')
+
+    header('rate_limit_requests_per_second', 'gauge', 'Current rate allowed by the rate limiter')
+    for base_url, rate in get_rate_limits().items():
+        lines.append(f'nadeo_api_rate_limit_requests_per_second{{base_url="{_escape(base_url)}"}} {rate}')
+
+    return '\n'.join(lines) + '\n'
@@ -1,24 +1,164 @@
 '''
 | Author:   Ezio416
 | Created:  2024-05-15
-| Modified: 2025-08-05
+| Modified: 2026-10-18
 
 - Functions for interacting with the public Trackmania API
 '''
 
+from collections import OrderedDict
+import threading
+import time
 import typing
+import urllib.parse
 
 from . import auth
+from . import util
 
 
 AUDIENCE: str = auth.audience_oauth
 URL:      str = auth.url_oauth
 
 
+class DisplayNameCache():
+    '''
+    - remembers account names and IDs in both directions, including ones that were not found
+    - used by `resolve_account_names` and `resolve_account_ids` - the shared instance is `name_cache`
+    - when full, the oldest names and IDs are forgotten first, so expired ones never looked up again do not pile up
+
+    Parameters
+    ----------
+    ttl: float
+        - number of seconds a found name or ID is kept
+        - default: `3600.0`
+
+    negative_ttl: float
+        - number of seconds a name or ID that was not found is remembered as missing
+        - default: `300.0`
+
+    max_entries: int
+        - maximum number of names and of IDs kept
+        - default: `100_000`
+    '''
+
+    max_entries:  int
+    negative_ttl: float
+    ttl:          float
+
+    def __init__(self, ttl: float = 3600.0, negative_ttl: float = 300.0, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self.negative_ttl = negative_ttl
+        self.ttl = ttl
+        self._ids:   OrderedDict[str, tuple[float, str | None]] = OrderedDict()
+        self._lock:  threading.Lock = threading.Lock()
+        self._names: OrderedDict[str, tuple[float, str | None]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __repr__(self) -> str:
+        return f'nadeo_api.oauth.DisplayNameCache({self.ttl}, {self.negative_ttl}, {self.max_entries})'
+
+    def add(self, account_id: str, account_name: str) -> None:
+        '''
+        - remembers that an account ID has a given name
+        '''
+
+        expires: float = time.monotonic() + self.ttl
+
+        with self._lock:
+            self._store(self._names, account_id, (expires, account_name))
+            self._store(self._ids, account_name, (expires, account_id))
+
+    def add_missing_ids(self, account_ids: typing.Iterable[str]) -> None:
+        '''
+        - remembers that account IDs were not found
+        '''
+
+        expires: float = time.monotonic() + self.negative_ttl
+
+        with self._lock:
+            for account_id in account_ids:
+                self._store(self._names, account_id, (expires, None))
+
+    def add_missing_names(self, account_names: typing.Iterable[str]) -> None:
+        '''
+        - remembers that account names were not found
+        '''
+
+        expires: float = time.monotonic() + self.negative_ttl
+
+        with self._lock:
+            for account_name in account_names:
+                self._store(self._ids, account_name, (expires, None))
+
+    def clear(self) -> None:
+        '''
+        - forgets every name and ID
+        '''
+
+        with self._lock:
+            self._ids.clear()
+            self._names.clear()
+
+    def get_id(self, account_name: str) -> tuple[bool, str | None]:
+        '''
+        - looks up the account ID for a name
+
+        Returns
+        -------
+        tuple[bool, str | None]
+            - whether the name is known, and its account ID, or `None` if it is known to not exist
+        '''
+
+        return self._lookup(self._ids, account_name)
+
+    def get_name(self, account_id: str) -> tuple[bool, str | None]:
+        '''
+        - looks up the name for an account ID
+
+        Returns
+        -------
+        tuple[bool, str | None]
+            - whether the account ID is known, and its name, or `None` if it is known to not exist
+        '''
+
+        return self._lookup(self._names, account_id)
+
+    def _lookup(self, entries: OrderedDict[str, tuple[float, str | None]], key: str) -> tuple[bool, str | None]:
+        if (entry := entries.get(key)) is None:
+            return False, None
+
+        expires, value = entry
+
+        if expires <= time.monotonic():
+            with self._lock:
+                if entries.get(key) is entry:
+                    del entries[key]
+
+            return False, None
+
+        return True, value
+
+    def _store(self, entries: OrderedDict[str, tuple[float, str | None]], key: str, entry: tuple[float, str | None]) -> None:
+        '''
+        - adds or replaces an entry as the newest, then forgets the oldest while full - must be called with the lock held
+        '''
+
+        entries[key] = entry
+        entries.move_to_end(key)
+
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+
+name_cache: DisplayNameCache = DisplayNameCache()
+
+
 ######################################################### BASE #########################################################
 
 
-def delete(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) -> dict | list:
+def delete(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a DELETE request to the OAuth2 API
 
@@ -41,16 +181,20 @@ def delete(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {})
         - request body if applicable
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._delete(token, URL, endpoint, params, body)
+    return auth._delete(token, URL, endpoint, params, body, raw)
 
 
-def get(token: auth.Token, endpoint: str, params: dict = {}) -> dict | list:
+def get(token: auth.Token, endpoint: str, params: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a GET request to the OAuth2 API
 
@@ -69,16 +213,20 @@ def get(token: auth.Token, endpoint: str, params: dict = {}) -> dict | list:
         - request parameters if applicable
         - if you put parameters at the end of the `endpoint`, do not put them here else they will be duplicated
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._get(token, URL, endpoint, params)
+    return auth._get(token, URL, endpoint, params, raw)
 
 
-def head(token: auth.Token, endpoint: str, params: dict = {}) -> dict | list:
+def head(token: auth.Token, endpoint: str, params: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a HEAD request to the OAuth2 API
 
@@ -97,16 +245,20 @@ def head(token: auth.Token, endpoint: str, params: dict = {}) -> dict | list:
         - request parameters if applicable
         - if you put parameters at the end of the `endpoint`, do not put them here or they will be duplicated
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._head(token, URL, endpoint, params)
+    return auth._head(token, URL, endpoint, params, raw)
 
 
-def options(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) -> dict | list:
+def options(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends an OPTIONS request to the OAuth2 API
 
@@ -129,16 +281,20 @@ def options(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}
         - request body if applicable
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._options(token, URL, endpoint, params, body)
+    return auth._options(token, URL, endpoint, params, body, raw)
 
 
-def patch(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) -> dict | list:
+def patch(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a PATCH request to the OAuth2 API
 
@@ -161,16 +317,20 @@ def patch(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {})
         - request body if applicable
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._patch(token, URL, endpoint, params, body)
+    return auth._patch(token, URL, endpoint, params, body, raw)
 
 
-def post(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) -> dict | list:
+def post(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a POST request to the OAuth2 API
 
@@ -193,16 +353,20 @@ def post(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) -
         - request body if applicable
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._post(token, URL, endpoint, params, body)
+    return auth._post(token, URL, endpoint, params, body, raw)
 
 
-def put(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) -> dict | list:
+def put(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}, raw: bool = False) -> dict | list | bytes:
     '''
     - sends a PUT request to the OAuth2 API
 
@@ -225,13 +389,17 @@ def put(token: auth.Token, endpoint: str, params: dict = {}, body: dict = {}) ->
         - request body if applicable
         - default: `{}` (empty)
 
+    raw: bool
+        - whether to return the response body as received, without decoding it
+        - default: `False`
+
     Returns
     -------
-    dict | list
-        - response body
+    dict | list | bytes
+        - response body, as bytes if `raw`
     '''
 
-    return auth._put(token, URL, endpoint, params, body)
+    return auth._put(token, URL, endpoint, params, body, raw)
 
 
 ###################################################### ENDPOINTS #######################################################
@@ -288,6 +456,149 @@ def get_account_names_from_ids(token: auth.Token, account_ids: typing.Iterable[s
     return get(token, f'api/display-names?accountId[]={'&accountId[]='.join(account_ids)}')
 
 
+def resolve_account_ids(token: auth.Token, account_names: typing.Iterable[str], workers: int = 0, use_cache: bool = True) -> dict[str, str]:
+    '''
+    - gets Ubisoft account IDs (UUID) given any number of account names
+    - names are split into as few requests as possible, which are sent concurrently
+    - results are remembered in `name_cache`, including names that were not found
+
+    Parameters
+    ----------
+    token: auth.Token
+        - authentication token from `auth.get_token`
+
+    account_names: Iterable[str]
+        - account names
+        - if a name is not found, it will be omitted from the results
+
+    workers: int
+        - maximum number of requests in flight at once, still subject to rate limiting
+        - `0` uses `config.max_workers`
+        - default: `0`
+
+    use_cache: bool
+        - whether to use names and IDs already in `name_cache`
+        - new results are always stored
+        - default: `True`
+
+    Returns
+    -------
+    dict[str, str]
+        - returned account IDs as values with given account names as keys
+    '''
+
+    ret: dict[str, str] = {}
+    todo: list[str] = []
+
+    for account_name in util._unique(account_names):
+        known, account_id = name_cache.get_id(account_name) if use_cache else (False, None)
+
+        if not known:
+            todo.append(account_name)
+        elif account_id is not None:
+            ret[account_name] = account_id
+
+    def get_batch(batch: list[str]) -> dict:
+        query: str = '&'.join(f'displayName[]={urllib.parse.quote(name, safe='')}' for name in batch)
+        result: dict = get(token, f'api/display-names/account-ids?{query}')
+
+        for account_name, account_id in result.items():
+            name_cache.add(account_id, account_name)
+
+        name_cache.add_missing_names(name for name in batch if name not in result)
+        return result
+
+    for result in util._imap(get_batch, _batches(todo, len('displayName[]=&'), True), workers):
+        ret.update(result)
+
+    return ret
+
+
+def resolve_account_names(token: auth.Token, account_ids: typing.Iterable[str], workers: int = 0, use_cache: bool = True) -> dict[str, str]:
+    '''
+    - gets Ubisoft account names given any number of account IDs (UUID)
+    - IDs are split into requests of 50, which are sent concurrently
+    - results are remembered in `name_cache`, including IDs that were not found
+
+    Parameters
+    ----------
+    token: auth.Token
+        - authentication token from `auth.get_token`
+
+    account_ids: Iterable[str]
+        - account IDs
+        - if an ID is not found, it will be omitted from the results
+
+    workers: int
+        - maximum number of requests in flight at once, still subject to rate limiting
+        - `0` uses `config.max_workers`
+        - default: `0`
+
+    use_cache: bool
+        - whether to use names and IDs already in `name_cache`
+        - new results are always stored
+        - default: `True`
+
+    Returns
+    -------
+    dict[str, str]
+        - returned account names as values with given account IDs as keys
+    '''
+
+    ret: dict[str, str] = {}
+    todo: list[str] = []
+
+    for account_id in util._unique(account_ids):
+        known, account_name = name_cache.get_name(account_id) if use_cache else (False, None)
+
+        if not known:
+            todo.append(account_id)
+        elif account_name is not None:
+            ret[account_id] = account_name
+
+    def get_batch(batch: list[str]) -> dict:
+        result: dict = get_account_names_from_ids(token, batch)
+
+        for account_id, account_name in result.items():
+            name_cache.add(account_id, account_name)
+
+        name_cache.add_missing_ids(account_id for account_id in batch if account_id not in result)
+        return result
+
+    for result in util._imap(get_batch, _batches(todo), workers):
+        ret.update(result)
+
+    return ret
+
+
+def _batches(items: list[str], overhead: int = 0, quote: bool = False) -> typing.Iterator[list[str]]:
+    '''
+    - splits items into batches of up to 50
+    - if `quote`, batches are also cut short to keep their URL-quoted query string within a safe length
+    - account IDs are not length-limited, as 50 of them always fit
+    '''
+
+    MAX_COUNT:  int = 50
+    MAX_LENGTH: int = 2000
+
+    batch: list[str] = []
+    length: int = 0
+
+    for item in items:
+        item_length: int = overhead + len(urllib.parse.quote(item, safe='')) if quote else 0
+
+        if batch and (len(batch) == MAX_COUNT or length + item_length > MAX_LENGTH):
+            yield batch
+            batch = []
+            length = 0
+
+        batch.append(item)
+        length += item_length
+
+    if batch:
+        yield batch
+
+
 ###################################################### DEPRECATED ######################################################
 
 
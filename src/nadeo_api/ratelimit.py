@@ -0,0 +1,293 @@
+'''
+| Author:   Ezio416
+| Created:  2026-10-18
+| Modified: 2026-10-18
+
+- Self rate limiting for requests sent to each API
+- Each base URL gets its own token bucket, so traffic to one API never waits on another
+- Limits are read from `config.rate_limits`, falling back to `config.wait_between_requests_ms`
+- With `config.adaptive_rate_limits`, those limits are only starting points which are adjusted to how each API responds
+'''
+
+import threading
+import time
+
+from . import config
+
+
+class RateLimiter():
+    '''
+    - base class for a rate limiter consulted before every request to one base URL
+    - subclass this and pass an instance to `set_limiter()` to plug in your own limiting
+    - `reserve()` may be called from many threads at once, so subclasses must make it thread-safe
+    '''
+
+    def reserve(self) -> float:
+        '''
+        - claims the next request slot
+
+        Returns
+        -------
+        float
+            - number of seconds the caller must wait before sending its request
+        '''
+
+        return 0.0
+
+    def feedback(self, status: int, elapsed: float) -> None:
+        '''
+        - called with every response received after a request claimed a slot, for limiters that adapt to the API
+
+        Parameters
+        ----------
+        status: int
+            - response status code
+
+        elapsed: float
+            - seconds from sending the request to receiving its full response
+        '''
+
+        pass
+
+    def wait(self) -> None:
+        '''
+        - claims the next request slot and sleeps until it arrives
+        '''
+
+        if (delay := self.reserve()) > 0.0:
+            time.sleep(delay)
+
+
+class TokenBucket(RateLimiter):
+    '''
+    - allows short bursts of requests while enforcing a sustained rate
+    - callers that find the bucket empty are given increasing delays, so they are served in the order they arrived
+
+    Parameters
+    ----------
+    rate: float
+        - sustained number of requests per second
+        - `0` or less disables limiting
+
+    burst: int
+        - number of requests that may be sent back to back after the bucket has been idle
+        - default: `1`
+    '''
+
+    burst: int
+    rate:  float
+
+    def __init__(self, rate: float, burst: int = 1):
+        if burst < 1:
+            raise ValueError(f'Burst must be at least 1: {burst}')
+
+        self.burst = burst
+        self.rate = rate
+        self._lock: threading.Lock = threading.Lock()
+        self._tokens: float = float(burst)
+        self._updated: float = time.monotonic()
+
+    def __repr__(self) -> str:
+        return f'nadeo_api.ratelimit.TokenBucket({self.rate}, {self.burst})'
+
+    def reserve(self) -> float:
+        if self.rate <= 0.0:
+            return 0.0
+
+        with self._lock:
+            now: float = time.monotonic()
+            self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            tokens: float = self._tokens
+
+        if tokens >= 0.0:
+            return 0.0
+
+        return -tokens / self.rate
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    '''
+    - a token bucket which finds the sustainable rate by itself with additive increase, multiplicative decrease (AIMD)
+    - every healthy response raises the rate slightly, adding about `increase` requests per second each second
+    - a 429 response or a latency spike multiplies the rate by `decrease`, at most once per `cooldown` seconds
+      so a burst of throttled requests already in flight only counts once
+
+    Parameters
+    ----------
+    rate: float
+        - initial number of requests per second
+        - must be more than `0`
+
+    burst: int
+        - number of requests that may be sent back to back after the bucket has been idle
+        - default: `1`
+
+    min_rate: float
+        - lowest rate backing off may reach
+        - default: `0.1`
+
+    max_rate: float | None
+        - highest rate increasing may reach
+        - default: `None` (10 times `rate`)
+
+    increase: float
+        - requests per second added over each second of healthy responses
+        - default: `0.1`
+
+    decrease: float
+        - factor the rate is multiplied by when backing off
+        - default: `0.5`
+
+    spike_factor: float
+        - a response is a latency spike if it took this many times longer than the recent average, and at least 100ms longer
+        - `0` disables backing off on latency
+        - default: `3.0`
+
+    cooldown: float
+        - minimum seconds between two decreases
+        - default: `1.0`
+    '''
+
+    cooldown:     float
+    decrease:     float
+    increase:     float
+    max_rate:     float
+    min_rate:     float
+    spike_factor: float
+
+    def __init__(self, rate: float, burst: int = 1, min_rate: float = 0.1, max_rate: float | None = None, increase: float = 0.1, decrease: float = 0.5, spike_factor: float = 3.0, cooldown: float = 1.0):
+        if rate <= 0.0:
+            raise ValueError(f'Rate must be more than 0: {rate}')
+
+        if not 0.0 < decrease < 1.0:
+            raise ValueError(f'Decrease must be between 0 and 1: {decrease}')
+
+        super().__init__(rate, burst)
+        self.cooldown = cooldown
+        self.decrease = decrease
+        self.increase = increase
+        self.max_rate = rate * 10.0 if max_rate is None else max_rate
+        self.min_rate = min(min_rate, rate)
+        self.spike_factor = spike_factor
+        self._decreased: float = 0.0
+        self._latency: float = 0.0  # moving average in seconds
+        self._responses: int = 0
+
+    def __repr__(self) -> str:
+        return f'nadeo_api.ratelimit.AdaptiveTokenBucket({self.rate}, {self.burst})'
+
+    def feedback(self, status: int, elapsed: float) -> None:
+        with self._lock:
+            spike: bool = (
+                self.spike_factor > 0.0
+                and self._responses >= 10
+                and elapsed > max(self._latency * self.spike_factor, self._latency + 0.1)
+            )
+
+            if not spike:  # keep spikes out of the average so a slow patch keeps registering
+                self._latency = elapsed if not self._responses else self._latency * 0.9 + elapsed * 0.1
+                self._responses += 1
+
+            now: float = time.monotonic()
+            self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)  # settle at the old rate
+            self._updated = now
+
+            if status == 429 or spike:
+                if now - self._decreased >= self.cooldown:
+                    self.rate = max(self.min_rate, self.rate * self.decrease)
+                    self._decreased = now
+            elif status < 400:
+                self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+
+
+_limiters:      dict[str, tuple[RateLimiter, tuple[float, int, bool] | None]] = {}
+_limiters_lock: threading.Lock = threading.Lock()
+
+
+def _build(rate: float, burst: int, adaptive: bool) -> RateLimiter:
+    '''
+    - builds a token bucket from settings in the form of `config.rate_limits`
+    '''
+
+    return AdaptiveTokenBucket(rate, burst) if adaptive and rate > 0.0 else TokenBucket(rate, burst)
+
+
+def get_limiter(base_url: str, audience: str = '') -> RateLimiter:
+    '''
+    - gets the rate limiter for a base URL, creating it from the config if needed
+    - limiters created from the config are rebuilt if the config changes, which also restarts adaptive limiters
+
+    Parameters
+    ----------
+    base_url: str
+        - base URL of the API
+
+    audience: str
+        - audience of the API, used to look up `config.rate_limits` when the base URL has no entry of its own
+        - default: `''` (empty)
+
+    Returns
+    -------
+    RateLimiter
+        - limiter for the base URL
+    '''
+
+    settings: tuple[float, int, bool] = *_settings(base_url, audience), config.adaptive_rate_limits
+
+    if (entry := _limiters.get(base_url)) is not None:
+        limiter, built_from = entry
+        if built_from is None or built_from == settings:
+            return limiter
+
+    with _limiters_lock:  # another thread may have built it while we waited
+        if (entry := _limiters.get(base_url)) is not None:
+            limiter, built_from = entry
+            if built_from is None or built_from == settings:
+                return limiter
+
+        limiter = _build(*settings)
+        _limiters[base_url] = limiter, settings
+        return limiter
+
+
+def reset() -> None:
+    '''
+    - forgets all rate limiters, including ones set with `set_limiter()`
+    '''
+
+    with _limiters_lock:
+        _limiters.clear()
+
+
+def set_limiter(base_url: str, limiter: RateLimiter | None) -> None:
+    '''
+    - replaces the rate limiter for a base URL
+
+    Parameters
+    ----------
+    base_url: str
+        - base URL of the API
+
+    limiter: RateLimiter | None
+        - limiter to use for every request to the base URL
+        - if `None`, the limiter is built from the config again
+    '''
+
+    with _limiters_lock:
+        if limiter is None:
+            _limiters.pop(base_url, None)
+        else:
+            _limiters[base_url] = limiter, None
+
+
+def _settings(base_url: str, audience: str) -> tuple[float, int]:
+    if (limit := config.rate_limits.get(base_url)) is None and (limit := config.rate_limits.get(audience)) is None:
+        if config.wait_between_requests_ms <= 0:
+            return 0.0, 1
+
+        return 1000.0 / config.wait_between_requests_ms, 1
+
+    rate, burst = limit
+    return float(rate), int(burst)
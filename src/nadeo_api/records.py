@@ -0,0 +1,511 @@
+'''
+| Author:   Ezio416
+| Created:  2026-10-18
+| Modified: 2026-10-18
+
+- Compact record types for the data returned by the most common endpoints
+- Records use `__slots__`, so each one takes a fraction of the memory of the dict it was built from
+- Build them from responses you already have, i.e. `records.leaderboard_records(live.get_map_leaderboard(...))`
+- For statistics over whole leaderboards, `LeaderboardSnapshot` stores them as columns instead, using NumPy if it is installed
+'''
+
+from array import array
+import bisect
+from dataclasses import dataclass
+import itertools
+import operator
+import statistics
+import sys
+import typing
+
+
+_np: typing.Any = None  # NumPy once looked up, or False if it is not installed
+
+
+@dataclass(slots=True)
+class AccountName():
+    '''
+    - a Ubisoft account's display name
+    '''
+
+    account_id:   str
+    display_name: str
+
+
+@dataclass(slots=True)
+class CampaignMap():
+    '''
+    - a map in a campaign's playlist, i.e. a seasonal campaign, weekly shorts/grands, or a club campaign
+    '''
+
+    campaign_id: int
+    map_uid:     str
+    position:    int
+
+    @classmethod
+    def from_json(cls, campaign_id: int, data: dict) -> 'CampaignMap':
+        return cls(campaign_id, data['mapUid'], data['position'])
+
+
+@dataclass(slots=True)
+class GapStats():
+    '''
+    - statistics on the differences between consecutive scores on a leaderboard
+    '''
+
+    largest:          int    # largest difference between a record and the one before it
+    largest_position: int    # position of the record after the largest difference
+    mean:             float
+    median:           float
+
+
+@dataclass(slots=True)
+class LeaderboardRecord():
+    '''
+    - a record on a map's leaderboard
+    - `zone_id` and `zone_name` are of the player's own region, not the leaderboard's
+    - zones are interned, so records from the same region share one copy of each string
+    '''
+
+    account_id: str
+    position:   int
+    score:      int  # milliseconds for time-based maps
+    zone_id:    str
+    zone_name:  str
+    timestamp:  int | None = None
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'LeaderboardRecord':
+        return cls(data['accountId'], data['position'], data['score'], sys.intern(data['zoneId']), sys.intern(data['zoneName']), data.get('timestamp'))
+
+
+class LeaderboardSnapshot():
+    '''
+    - a leaderboard stored as columns of integers instead of a dict per record, for fast statistics using little memory
+    - `positions`, `scores` and `timestamps` are `array('q')`, and account IDs are packed into 16 bytes each
+    - records must be added in order of position, as the API returns them, and lower scores are assumed to be better (times)
+    - statistics use NumPy if it is installed, otherwise the standard library
+
+    Parameters
+    ----------
+    map_uid: str
+        - UID of the map
+        - default: `''` (empty)
+
+    group_uid: str
+        - UID of the group/season
+        - default: `'Personal_Best'`
+    '''
+
+    __slots__ = '_account_ids', 'group_uid', 'map_uid', 'positions', 'scores', 'timestamps'
+
+    group_uid:  str
+    map_uid:    str
+    positions:  array
+    scores:     array
+    timestamps: array  # 0 where not given
+
+    def __init__(self, map_uid: str = '', group_uid: str = 'Personal_Best'):
+        self._account_ids: bytearray = bytearray()
+        self.group_uid = group_uid
+        self.map_uid = map_uid
+        self.positions = array('q')
+        self.scores = array('q')
+        self.timestamps = array('q')
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __repr__(self) -> str:
+        return f"nadeo_api.records.LeaderboardSnapshot('{self.map_uid}', '{self.group_uid}') with {len(self)} records"
+
+    def account_id(self, index: int) -> str:
+        '''
+        - gets the account ID of the record at an index (not a position)
+        '''
+
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError(f'Given index is out of range: {index}')
+
+        return _unpack_uuid(self._account_ids[index * 16:index * 16 + 16].hex())
+
+    def account_ids(self) -> list[str]:
+        '''
+        - gets the account IDs of every record in order
+        '''
+
+        digits: str = self._account_ids.hex()
+        return [_unpack_uuid(digits[i:i + 32]) for i in range(0, len(digits), 32)]
+
+    def extend(self, records: typing.Iterable[dict]) -> None:
+        '''
+        - adds records, i.e. from `live.iter_map_leaderboard` or the `top` of a `live.get_map_leaderboard` response
+
+        Parameters
+        ----------
+        records: Iterable[dict]
+            - records in order of position, continuing from the last one added
+        '''
+
+        records = records if isinstance(records, list) else list(records)
+
+        self._account_ids += bytes.fromhex(''.join([record['accountId'] for record in records]).replace('-', ''))
+        self.positions.extend([record['position'] for record in records])
+        self.scores.extend([record['score'] for record in records])
+        self.timestamps.extend([record.get('timestamp') or 0 for record in records])
+
+    @classmethod
+    def from_records(cls, records: typing.Iterable[dict], map_uid: str = '', group_uid: str = 'Personal_Best') -> 'LeaderboardSnapshot':
+        '''
+        - builds a snapshot from records, i.e. from `live.iter_map_leaderboard`
+        '''
+
+        snapshot: LeaderboardSnapshot = cls(map_uid, group_uid)
+        snapshot.extend(records)
+        return snapshot
+
+    @classmethod
+    def from_response(cls, response: dict) -> 'LeaderboardSnapshot':
+        '''
+        - builds a snapshot from the world leaderboard in a response from `live.get_map_leaderboard`
+        '''
+
+        snapshot: LeaderboardSnapshot = cls(response.get('mapUid', ''), response.get('groupUid', 'Personal_Best'))
+
+        if response['tops']:
+            snapshot.extend(response['tops'][0]['top'])
+
+        return snapshot
+
+    def gap_stats(self) -> GapStats:
+        '''
+        - gets statistics on the differences between consecutive scores
+        - raises a `ValueError` if there are fewer than 2 records
+        '''
+
+        if len(self) < 2:
+            raise ValueError('At least 2 records are needed for gap statistics')
+
+        if (np := _numpy()) is not None:
+            gaps = np.diff(np.frombuffer(self.scores, np.int64))
+            largest: int = int(gaps.argmax())
+            return GapStats(int(gaps[largest]), self.positions[largest + 1], float(gaps.mean()), float(np.median(gaps)))
+
+        gaps: array = self.gaps()
+        largest = max(range(len(gaps)), key=gaps.__getitem__)
+        return GapStats(gaps[largest], self.positions[largest + 1], statistics.fmean(gaps), statistics.median(gaps))
+
+    def gaps(self) -> array:
+        '''
+        - gets the difference between each score and the one before it, so the result has one fewer item than the snapshot
+        '''
+
+        if (np := _numpy()) is not None:
+            return array('q', np.diff(np.frombuffer(self.scores, np.int64)).tobytes())
+
+        return array('q', map(operator.sub, itertools.islice(self.scores, 1, None), self.scores))
+
+    def histogram(self, bins: int = 10) -> tuple[list[int], list[float]]:
+        '''
+        - counts scores in equal-width bins from the lowest to the highest score, like `numpy.histogram`
+
+        Parameters
+        ----------
+        bins: int
+            - number of bins
+            - default: `10`
+
+        Returns
+        -------
+        tuple[list[int], list[float]]
+            - number of scores in each bin, and the `bins + 1` bin edges
+            - each bin includes its lower edge, and the last bin also includes its upper edge
+        '''
+
+        if bins < 1:
+            raise ValueError(f'Bins must be at least 1: {bins}')
+
+        if (np := _numpy()) is not None:
+            counts, edges = np.histogram(np.frombuffer(self.scores, np.int64), bins)
+            return counts.tolist(), edges.tolist()
+
+        if not self.scores:
+            low, high = 0.0, 1.0
+        else:
+            low, high = float(self.scores[0]), float(self.scores[-1])
+            if low == high:
+                low, high = low - 0.5, high + 0.5
+
+        edges: list[float] = [low + (high - low) * i / bins for i in range(bins + 1)]
+        bounds: list[int] = [bisect.bisect_left(self.scores, edge) for edge in edges[:-1]] + [len(self.scores)]
+        return [bounds[i + 1] - bounds[i] for i in range(bins)], edges
+
+    def percentile(self, q: float) -> float:
+        '''
+        - gets the score at a percentile, interpolating between records like `numpy.percentile`
+
+        Parameters
+        ----------
+        q: float
+            - percentile
+            - valid: `0` to `100`, i.e. `1` for the score needed to be in the top 1% of this snapshot
+
+        Returns
+        -------
+        float
+            - score
+        '''
+
+        if not 0.0 <= q <= 100.0:
+            raise ValueError(f'Given percentile is invalid: {q}')
+
+        if not self.scores:
+            raise ValueError('No records to get a percentile of')
+
+        if (np := _numpy()) is not None:
+            return float(np.percentile(np.frombuffer(self.scores, np.int64), q))
+
+        index: float = (len(self.scores) - 1) * q / 100.0
+        lower: int = int(index)
+        upper: int = min(lower + 1, len(self.scores) - 1)
+        return self.scores[lower] + (self.scores[upper] - self.scores[lower]) * (index - lower)
+
+    def position_of(self, account_id: str) -> int | None:
+        '''
+        - gets the position of an account's record, or `None` if it is not in the snapshot
+        '''
+
+        packed: bytes = bytes.fromhex(account_id.replace('-', ''))
+        start: int = 0
+
+        while (found := self._account_ids.find(packed, start)) != -1:
+            if found % 16 == 0:
+                return self.positions[found // 16]
+
+            start = found + 1
+
+        return None
+
+    def rank_for_score(self, score: int) -> int:
+        '''
+        - gets the position a score would have on this leaderboard, tying with any equal score already on it
+        - if the snapshot does not start at position 1, scores better than its first record get that record's position
+
+        Parameters
+        ----------
+        score: int
+            - score, i.e. a time in milliseconds
+
+        Returns
+        -------
+        int
+            - position
+        '''
+
+        if not self.scores:
+            return 1
+
+        if (index := bisect.bisect_left(self.scores, score)) < len(self.scores):
+            return self.positions[index]
+
+        return self.positions[-1] + 1
+
+
+@dataclass(slots=True)
+class MapInfo():
+    '''
+    - info on a map from the Core API
+    '''
+
+    author:          str
+    author_score:    int
+    bronze_score:    int
+    collection_name: str
+    file_url:        str
+    gold_score:      int
+    map_id:          str
+    map_style:       str
+    map_type:        str
+    map_uid:         str
+    name:            str
+    silver_score:    int
+    submitter:       str
+    thumbnail_url:   str
+    timestamp:       str
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'MapInfo':
+        get: typing.Callable = data.get
+
+        return cls(
+            data['author'],
+            data['authorScore'],
+            data['bronzeScore'],
+            get('collectionName', ''),
+            get('fileUrl', ''),
+            data['goldScore'],
+            data['mapId'],
+            get('mapStyle', ''),
+            get('mapType', ''),
+            data['mapUid'],
+            data['name'],
+            data['silverScore'],
+            get('submitter', ''),
+            get('thumbnailUrl', ''),
+            get('timestamp', ''),
+        )
+
+
+@dataclass(slots=True)
+class TotdMap():
+    '''
+    - a Track of the Day
+    '''
+
+    campaign_id:     int
+    end_timestamp:   int
+    map_uid:         str
+    month:           int
+    month_day:       int
+    season_uid:      str
+    start_timestamp: int
+    week_day:        int  # as given by the API's `day`
+    year:            int
+
+    @classmethod
+    def from_json(cls, year: int, month: int, data: dict) -> 'TotdMap':
+        get: typing.Callable = data.get
+
+        return cls(
+            data['campaignId'],
+            get('endTimestamp', 0),
+            data['mapUid'],
+            month,
+            data['monthDay'],
+            get('seasonUid', ''),
+            get('startTimestamp', 0),
+            data['day'],
+            year,
+        )
+
+
+def account_names(response: dict[str, str]) -> list[AccountName]:
+    '''
+    - builds records from a response mapping account IDs to display names
+
+    Parameters
+    ----------
+    response: dict[str, str]
+        - response from `oauth.get_account_names_from_ids` or `oauth.resolve_account_names`
+
+    Returns
+    -------
+    list[AccountName]
+        - display names
+    '''
+
+    return [AccountName(account_id, name) for account_id, name in response.items()]
+
+
+def campaign_maps(response: dict) -> list[CampaignMap]:
+    '''
+    - builds records for every map in every campaign in a response
+
+    Parameters
+    ----------
+    response: dict
+        - response from `live.get_maps_seasonal`, `live.get_maps_weekly_short`, `live.get_maps_weekly_grand`, or `live.get_club_campaign`
+
+    Returns
+    -------
+    list[CampaignMap]
+        - maps in the order they appear
+    '''
+
+    campaigns: list[dict] = response['campaignList'] if 'campaignList' in response else [response['campaign']]
+    from_json: typing.Callable = CampaignMap.from_json
+
+    return [from_json(campaign['id'], entry) for campaign in campaigns for entry in campaign['playlist']]
+
+
+def leaderboard_records(response: dict) -> list[LeaderboardRecord]:
+    '''
+    - builds records for every entry in a leaderboard response
+    - for records from `live.iter_map_leaderboard`, use `LeaderboardRecord.from_json` on each instead
+
+    Parameters
+    ----------
+    response: dict
+        - response from `live.get_map_leaderboard`
+
+    Returns
+    -------
+    list[LeaderboardRecord]
+        - records in the order they appear
+    '''
+
+    from_json: typing.Callable = LeaderboardRecord.from_json
+
+    return [from_json(entry) for zone in response['tops'] for entry in zone['top']]
+
+
+def map_infos(response: list[dict]) -> list[MapInfo]:
+    '''
+    - builds records for every map in a map info response
+
+    Parameters
+    ----------
+    response: list[dict]
+        - response from `core.get_map_info`, or one item from `core.iter_map_info`
+
+    Returns
+    -------
+    list[MapInfo]
+        - map info in the order it appears
+    '''
+
+    return list(map(MapInfo.from_json, response))
+
+
+def _numpy() -> typing.Any:
+    '''
+    - gets NumPy if it is installed, only importing it the first time it is needed
+    '''
+
+    global _np
+
+    if _np is None:
+        try:
+            import numpy
+            _np = numpy
+        except ImportError:
+            _np = False
+
+    return _np or None
+
+
+def totd_maps(response: dict) -> list[TotdMap]:
+    '''
+    - builds records for every Track of the Day in a response
+
+    Parameters
+    ----------
+    response: dict
+        - response from `live.get_maps_totd`
+
+    Returns
+    -------
+    list[TotdMap]
+        - Tracks of the Day in the order they appear
+    '''
+
+    from_json: typing.Callable = TotdMap.from_json
+
+    return [from_json(month['year'], month['month'], day) for month in response['monthList'] for day in month['days']]
+
+
+def _unpack_uuid(digits: str) -> str:
+    return f'{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}'
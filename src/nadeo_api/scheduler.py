@@ -0,0 +1,295 @@
+'''
+| Author:   Ezio416
+| Created:  2026-10-18
+| Modified: 2026-10-18
+
+- Priority scheduling of requests waiting on a rate limit, so interactive requests are not stuck behind bulk ones
+- Disabled by default - enable it with `config.priority_scheduling`
+- While enabled, each rate limiter is owned by a dispatcher thread which hands out its slots as they come up,
+  always to the highest priority waiting, and in turns between callers of the same priority
+- Without it, each request claims the next slot when it is sent, so requests are served in the order they were sent
+- Set the priority and caller for the requests sent inside a block with `priority()`, which also applies to the
+  threads used by bulk functions like `core.get_map_info` and to `asyncio` tasks started inside it
+'''
+
+import asyncio
+from collections import OrderedDict, deque
+import contextlib
+import contextvars
+import threading
+import time
+import typing
+import weakref
+
+from . import ratelimit
+
+
+# lower values are served first - any other integer may be used too
+INTERACTIVE: int = 0
+NORMAL:      int = 1
+BULK:        int = 2
+
+_context: contextvars.ContextVar[tuple[int, typing.Hashable]] = contextvars.ContextVar('nadeo_api_priority', default=(NORMAL, None))
+
+
+class _Waiter():
+    __slots__ = 'cancelled', 'error', 'event', 'future', 'loop'
+
+    def __init__(self, loop: asyncio.AbstractEventLoop | None = None):
+        self.cancelled: bool = False
+        self.error: Exception | None = None  # raised to the request instead of sending it
+        self.event: threading.Event | None = None if loop else threading.Event()
+        self.future: asyncio.Future | None = loop.create_future() if loop else None
+        self.loop: asyncio.AbstractEventLoop | None = loop
+
+    def grant(self, error: Exception | None = None) -> None:
+        self.error = error
+
+        if self.event is not None:
+            self.event.set()
+            return
+
+        try:
+            self.loop.call_soon_threadsafe(lambda: self.future.done() or self.future.set_result(None))
+        except RuntimeError:  # its event loop is closed, so nothing is waiting for it any more
+            pass
+
+
+class Scheduler():
+    '''
+    - hands out the slots of one rate limiter to waiting requests by priority, then in turns between callers
+    - the dispatcher thread is started when requests start waiting and stops once none are left
+    - while nothing is waiting, a request whose slot is free is sent right away without involving the dispatcher
+
+    Parameters
+    ----------
+    limiter: ratelimit.RateLimiter
+        - rate limiter to take slots from
+    '''
+
+    limiter: ratelimit.RateLimiter
+
+    def __init__(self, limiter: ratelimit.RateLimiter):
+        self.limiter = limiter
+        self._lock: threading.Lock = threading.Lock()
+        self._queues: dict[int, OrderedDict[typing.Hashable, deque[_Waiter]]] = {}
+        self._ready_at: float | None = None  # slot already claimed by a request that then had to wait for it
+        self._thread: threading.Thread | None = None
+        self._waiting: int = 0
+
+    def __repr__(self) -> str:
+        return f'nadeo_api.scheduler.Scheduler({self.limiter!r})'
+
+    @property
+    def pending(self) -> dict[int, int]:
+        '''
+        - number of requests waiting at each priority
+        '''
+
+        with self._lock:
+            return {level: sum(map(len, callers.values())) for level, callers in sorted(self._queues.items())}
+
+    def acquire(self) -> float:
+        '''
+        - blocks until a slot is handed to this request
+
+        Returns
+        -------
+        float
+            - seconds waited
+        '''
+
+        if (waiter := self._enqueue(None)) is None:
+            return 0.0
+
+        start: float = time.monotonic()
+        waiter.event.wait()
+
+        if waiter.error is not None:
+            raise waiter.error
+
+        return time.monotonic() - start
+
+    async def acquire_async(self) -> float:
+        '''
+        - waits until a slot is handed to this request without blocking the event loop
+
+        Returns
+        -------
+        float
+            - seconds waited
+        '''
+
+        if (waiter := self._enqueue(asyncio.get_running_loop())) is None:
+            return 0.0
+
+        start: float = time.monotonic()
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                waiter.cancelled = True
+            raise
+
+        if waiter.error is not None:
+            raise waiter.error
+
+        return time.monotonic() - start
+
+    def _dispatch(self) -> None:
+        try:
+            while True:
+                with self._lock:
+                    if not self._waiting:
+                        self._thread = None
+                        return
+
+                    ready_at: float | None = self._ready_at
+                    self._ready_at = None
+
+                try:
+                    delay: float = self.limiter.reserve() if ready_at is None else ready_at - time.monotonic()
+                except Exception as e:  # i.e. from a custom limiter - raised to every waiting request instead
+                    with self._lock:
+                        failed: list[_Waiter] = list(iter(self._pop, None))
+
+                    for each in failed:
+                        each.grant(e)
+
+                    continue
+
+                if delay > 0.0:
+                    time.sleep(delay)
+
+                with self._lock:  # chosen only once the slot is here, so requests arriving meanwhile can still go first
+                    waiter: _Waiter | None = self._pop()
+
+                if waiter is not None:
+                    waiter.grant()
+        finally:
+            with self._lock:  # so the next request to wait starts a new dispatcher, even if this one failed
+                if self._thread is threading.current_thread():
+                    self._thread = None
+
+    def _enqueue(self, loop: asyncio.AbstractEventLoop | None) -> _Waiter | None:
+        '''
+        - queues a request, or returns `None` if nothing is waiting and its slot is free so it may be sent right away
+        '''
+
+        level, caller = _context.get()
+
+        with self._lock:
+            if self._thread is None:
+                if (delay := self.limiter.reserve()) <= 0.0:
+                    return None
+
+                self._ready_at = time.monotonic() + delay  # handed to whoever is first once it comes up
+
+            waiter: _Waiter = _Waiter(loop)
+
+            if (callers := self._queues.get(level)) is None:
+                callers = self._queues[level] = OrderedDict()
+
+            if (waiters := callers.get(caller)) is None:
+                waiters = callers[caller] = deque()
+
+            waiters.append(waiter)
+            self._waiting += 1
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._dispatch, name='nadeo_api.scheduler', daemon=True)
+                self._thread.start()
+
+            return waiter
+
+    def _pop(self) -> _Waiter | None:
+        '''
+        - removes the next request to serve, skipping cancelled ones - must be called with the lock held
+        '''
+
+        while self._queues:
+            level: int = min(self._queues)
+            callers: OrderedDict[typing.Hashable, deque[_Waiter]] = self._queues[level]
+            caller, waiters = next(iter(callers.items()))
+            waiter: _Waiter = waiters.popleft()
+            self._waiting -= 1
+
+            if waiters:
+                callers.move_to_end(caller)  # next caller's turn
+            else:
+                del callers[caller]
+                if not callers:
+                    del self._queues[level]
+
+            if not waiter.cancelled:
+                return waiter
+
+        return None
+
+
+_schedulers:      weakref.WeakKeyDictionary[ratelimit.RateLimiter, Scheduler] = weakref.WeakKeyDictionary()
+_schedulers_lock: threading.Lock = threading.Lock()
+
+
+def get_priority() -> tuple[int, typing.Hashable]:
+    '''
+    - gets the priority and caller requests are currently sent with
+
+    Returns
+    -------
+    tuple[int, Hashable]
+        - priority and caller
+    '''
+
+    return _context.get()
+
+
+def get_scheduler(limiter: ratelimit.RateLimiter) -> Scheduler:
+    '''
+    - gets the scheduler for a rate limiter, creating it if needed
+
+    Parameters
+    ----------
+    limiter: ratelimit.RateLimiter
+        - rate limiter, i.e. from `ratelimit.get_limiter()`
+
+    Returns
+    -------
+    Scheduler
+        - scheduler owning the limiter
+    '''
+
+    if (scheduler := _schedulers.get(limiter)) is not None:
+        return scheduler
+
+    with _schedulers_lock:
+        if (scheduler := _schedulers.get(limiter)) is None:
+            scheduler = _schedulers[limiter] = Scheduler(limiter)
+
+        return scheduler
+
+
+@contextlib.contextmanager
+def priority(level: int, caller: typing.Hashable = None) -> typing.Iterator[None]:
+    '''
+    - sets the priority and caller of requests sent inside a `with` block
+
+    Parameters
+    ----------
+    level: int
+        - priority of the requests - lower is served first
+        - valid: `INTERACTIVE`, `NORMAL`, `BULK`, or any other integer
+
+    caller: Hashable
+        - identifies who is sending the requests, i.e. a job name - callers with the same priority take turns
+        - requests without a caller share one turn
+        - default: `None`
+    '''
+
+    reset: contextvars.Token = _context.set((level, caller))
+
+    try:
+        yield
+    finally:
+        _context.reset(reset)
@@ -1,21 +1,61 @@
 '''
 | Author:   Ezio416
 | Created:  2024-05-20
-| Modified: 2025-08-05
+| Modified: 2026-10-18
 
 - Various functions not directly related to any API
 - You don't need to import this module - simply call these from the main module like `nadeo_api.<function>`
 '''
 
 import base64
+from collections import deque
+import contextvars
+import itertools
 import re
 import sys
 import time
-import traceback as tb
+import typing
 
 from . import config
 
 
+__all__: list[str] = [  # what the main module re-exports
+    'account_id_from_login',
+    'account_ids_from_logins',
+    'account_login_from_id',
+    'account_logins_from_ids',
+    'get_json_decoder',
+    'set_json_decoder',
+    'stamp',
+    'valid_uuid',
+    'valid_uuids',
+]
+
+
+try:  # fastest JSON decoder installed
+    from orjson import loads as _default_json_decoder
+except ImportError:
+    try:
+        from msgspec.json import decode as _default_json_decoder
+    except ImportError:
+        from json import loads as _default_json_decoder
+
+
+_json_decoder: typing.Callable[[bytes], typing.Any] = _default_json_decoder
+
+_login_pattern: re.Pattern = re.compile('[0-9A-Za-z\\-_]{22}')
+_uuid_pattern:  re.Pattern = re.compile('[0-9A-Fa-f]{8}-(?:[0-9A-Fa-f]{4}-){3}[0-9A-Fa-f]{12}')
+
+# for validating many values at once - valid characters become 'x', separators are kept, and anything else becomes a null byte,
+# so a batch is valid if it matches a repeated template
+_login_chars:    bytes = bytes(
+    ord('x') if chr(c) in '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz-_' else c if c == ord('\n') else 0 for c in range(256)
+)
+_login_template: bytes = b'xxxxxxxxxxxxxxxxxxxxxx\n'
+_uuid_chars:     bytes = bytes(ord('x') if chr(c) in '0123456789ABCDEFabcdef' else c if chr(c) in '-\n' else 0 for c in range(256))
+_uuid_template:  bytes = b'xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx\n'
+
+
 def account_id_from_login(account_login: str) -> str:
     '''
     - converts a base64-encoded login to a Ubisoft account ID (UUID)
@@ -31,7 +71,7 @@ def account_id_from_login(account_login: str) -> str:
         - account ID (UUID)
     '''
 
-    if not bool(re.match('^[0-9A-Za-z\\-_]{22}$', account_login)):
+    if _login_pattern.fullmatch(account_login) is None:
         raise ValueError(f'Given account login is invalid: {account_login}')
 
     b: str = bytes.hex(base64.urlsafe_b64decode(f'{account_login}=='))
@@ -39,6 +79,39 @@ def account_id_from_login(account_login: str) -> str:
     return f'{b[:8]}-{b[8:12]}-{b[12:16]}-{b[16:20]}-{b[20:]}'
 
 
+def account_ids_from_logins(account_logins: typing.Iterable[str]) -> list[str]:
+    '''
+    - converts many base64-encoded logins to Ubisoft account IDs (UUID) at once
+    - much faster than calling `account_id_from_login` in a loop, as all logins are validated and decoded in one pass
+    - raises a `ValueError` naming the first invalid login, if any
+
+    Parameters
+    ----------
+    account_logins: Iterable[str]
+        - base64-encoded logins
+
+    Returns
+    -------
+    list[str]
+        - account IDs (UUID) in the same order
+    '''
+
+    logins: list[str] = list(account_logins)
+
+    if not logins:
+        return []
+
+    if not _valid_batch(logins, _login_chars, _login_template):
+        for account_login in logins:
+            if not isinstance(account_login, str) or _login_pattern.fullmatch(account_login) is None:
+                raise ValueError(f'Given account login is invalid: {account_login}')
+
+    # 'AA' pads each login to 24 characters, so the whole batch decodes at once into 18 bytes per login
+    h: str = base64.urlsafe_b64decode('AA'.join(logins) + 'AA').hex()
+
+    return [f'{h[i:i + 8]}-{h[i + 8:i + 12]}-{h[i + 12:i + 16]}-{h[i + 16:i + 20]}-{h[i + 20:i + 32]}' for i in range(0, len(h), 36)]
+
+
 def account_login_from_id(account_id: str) -> str:
     '''
     - converts a Ubisoft account ID (UUID) to a base64-encoded login
@@ -60,16 +133,112 @@ def account_login_from_id(account_id: str) -> str:
     return base64.urlsafe_b64encode(bytes.fromhex(account_id.replace('-', ''))).decode()[:-2]
 
 
+def account_logins_from_ids(account_ids: typing.Iterable[str]) -> list[str]:
+    '''
+    - converts many Ubisoft account IDs (UUID) to base64-encoded logins at once
+    - much faster than calling `account_login_from_id` in a loop, as all IDs are validated and encoded in one pass
+    - raises a `ValueError` naming the first invalid account ID, if any
+
+    Parameters
+    ----------
+    account_ids: Iterable[str]
+        - account IDs (UUID)
+
+    Returns
+    -------
+    list[str]
+        - base64-encoded logins in the same order
+    '''
+
+    ids: list[str] = list(account_ids)
+
+    if not ids:
+        return []
+
+    if not _valid_batch(ids, _uuid_chars, _uuid_template):
+        for account_id in ids:
+            if not isinstance(account_id, str) or _uuid_pattern.fullmatch(account_id) is None:
+                raise ValueError(f'Given account ID is invalid: {account_id}')
+
+    # '0000' pads each ID to 18 bytes, so the whole batch encodes at once into 24 characters per ID
+    b: str = base64.urlsafe_b64encode(bytes.fromhex(('-0000-'.join(ids) + '-0000').replace('-', ''))).decode()
+
+    return [b[i:i + 22] for i in range(0, len(b), 24)]
+
+
+def get_json_decoder() -> typing.Callable[[bytes], typing.Any]:
+    '''
+    - gets the function used to decode response bodies
+
+    Returns
+    -------
+    Callable[[bytes], Any]
+        - JSON decoder
+    '''
+
+    return _json_decoder
+
+
+def _imap(func: typing.Callable, items: typing.Iterable, workers: int = 0) -> typing.Iterator:
+    '''
+    - calls a function on each item from a pool of threads, yielding the results in the order of the items
+    - at most `workers` calls are in flight at once, and items are only pulled from `items` as slots free up
+    - closing the generator early cancels calls that have not started yet
+    - `workers` of 0 uses `config.max_workers`, and 1 runs everything in the calling thread
+    '''
+
+    if workers <= 0:
+        workers = config.max_workers
+
+    if workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    it: typing.Iterator = iter(items)
+
+    with ThreadPoolExecutor(workers, 'nadeo_api') as executor:
+        # each call runs in a copy of the caller's context, so settings like `scheduler.priority()` carry over
+        pending: deque[Future] = deque(executor.submit(contextvars.copy_context().run, func, item) for item in itertools.islice(it, workers))
+
+        try:
+            while pending:
+                result = pending.popleft().result()
+
+                for item in itertools.islice(it, 1):
+                    pending.append(executor.submit(contextvars.copy_context().run, func, item))
+
+                yield result
+
+        finally:
+            for future in pending:
+                future.cancel()
+
+
 def _log(msg: str) -> None:
     if not config.debug_logging:
         return
 
-    summary: tb.StackSummary = tb.extract_stack(sys._getframe())
-    print(
-        f'nadeo_api.{
-            summary[-2].filename.replace('\\', '/').split('/')[-1].replace('.py', '')}.{
-            summary[-2].name}: {msg}'
-    )
+    caller = sys._getframe(1)  # cheap, unlike walking the whole stack
+    print(f'nadeo_api.{caller.f_globals['__name__'].split('nadeo_api.')[-1]}.{caller.f_code.co_name}: {msg}')
+
+
+def set_json_decoder(decoder: typing.Callable[[bytes], typing.Any] | None) -> None:
+    '''
+    - replaces the function used to decode response bodies from both the sync and async functions
+    - by default, `orjson` is used if installed, then `msgspec`, then the standard library's `json`
+
+    Parameters
+    ----------
+    decoder: Callable[[bytes], Any] | None
+        - function taking a response body and returning the decoded object, i.e. `orjson.loads`
+        - if `None`, the default decoder is used again
+    '''
+
+    global _json_decoder
+    _json_decoder = _default_json_decoder if decoder is None else decoder
 
 
 def stamp(milliseconds: bool = False) -> int:
@@ -92,6 +261,30 @@ def stamp(milliseconds: bool = False) -> int:
     return int(now * (1000 if milliseconds else 1))
 
 
+def _unique(items: typing.Iterable) -> typing.Iterator:
+    '''
+    - yields items in order, skipping any that were already yielded
+    '''
+
+    seen: set = set()
+
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            yield item
+
+
+def _valid_batch(values: list[str], chars: bytes, template: bytes) -> bool:
+    '''
+    - checks if every value matches a fixed-width template in one pass
+    '''
+
+    try:
+        return ('\n'.join(values) + '\n').encode('ascii').translate(chars) == template * len(values)
+    except (TypeError, UnicodeEncodeError):
+        return False
+
+
 def valid_uuid(uuid: str) -> bool:
     '''
     - checks if a given string looks like a valid UUID
@@ -107,4 +300,28 @@ def valid_uuid(uuid: str) -> bool:
         - whether given string looks like a valid UUID
     '''
 
-    return bool(re.match('^[0-9A-Fa-f]{8}-([0-9A-Fa-f]{4}-){3}[0-9A-Fa-f]{12}$', uuid))
+    return _uuid_pattern.fullmatch(uuid) is not None
+
+
+def valid_uuids(uuids: typing.Iterable[str]) -> list[bool]:
+    '''
+    - checks if each of many strings looks like a valid UUID
+
+    Parameters
+    ----------
+    uuids: Iterable[str]
+        - strings to check
+
+    Returns
+    -------
+    list[bool]
+        - whether each string looks like a valid UUID, in the same order
+    '''
+
+    values: list[str] = list(uuids)
+
+    if _valid_batch(values, _uuid_chars, _uuid_template):
+        return [True] * len(values)
+
+    fullmatch: typing.Callable = _uuid_pattern.fullmatch
+    return [isinstance(uuid, str) and fullmatch(uuid) is not None for uuid in values]
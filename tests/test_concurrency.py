@@ -0,0 +1,405 @@
+'''
+| Author:   Ezio416
+| Created:  2026-10-18
+| Modified: 2026-10-18
+
+- Tests for sharing tokens, rate limiters and requests between threads and coroutines, run with `python -m pytest tests`
+- Requests go to the local stub servers in `benchmarks/stub_server.py`, so no credentials are needed
+'''
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
+import threading
+import time
+import typing
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'benchmarks'))
+import src.nadeo_api.auth as auth
+import src.nadeo_api.cache as cache
+import src.nadeo_api.config as config
+import src.nadeo_api.core as core
+import src.nadeo_api.hooks as hooks
+import src.nadeo_api.live as live
+import src.nadeo_api.ratelimit as ratelimit
+import src.nadeo_api.scheduler as scheduler
+
+try:
+    import src.nadeo_api.aio.auth as aio_auth
+    import src.nadeo_api.aio.core as aio_core
+except ImportError:  # aiohttp not installed
+    aio_auth = aio_core = None
+
+from stub_server import StubServer
+
+
+THREADS: int = 16
+
+needs_aio = pytest.mark.skipif(aio_auth is None, reason='requires aiohttp')
+
+
+@pytest.fixture(scope='module')
+def stub() -> typing.Iterator[StubServer]:
+    with StubServer() as server:
+        yield server
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch: pytest.MonkeyPatch, stub: StubServer) -> typing.Iterator[None]:
+    monkeypatch.setattr(config, 'batch_map_info_ms', 0)
+    monkeypatch.setattr(config, 'coalesce_requests', True)
+    monkeypatch.setattr(config, 'priority_scheduling', False)
+    monkeypatch.setattr(config, 'rate_limits', {})
+    monkeypatch.setattr(config, 'wait_between_requests_ms', 0)
+    monkeypatch.setattr(stub, 'latency', 0.1)  # long enough for every thread to be waiting on the first request
+    cache.set_backend(None)
+    ratelimit.reset()
+    yield
+    ratelimit.reset()
+
+
+def requests_sent(stub: StubServer, api: str, func: typing.Callable[[], typing.Any]) -> int:
+    before: int = stub.requests.get(api, 0)
+    func()
+    return stub.requests.get(api, 0) - before
+
+
+def run_threads(func: typing.Callable[[int], typing.Any], count: int = THREADS) -> list:
+    '''
+    - calls a function from many threads released at the same moment, and returns their results in order
+    '''
+
+    barrier: threading.Barrier = threading.Barrier(count)
+
+    def call(i: int) -> typing.Any:
+        barrier.wait()
+        return func(i)
+
+    with ThreadPoolExecutor(count) as executor:
+        return list(executor.map(call, range(count)))
+
+
+############################################### TOKEN REFRESH ##########################################################
+
+
+def test_refresh_single_flight(stub: StubServer) -> None:
+    token: auth.Token = stub.token('core')
+    stale: str = token.access_token
+    refreshes: list[dict] = []
+
+    def on_refresh(event: str, data: dict) -> None:
+        refreshes.append(data)
+
+    hooks.subscribe(on_refresh, [hooks.TOKEN_REFRESH])
+
+    try:
+        assert requests_sent(stub, 'core', lambda: run_threads(lambda _: token._refresh_if_stale(stale))) == 1
+    finally:
+        hooks.unsubscribe(on_refresh, [hooks.TOKEN_REFRESH])
+
+    assert len(refreshes) == 1
+    assert token.access_token != stale
+
+
+def test_refresh_expired_token(stub: StubServer, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config, 'coalesce_requests', False)
+    token: auth.Token = stub.token('core')
+    token.expiration = 1  # long expired
+    stale: str = token.access_token
+
+    # every thread sends its own request, and only the first to find the token expired refreshes it
+    assert requests_sent(stub, 'core', lambda: run_threads(lambda _: core.get(token, 'zones'))) == THREADS + 1
+    assert token.access_token != stale
+    assert not token.expired
+
+
+@needs_aio
+def test_refresh_single_flight_aio(stub: StubServer) -> None:
+    token: auth.Token = stub.token('core')
+    stale: str = token.access_token
+
+    async def main() -> None:
+        try:
+            await asyncio.gather(*(aio_auth._refresh_if_stale(token, stale) for _ in range(THREADS)))
+        finally:
+            await aio_auth.close_sessions()
+
+    assert requests_sent(stub, 'core', lambda: asyncio.run(main())) == 1
+    assert token.access_token != stale
+
+
+################################################ RATE LIMITING #########################################################
+
+
+def test_token_bucket_slots() -> None:
+    rate: float = 50.0
+    bucket: ratelimit.TokenBucket = ratelimit.TokenBucket(rate)
+
+    # each thread must be given its own slot, however many reserve at once
+    slots: list[float] = sorted(run_threads(lambda _: time.monotonic() + bucket.reserve(), THREADS * 4))
+
+    for earlier, later in zip(slots, slots[1:]):
+        assert later - earlier > 1.0 / rate - 0.005
+
+    assert slots[-1] - slots[0] < (len(slots) - 1) / rate + 0.05
+
+
+def test_token_bucket_burst() -> None:
+    bucket: ratelimit.TokenBucket = ratelimit.TokenBucket(1.0, burst=5)
+    delays: list[float] = run_threads(lambda _: bucket.reserve(), 8)
+
+    assert sorted(delays)[:5] == [0.0] * 5
+    assert all(delay > 0.0 for delay in sorted(delays)[5:])
+
+
+def test_token_bucket_disabled() -> None:
+    bucket: ratelimit.TokenBucket = ratelimit.TokenBucket(0.0)
+    assert run_threads(lambda _: bucket.reserve()) == [0.0] * THREADS
+
+
+################################################ COALESCING ############################################################
+
+
+def test_coalesce() -> None:
+    calls: list[int] = []
+
+    def fetch() -> bytes:
+        calls.append(0)
+        time.sleep(0.1)
+        return b'content'
+
+    assert run_threads(lambda _: auth._coalesce('key', fetch)) == [b'content'] * THREADS
+    assert len(calls) == 1
+    assert not auth._inflight
+
+
+def test_coalesce_error() -> None:
+    calls: list[int] = []
+
+    def fetch() -> bytes:
+        calls.append(0)
+        time.sleep(0.1)
+        raise ConnectionError('failed')
+
+    def call(_: int) -> str:
+        try:
+            auth._coalesce('key', fetch)
+        except ConnectionError as e:
+            return str(e)
+
+        return ''
+
+    assert run_threads(call) == ['failed'] * THREADS
+    assert len(calls) == 1
+    assert not auth._inflight
+
+
+@pytest.mark.parametrize('coalesce, accounts, sent', [(True, 1, 1), (True, 2, 2), (False, 1, THREADS)])
+def test_coalesce_requests(stub: StubServer, monkeypatch: pytest.MonkeyPatch, coalesce: bool, accounts: int, sent: int) -> None:
+    monkeypatch.setattr(config, 'coalesce_requests', coalesce)
+    tokens: list[auth.Token] = [stub.token('live', f'user{i}') for i in range(accounts)]
+
+    def get(i: int) -> dict:
+        return live.get(tokens[i % accounts], 'api/token/campaign/month', {'length': 1})
+
+    results: list[dict] = []
+    assert requests_sent(stub, 'live', lambda: results.extend(run_threads(get))) == sent
+    assert all(result == results[0] and result is not results[0] for result in results[1:])  # each caller gets its own copy
+
+
+def test_coalesce_unknown_account(stub: StubServer) -> None:
+    token: auth.Token = stub.token('live')
+    token.token_decoded = {name: value for name, value in token.token_decoded.items() if name != 'sub'}
+
+    # with nothing to tell its account apart from others, the token's responses are never shared
+    assert requests_sent(stub, 'live', lambda: run_threads(lambda _: live.get(token, 'api/token/campaign/month', {'length': 1}))) == THREADS
+
+
+@needs_aio
+def test_coalesce_aio(stub: StubServer) -> None:
+    token: auth.Token = stub.token('core')
+
+    async def main() -> list:
+        async def cancelled() -> None:
+            async with asyncio.timeout(0.01):
+                await aio_core.get(token, 'zones')
+
+        try:
+            # the first caller gives up, but the fetch it started is still shared with the others
+            return await asyncio.gather(cancelled(), *(aio_core.get(token, 'zones') for _ in range(THREADS)), return_exceptions=True)
+        finally:
+            await aio_auth.close_sessions()
+
+    results: list = []
+    assert requests_sent(stub, 'core', lambda: results.extend(asyncio.run(main()))) == 1
+    assert isinstance(results[0], TimeoutError)
+    assert all(isinstance(result, list) and len(result) == 500 for result in results[1:])
+
+
+def test_session_cookies(stub: StubServer, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config, 'coalesce_requests', False)
+    tokens: list[auth.Token] = [stub.token('live', f'user{i}') for i in range(2)]
+    before: int = stub.cookies
+
+    # the session is shared by every account, so a cookie one is given must never be sent with another's requests
+    for token in tokens * 2:
+        live.get(token, 'api/token/campaign/month', {'length': 1})
+
+    assert stub.cookies == before
+
+
+############################################### MAP INFO BATCHING ######################################################
+
+
+def test_map_info_batch_bad_uid(stub: StubServer) -> None:
+    token: auth.Token = stub.token('core')
+    loader: core.MapInfoLoader = core.MapInfoLoader()
+    uids: list[str] = [f'uid{i:024d}' for i in range(50)]
+    uids[37] = 'bad!uid'
+
+    def load() -> list:
+        futures: list = [loader.load(token, [uid])[0] for uid in uids]
+        loader.flush()
+        return futures
+
+    futures: list = []
+    sent: int = requests_sent(stub, 'core', lambda: futures.extend(load()))
+
+    # halving finds the bad lookup in about 2 * log2(50) requests, instead of one per lookup
+    assert sent <= 1 + 2 * 6
+    assert isinstance(error := futures[37].exception(), auth.BadResponseError) and error.status == 400
+
+    for uid, future in zip(uids, futures):
+        if uid != 'bad!uid':
+            assert future.result()['mapUid'] == uid
+
+
+@pytest.mark.parametrize('status', [401, 403, 429, 500])
+def test_map_info_batch_not_split(stub: StubServer, monkeypatch: pytest.MonkeyPatch, status: int) -> None:
+    token: auth.Token = stub.token('core')
+    loader: core.MapInfoLoader = core.MapInfoLoader()
+    calls: list[str] = []
+
+    def get(token: auth.Token, endpoint: str) -> list[dict]:
+        calls.append(endpoint)
+        raise auth.BadResponseError(f'Bad response from Core API: code {status}, response {{}}', status)
+
+    monkeypatch.setattr(core, 'get', get)
+    futures: list = [loader.load(token, [f'uid{i:024d}'])[0] for i in range(100)]
+    loader.flush()
+
+    # splitting would only send more of the same failing requests
+    assert len(calls) == 1
+    assert all(future.exception().status == status for future in futures)
+
+
+################################################ SCHEDULING ############################################################
+
+
+def test_scheduler_priority() -> None:
+    order: list[str] = []
+    sched: scheduler.Scheduler = scheduler.Scheduler(ratelimit.TokenBucket(20.0))
+
+    def acquire(level: int, caller: str) -> None:
+        with scheduler.priority(level, caller):
+            sched.acquire()
+            order.append(caller)
+
+    threads: list[threading.Thread] = [threading.Thread(target=acquire, args=(scheduler.BULK, 'bulk')) for _ in range(8)]
+
+    for thread in threads:
+        thread.start()
+
+    while sum(sched.pending.values()) < 7:  # the first is sent right away
+        time.sleep(0.001)
+
+    acquire(scheduler.INTERACTIVE, 'interactive')
+
+    for thread in threads:
+        thread.join()
+
+    # only the slots already handed out when it arrived may go before it
+    assert order.index('interactive') <= 2
+    assert sched.pending == {}
+
+
+def test_scheduler_turns() -> None:
+    order: list[str] = []
+    sched: scheduler.Scheduler = scheduler.Scheduler(ratelimit.TokenBucket(10.0))
+    threads: list[threading.Thread] = []
+
+    def acquire(caller: str) -> None:
+        with scheduler.priority(scheduler.BULK, caller):
+            sched.acquire()
+            order.append(caller)
+
+    for caller in 'aaaaaabbb':
+        threads.append(threading.Thread(target=acquire, args=(caller,)))
+        threads[-1].start()
+
+        while sum(sched.pending.values()) < len(threads) - 1:  # queued in the order they were started
+            time.sleep(0.001)
+
+    for thread in threads:
+        thread.join()
+
+    assert ''.join(order) == 'aabababaa'  # the first is sent right away, then a and b take turns
+
+
+@needs_aio
+def test_scheduler_cancelled_aio() -> None:
+    sched: scheduler.Scheduler = scheduler.Scheduler(ratelimit.TokenBucket(20.0))
+
+    async def main() -> list[float]:
+        await sched.acquire_async()  # sent right away
+        cancelled: asyncio.Task = asyncio.create_task(sched.acquire_async())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        # the cancelled request's place is skipped instead of holding up the ones behind it
+        return await asyncio.gather(sched.acquire_async(), sched.acquire_async())
+
+    waited: list[float] = asyncio.run(main())
+    assert max(waited) < 0.15
+    assert sched.pending == {}
+
+
+def test_scheduler_limiter_error() -> None:
+    class FailingLimiter(ratelimit.TokenBucket):
+        fail: bool = False
+
+        def reserve(self) -> float:
+            if self.fail:
+                self.fail = False
+                raise RuntimeError('failed')
+
+            return super().reserve()
+
+    limiter: FailingLimiter = FailingLimiter(20.0)
+    sched: scheduler.Scheduler = scheduler.Scheduler(limiter)
+    sched.acquire()  # sent right away
+    limiter.fail = True
+
+    # the dispatcher's failure is raised to the waiting requests, and the next to wait starts a new one
+    with pytest.raises(RuntimeError, match='failed'):
+        run_threads(lambda _: sched.acquire(), 4)
+
+    assert run_threads(lambda _: sched.acquire(), 4)
+    assert sched.pending == {}
+
+
+@needs_aio
+def test_scheduler_closed_loop() -> None:
+    sched: scheduler.Scheduler = scheduler.Scheduler(ratelimit.TokenBucket(20.0))
+    sched.acquire()  # sent right away
+    loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+    assert sched._enqueue(loop) is not None  # a request from a loop which is then closed while it waits
+    loop.close()
+
+    # the slot handed to the abandoned request is wasted, but the dispatcher carries on
+    assert sched.acquire() > 0.0
+    assert sched.pending == {}
@@ -0,0 +1,140 @@
+'''
+| Author:   Ezio416
+| Created:  2026-10-18
+| Modified: 2026-10-18
+
+- Tests for the incremental sync of nadeo_api.live.CampaignArchive, run with `python -m pytest tests`
+- Uses a fake fetch instead of the API, so no credentials are needed
+'''
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import src.nadeo_api.live as live
+
+
+DAYS: int = 28
+
+
+class FakeTotd():
+    '''
+    - stands in for `live.get_maps_totd`, with months counted from the oldest
+    - every response has new relative times, like the real API
+    '''
+
+    def __init__(self, months: int, days: int = DAYS):
+        self.calls: list[tuple[int, int]] = []
+        self.set(months, days)
+
+    def fetch(self, length: int, offset: int) -> dict:
+        self.calls.append((length, offset))
+
+        return {
+            'itemCount': len(self.months),
+            'monthList': [
+                {**month, 'relativeStart': -len(self.calls), 'days': [{**day, 'relativeStart': -len(self.calls)} for day in month['days']]}
+                for month in self.months[offset:offset + length]
+            ],
+        }
+
+    def set(self, months: int, days: int = DAYS) -> None:
+        '''
+        - sets the number of months, and the number of days revealed in the newest
+        '''
+
+        self.months: list[dict] = [
+            {
+                'days':  [{'campaignId': n * 100 + day, 'day': day + 1, 'mapUid': f'map{n:03d}{day:02d}'} for day in range(days if n == months - 1 else DAYS)],
+                'month': n % 12 + 1,
+                'year':  2020 + n // 12,
+            }
+            for n in reversed(range(months))
+        ]
+
+
+def key(n: int) -> str:
+    return f'{2020 + n // 12}-{n % 12 + 1:02d}'
+
+
+def sync(archive: live.CampaignArchive, api: FakeTotd, page_length: int = 12) -> live.SyncReport:
+    return live._sync(archive, api.fetch, 'monthList', page_length)
+
+
+@pytest.mark.parametrize(
+    'before_months, before_days, after_months, after_days, requests, added, updated, new_maps',
+    [
+        pytest.param(0,  0,    30, DAYS, 3, 30, [],   30 * DAYS,        id='empty archive'),
+        pytest.param(30, DAYS, 30, DAYS, 1, 0,  [],   0,                id='no change'),
+        pytest.param(30, DAYS, 31, 1,    1, 1,  [],   1,                id='new month'),
+        pytest.param(30, DAYS, 35, DAYS, 2, 5,  [],   5 * DAYS,         id='several missed months'),
+        pytest.param(30, DAYS, 60, DAYS, 4, 30, [],   30 * DAYS,        id='missed more than a page'),
+        pytest.param(30, 27,   30, DAYS, 1, 0,  [29], 1,                id='changed in-progress month'),
+        pytest.param(30, 27,   33, 5,    2, 3,  [29], 1 + 2 * DAYS + 5, id='changed in-progress month and missed months'),
+    ]
+)
+def test_sync(before_months: int, before_days: int, after_months: int, after_days: int, requests: int, added: int, updated: list[int], new_maps: int) -> None:
+    archive: live.CampaignArchive = live.CampaignArchive()
+    api: FakeTotd = FakeTotd(before_months, before_days)
+
+    if before_months:
+        sync(archive, api)
+
+    api.set(after_months, after_days)
+    report: live.SyncReport = sync(archive, api)
+
+    assert report.requests == requests
+    assert report.added == [key(n) for n in reversed(range(after_months - added, after_months))]
+    assert report.updated == [key(n) for n in updated]
+    assert len(report.new_maps) == len(set(report.new_maps)) == new_maps
+    assert report.changed == bool(added or updated)
+
+    # the archive must end up the same as if it had been synced from scratch
+    fresh: live.CampaignArchive = live.CampaignArchive()
+    sync(fresh, FakeTotd(after_months, after_days), 100)
+    assert archive.items == fresh.items
+    assert archive.in_progress == key(after_months - 1)
+    assert archive.item_count == after_months
+    assert archive.finished == after_months - 1
+
+
+def test_sync_empty_api() -> None:
+    archive: live.CampaignArchive = live.CampaignArchive()
+    report: live.SyncReport = sync(archive, FakeTotd(0))
+
+    assert report.requests == 1
+    assert not report.changed
+    assert archive.in_progress is None
+    assert archive.finished == 0
+    assert archive.synced > 0.0
+
+
+def test_sync_page_length() -> None:
+    with pytest.raises(ValueError):
+        sync(live.CampaignArchive(), FakeTotd(3), 1)
+
+
+def test_round_trip(tmp_path) -> None:
+    path: str = str(tmp_path / 'totd.json')
+    api: FakeTotd = FakeTotd(30, 10)
+
+    archive: live.CampaignArchive = live.CampaignArchive(path)
+    sync(archive, api)
+
+    loaded: live.CampaignArchive = live.CampaignArchive(path)
+    assert loaded.items == archive.items
+    assert loaded.in_progress == archive.in_progress
+    assert loaded.item_count == archive.item_count
+    assert loaded.synced == archive.synced
+    assert not any(name.startswith('relative') for item in loaded.items.values() for name in item)
+    assert not os.path.exists(f'{path}.tmp')
+
+    report: live.SyncReport = sync(loaded, api)
+    assert report.requests == 1
+    assert not report.changed
+
+    api.set(30, 11)
+    assert sync(live.CampaignArchive(path), api).updated == [key(29)]
+    assert live.CampaignArchive(path).items[key(29)]['days'][-1]['mapUid'] == 'map02910'
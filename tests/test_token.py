@@ -0,0 +1,63 @@
+'''
+| Author:   Ezio416
+| Created:  2026-10-18
+| Modified: 2026-10-18
+
+- Tests for nadeo_api.auth.Token that need no credentials, run with `python -m pytest tests`
+'''
+
+import copy
+import dataclasses
+import os
+import pickle
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'benchmarks'))
+import src.nadeo_api.auth as auth
+
+from stub_server import jwt
+
+
+def make_token() -> auth.Token:
+    return auth.Token(f'nadeo_v1 t={jwt()}', auth.audience_core, 'refresh', True)
+
+
+def test_fields() -> None:
+    assert [field.name for field in dataclasses.fields(auth.Token)] == ['access_token', 'audience', 'expiration', 'refresh_token', 'server_account', 'token_decoded']
+
+
+def test_asdict() -> None:
+    token: auth.Token = make_token()
+
+    assert dataclasses.asdict(token) == {
+        'access_token':   token.access_token,
+        'audience':       auth.audience_core,
+        'expiration':     token.token_decoded['exp'],
+        'refresh_token':  'refresh',
+        'server_account': True,
+        'token_decoded':  auth.decode_jwt_from_token(token.access_token),
+    }
+
+
+def test_copy() -> None:
+    token: auth.Token = make_token()
+
+    for other in pickle.loads(pickle.dumps(token)), copy.deepcopy(token), copy.copy(token):
+        assert other == token
+        assert other.expiration == token.expiration
+
+    assert make_token() != token
+    assert not hasattr(token, '__dict__')
+
+
+def test_set_decoded() -> None:
+    token: auth.Token = make_token()
+    token.token_decoded = {'exp': 5, 'sub': 'account'}
+    token.expiration = 0  # decoded again from the new payload
+
+    assert token.expiration == 5
+    assert token._scope == 'account'
+
+    token.token_decoded = {'exp': 5}  # responses are not cached or shared without an account ID
+    assert token._scope == ''
@@ -0,0 +1,115 @@
+'''
+| Author:   Ezio416
+| Created:  2026-10-18
+| Modified: 2026-10-18
+
+- Tests for nadeo_api.util, run with `python -m pytest tests`
+- The batch conversions and checks must agree with their single-value versions for every input
+'''
+
+import os
+import sys
+import uuid
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import src.nadeo_api as nadeo_api
+import src.nadeo_api.util as util
+
+
+ids: list[str] = [str(uuid.UUID(int=i * 0x0123456789ABCDEF0123456789ABCDEF % (1 << 128))) for i in range(200)]
+ids_upper: list[str] = [account_id.upper() for account_id in ids[:10]]
+logins: list[str] = [util.account_login_from_id(account_id) for account_id in ids]
+
+invalid_ids: list[object] = [
+    '',
+    '5b4d42f4-c2de-407d-b367-cbff3fe817b',     # too short
+    '5b4d42f4-c2de-407d-b367-cbff3fe817bcc',   # too long
+    '5b4d42f4-c2de-407d-b367-cbff3fe817bg',    # not hex
+    '5b4d42f4c2de-407d-b367-cbff3fe817bc0',    # dash moved
+    '5b4d42f4-c2de-407d-b367-cbff3fe817bc\n',  # trailing newline
+    '5b4d42f4-c2de-407d\n-b367-cbff3fe817bc',  # embedded newline
+    '5b4d42f4-c2de-407d-b367-cbff3fe817bc\n5b4d42f4-c2de-407d-b367-cbff3fe817bc',  # two IDs in one string
+    '5b4d42f4-c2de-407d-b367-cbff3fe817bé',    # not ASCII
+    None,
+    12345,
+    b'5b4d42f4-c2de-407d-b367-cbff3fe817bc',
+]
+
+invalid_logins: list[object] = [
+    '',
+    'W01C9MLeQH2zZ8v_P-gXvA=',   # padded
+    'W01C9MLeQH2zZ8v_P-gXv',     # too short
+    'W01C9MLeQH2zZ8v_P-gXvAA',   # too long
+    'W01C9MLeQH2zZ8v+P-gXvA',    # not URL-safe
+    'W01C9MLeQH2zZ8v_P-gXvA\n',  # trailing newline
+    'W01C9MLeQH2\nzZ8v_P-gXvA',  # embedded newline
+    'W01C9MLeQH2zZ8v_P-gXvA\nW01C9MLeQH2zZ8v_P-gXvA',  # two logins in one string
+    None,
+    12345,
+]
+
+
+@pytest.mark.parametrize('values', [[], ids[:1], ids, ids_upper, ids + ids])
+def test_account_logins_from_ids(values: list[str]) -> None:
+    assert util.account_logins_from_ids(values) == [util.account_login_from_id(account_id) for account_id in values]
+
+
+@pytest.mark.parametrize('values', [[], logins[:1], logins, logins + logins])
+def test_account_ids_from_logins(values: list[str]) -> None:
+    assert util.account_ids_from_logins(values) == [util.account_id_from_login(account_login) for account_login in values]
+
+
+def test_round_trip() -> None:
+    assert util.account_ids_from_logins(util.account_logins_from_ids(ids)) == ids
+    assert util.account_ids_from_logins(util.account_logins_from_ids(ids_upper)) == [account_id.lower() for account_id in ids_upper]
+
+
+@pytest.mark.parametrize('value', invalid_ids)
+def test_invalid_ids(value: object) -> None:
+    for values in [value], [*ids[:3], value], [value, *ids[:3]]:
+        with pytest.raises(ValueError):
+            util.account_logins_from_ids(values)
+
+        assert util.valid_uuids(values) == [isinstance(item, str) and util.valid_uuid(item) for item in values]
+
+    if isinstance(value, str):
+        assert not util.valid_uuid(value)
+
+        with pytest.raises(ValueError):
+            util.account_login_from_id(value)
+
+
+@pytest.mark.parametrize('value', invalid_logins)
+def test_invalid_logins(value: object) -> None:
+    for values in [value], [*logins[:3], value], [value, *logins[:3]]:
+        with pytest.raises(ValueError):
+            util.account_ids_from_logins(values)
+
+    if isinstance(value, str):
+        with pytest.raises(ValueError):
+            util.account_id_from_login(value)
+
+
+def test_newlines_do_not_realign() -> None:
+    # a batch is checked as one string joined by newlines, so values with newlines must not shift into a valid layout
+    first, second = ids[:2]
+    values: list[str] = [f'{first}\n{second[:-1]}', second[-1]]
+    assert util.valid_uuids(values) == [False, False]
+
+    with pytest.raises(ValueError):
+        util.account_logins_from_ids(values)
+
+
+@pytest.mark.parametrize('values', [[], ids, ids_upper, [*ids[:5], 'x', *ids[5:10]], invalid_ids, ids + invalid_ids])
+def test_valid_uuids(values: list[object]) -> None:
+    assert util.valid_uuids(values) == [isinstance(value, str) and util.valid_uuid(value) for value in values]
+
+
+def test_star_export() -> None:
+    for name in util.__all__:
+        assert getattr(nadeo_api, name) is getattr(util, name)
+
+    for name in 'contextvars', 'deque', 'itertools':  # util's own imports
+        assert name not in vars(nadeo_api)